@@ -7,6 +7,8 @@ from pathlib import Path
 from typing import Dict, List
 from uuid import uuid4
 
+import sqlite_store
+
 DEFAULT_MODELS = ["atlas-v1", "orion-v2", "vega-targeted"]
 
 
@@ -36,6 +38,13 @@ def _default_state() -> Dict[str, object]:
 
 
 def load_admin_state() -> Dict[str, object]:
+    if sqlite_store.sqlite_enabled():
+        data = sqlite_store.load_state("admin_state")
+        if data is None:
+            return _default_state()
+        for key, value in _default_state().items():
+            data.setdefault(key, value)
+        return data
     path = _admin_state_path()
     if not path.exists():
         return _default_state()
@@ -56,6 +65,9 @@ def load_admin_state() -> Dict[str, object]:
 
 
 def save_admin_state(state: Dict[str, object]) -> Dict[str, object]:
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.save_state("admin_state", state)
+        return state
     path = _admin_state_path()
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from draw_history import DrawHistory, _values_mask
+from history_stats import HistoryStats
+from prize_tiers import prize_tier, tier_label, tier_labels
+
+# Below this many evaluated draws per process, spawning workers costs more than it saves.
+MIN_DRAWS_PER_WORKER = 200
+
+# (draw index, matched numbers, matched stars)
+Outcome = Tuple[int, int, int]
+
+
+def _evaluate_range(strategy: Callable, game_profile: Dict, history: DrawHistory, indexes: Iterable[int],
+                    options: Dict[str, object]) -> List[Outcome]:
+    return evaluate_prefixes(strategy, game_profile, HistoryStats(history), indexes, options)
+
+
+def evaluate_prefixes(strategy: Callable, game_profile: Dict, stats: HistoryStats, indexes: Iterable[int],
+                      options: Dict[str, object]) -> List[Outcome]:
+    """Run ``strategy`` on each prefix ``draws[:t]`` and match it against draw ``t``."""
+
+    history = stats.history
+    seed = options.get("seed")
+    outcomes = []
+    for index in indexes:
+        run_options = dict(options)
+        if seed is not None:
+            # A distinct, reproducible seed per evaluated draw.
+            run_options["seed"] = seed + index
+        result = strategy(game_profile, stats.prefix(index), **run_options)
+        numbers = _values_mask(result["numbers"], history.max_number)
+        stars = _values_mask(result["stars"], history.max_star)
+        outcomes.append(
+            (
+                index,
+                (numbers & history.numbers_mask(index)).bit_count(),
+                (stars & history.stars_mask(index)).bit_count(),
+            )
+        )
+    return outcomes
+
+
+def summarize_outcomes(outcomes: List[Outcome]) -> Dict[str, object]:
+    tested = len(outcomes)
+    tiers = {label: 0 for label in tier_labels()}
+    numbers_hist: Dict[int, int] = {}
+    stars_hist: Dict[int, int] = {}
+    winners = 0
+    for _, matched_numbers, matched_stars in outcomes:
+        numbers_hist[matched_numbers] = numbers_hist.get(matched_numbers, 0) + 1
+        stars_hist[matched_stars] = stars_hist.get(matched_stars, 0) + 1
+        if prize_tier(matched_numbers, matched_stars) is not None:
+            tiers[tier_label(matched_numbers, matched_stars)] += 1
+            winners += 1
+    return {
+        "draws_tested": tested,
+        "winning_draws": winners,
+        "hit_rate": round(winners / tested, 4) if tested else 0.0,
+        "average_numbers": round(sum(o[1] for o in outcomes) / tested, 4) if tested else 0.0,
+        "average_stars": round(sum(o[2] for o in outcomes) / tested, 4) if tested else 0.0,
+        "matched_numbers": dict(sorted(numbers_hist.items())),
+        "matched_stars": dict(sorted(stars_hist.items())),
+        "tiers": tiers,
+    }
+
+
+def default_workers() -> int:
+    """Process count for backtests, from ``BACKTEST_WORKERS`` (all cores by default)."""
+
+    try:
+        workers = int(os.environ.get("BACKTEST_WORKERS", "0"))
+    except ValueError:
+        workers = 0
+    cores = os.cpu_count() or 1
+    return cores if workers < 1 else min(workers, cores)
+
+
+def run_backtest(strategy: Callable, game_profile: Dict, draw_history: Iterable[Dict], *, start: int = 1,
+                 workers: int | None = None, options: Dict[str, object] | None = None,
+                 details: bool = False) -> Dict[str, object]:
+    """Walk-forward backtest of ``strategy`` over ``draw_history``.
+
+    For every index ``t >= start`` the strategy sees the prefix ``draws[:t]``
+    (a ``HistoryStats`` view, so nothing is recounted) and its grid is
+    matched against draw ``t``.  Index ranges are split across a
+    ``ProcessPoolExecutor``; each worker indexes the history once.
+    """
+
+    history = DrawHistory.from_draws(
+        draw_history, game_profile.get("max_number", 50), game_profile.get("max_star", 12)
+    )
+    if start < 1:
+        raise ValueError("start must be at least 1")
+    options = dict(options or {})
+    indexes = range(start, len(history))
+    started = time.perf_counter()
+
+    workers = default_workers() if workers is None else workers
+    workers = max(1, min(workers, len(indexes) // MIN_DRAWS_PER_WORKER))
+    if workers == 1:
+        outcomes = _evaluate_range(strategy, game_profile, history, indexes, options)
+    else:
+        step = math.ceil(len(indexes) / workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_evaluate_range, strategy, game_profile, history, indexes[i:i + step], options)
+                for i in range(0, len(indexes), step)
+            ]
+            outcomes = [outcome for future in futures for outcome in future.result()]
+
+    elapsed = time.perf_counter() - started
+    report = summarize_outcomes(outcomes)
+    report["workers"] = workers
+    report["elapsed_ms"] = round(elapsed * 1000, 2)
+    report["draws_per_second"] = round(len(outcomes) / elapsed, 1) if elapsed > 0 else None
+    if details:
+        report["results"] = [
+            {
+                "index": index,
+                "draw_date": history[index].get("draw_date"),
+                "matched_numbers": matched_numbers,
+                "matched_stars": matched_stars,
+                "tier": prize_tier(matched_numbers, matched_stars),
+            }
+            for index, matched_numbers, matched_stars in outcomes
+        ]
+    return report
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from data_store import commit_batch, get_cooccurrence
+from draw_validation import invalid_draws
+
+# Rows validated and committed together; also bounds the rows held in memory per game.
+BATCH_SIZE = 5_000
+# Per-row errors kept in the report (all of them are counted).
+MAX_ERRORS = 1_000
+FORMATS = ("csv", "ndjson")
+
+# Reasons a row is rejected before validation (see ``draw_validation`` for the others).
+PARSE = "parse"
+UNKNOWN_GAME = "game"
+
+# (line number, game, draw, error): exactly one of draw and error is set.
+ParsedRow = Tuple[int, str | None, Dict[str, object] | None, str | None]
+
+
+def detect_format(name: str) -> str:
+    """Archive format from a file name: ``ndjson`` for .ndjson/.jsonl, ``csv`` otherwise."""
+
+    return "ndjson" if name.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def _values(raw: object) -> List[int]:
+    if isinstance(raw, list):
+        # JSON values must already be integers: int() would truncate 3.7 and accept true.
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in raw):
+            raise ValueError("non-integer number or star")
+        return list(raw)
+    # "-" only separates when it follows a digit, so "-3" stays negative (and gets rejected).
+    values = [value for value in re.split(r"[\s;,]+|(?<=\d)-", str(raw or "").strip()) if value]
+    return [int(value) for value in values]
+
+
+def _csv_values(row: Dict[str, str], name: str, prefix: str) -> List[int]:
+    if row.get(name):
+        return _values(row[name])
+    # Or one column per value: n1, n2, ... / s1, s2, ...
+    columns = [key for key in row if key and key[:1] == prefix and key[1:].isdigit()]
+    columns.sort(key=lambda key: int(key[1:]))
+    return [int(row[key]) for key in columns if row[key]]
+
+
+def _draw(numbers: List[int], stars: List[int], draw_date: object) -> Dict[str, object]:
+    draw: Dict[str, object] = {"numbers": numbers, "stars": stars}
+    if draw_date:
+        draw["draw_date"] = draw_date
+    return draw
+
+
+def parse_rows(lines: Iterable[str], fmt: str, default_game: str | None = None) -> Iterator[ParsedRow]:
+    """Parse an archive line by line.
+
+    CSV needs a header with ``numbers`` and ``stars`` columns (values
+    separated by spaces, ``-``, ``;`` or quoted commas) or one column per value
+    (``n1``..``n5``, ``s1``..``s2``), plus optional ``game`` and
+    ``draw_date`` columns.  NDJSON holds one object per line with the same
+    keys.  Rows without a game fall back to ``default_game``.
+    """
+
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}: expected one of {', '.join(FORMATS)}")
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            line = reader.line_num
+            if not any(row.values()):
+                continue
+            try:
+                draw = _draw(_csv_values(row, "numbers", "n"), _csv_values(row, "stars", "s"), row.get("draw_date"))
+            except (TypeError, ValueError):
+                yield line, None, None, "non-integer number or star"
+                continue
+            yield line, (row.get("game") or default_game), draw, None
+        return
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+            if not isinstance(record, dict):
+                raise ValueError("not an object")
+            draw = _draw(_values(record.get("numbers")), _values(record.get("stars")), record.get("draw_date"))
+        except (TypeError, ValueError) as exc:
+            yield line, None, None, f"invalid row: {exc}"
+            continue
+        yield line, (record.get("game") or default_game), draw, None
+
+
+def import_archive(lines: Iterable[str], *, fmt: str, game_profiles: Dict[str, Dict], default_game: str | None = None,
+                   batch_size: int = BATCH_SIZE, replace: bool = False,
+                   max_errors: int = MAX_ERRORS) -> Dict[str, object]:
+    """Stream an archive into the manual store.
+
+    Rows are parsed one at a time and buffered per game; every
+    ``batch_size`` rows the buffer is validated in bulk and its valid draws
+    are committed as one store mutation, so memory stays bounded by the
+    batch whatever the archive size.  Invalid rows are reported (line,
+    reason, message) without aborting the import.  With ``replace``, the
+    first committed batch of a game replaces its stored history.  Returns
+    the counts, the errors and the throughput in rows per second.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    started = time.perf_counter()
+    pending: Dict[str, List[Tuple[int, Dict[str, object]]]] = {}
+    imported: Dict[str, int] = {}
+    errors: List[Dict[str, object]] = []
+    counters = {"rows": 0, "rejected": 0, "batches": 0}
+
+    def reject(line: int, reason: str, message: str, game: str | None = None) -> None:
+        counters["rejected"] += 1
+        if len(errors) < max_errors:
+            errors.append({"line": line, "game": game, "reason": reason, "message": message})
+
+    def flush(game: str) -> None:
+        rows = pending.pop(game, [])
+        if not rows:
+            return
+        draws = [draw for _, draw in rows]
+        invalid = dict(invalid_draws(
+            [draw["numbers"] for draw in draws],
+            [draw["stars"] for draw in draws],
+            [draw.get("draw_date") for draw in draws],
+            game_profiles[game],
+        ))
+        valid = []
+        for index, (line, draw) in enumerate(rows):
+            if index in invalid:
+                reject(line, invalid[index], f"invalid draw ({invalid[index]})", game)
+            else:
+                if draw.get("draw_date"):
+                    draw["draw_date"] = date.fromisoformat(str(draw["draw_date"])).isoformat()
+                valid.append(draw)
+        if valid:
+            commit_batch(game, valid, replace=replace and game not in imported)
+            imported[game] = imported.get(game, 0) + len(valid)
+            counters["batches"] += 1
+
+    for line, game, draw, error in parse_rows(lines, fmt, default_game):
+        counters["rows"] += 1
+        if error is not None:
+            reject(line, PARSE, error)
+            continue
+        key = str(game or "").lower()
+        if key not in game_profiles:
+            reject(line, UNKNOWN_GAME, f"unknown game {game!r}", game)
+            continue
+        buffer = pending.setdefault(key, [])
+        buffer.append((line, draw))
+        if len(buffer) >= batch_size:
+            flush(key)
+    for game in list(pending):
+        flush(game)
+
+    for game in imported:
+        # Cached counts were extended batch by batch; otherwise they are built and saved here.
+        get_cooccurrence(game, game_profiles[game]["max_number"], game_profiles[game]["max_star"])
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": counters["rows"],
+        "imported": sum(imported.values()),
+        "rejected": counters["rejected"],
+        "batches": counters["batches"],
+        "games": imported,
+        "errors": errors,
+        "errors_truncated": counters["rejected"] > len(errors),
+        "elapsed": elapsed,
+        "rows_per_second": counters["rows"] / elapsed if elapsed else float(counters["rows"]),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a CSV or NDJSON draw archive into the manual store.")
+    parser.add_argument("path", help="archive file, or - for standard input")
+    parser.add_argument("--format", choices=FORMATS, help="archive format (default: from the file extension)")
+    parser.add_argument("--game", help="game of the rows without a game column")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--replace", action="store_true", help="replace the stored history of each imported game")
+    args = parser.parse_args(argv)
+
+    from main import GAME_PROFILES  # the HTTP app owns the game profiles
+
+    fmt = args.format or detect_format(args.path)
+    handle = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    try:
+        report = import_archive(
+            handle, fmt=fmt, game_profiles=GAME_PROFILES, default_game=args.game,
+            batch_size=args.batch_size, replace=args.replace,
+        )
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    for error in report["errors"]:
+        print(f"line {error['line']}: {error['message']}", file=sys.stderr)
+    if report["errors_truncated"]:
+        print(f"... {report['rejected'] - len(report['errors'])} more rejected rows", file=sys.stderr)
+    print(
+        f"{report['rows']} rows, {report['imported']} imported, {report['rejected']} rejected, "
+        f"{report['batches']} batches in {report['elapsed']:.2f} s ({report['rows_per_second']:.0f} rows/s)"
+    )
+    return 0 if report["imported"] or not report["rows"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
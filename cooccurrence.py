@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from math import comb
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from draw_history import DrawHistory, _mask_values
+
+# Counts are also kept per block of this many draws, so that any range of draws is
+# two prefix states apart plus at most two partial blocks.
+BLOCK_SIZE = 256
+
+_MAGIC = b"COOC1"
+_HEADER = struct.Struct("<HHIII")
+
+# (number pairs, star pairs, sparse number triplets) over some draws; pairs are
+# indexed by pair rank, triplets map a triplet rank to its count.
+Counts = Tuple[List[int], List[int], Dict[int, int]]
+
+
+def pair_rank(low: int, high: int) -> int:
+    """Rank of the pair of 1-based values ``low < high`` (combinadic order)."""
+
+    return comb(high - 1, 2) + low - 1
+
+
+def triplet_rank(first: int, second: int, third: int) -> int:
+    """Rank of the triplet of 1-based values ``first < second < third`` (combinadic order)."""
+
+    return comb(third - 1, 3) + comb(second - 1, 2) + first - 1
+
+
+def _pair_values(rank: int) -> Tuple[int, int]:
+    high = 2
+    while comb(high, 2) <= rank:
+        high += 1
+    return rank - comb(high - 1, 2) + 1, high
+
+
+def _triplet_values(rank: int) -> Tuple[int, int, int]:
+    third = 3
+    while comb(third, 3) <= rank:
+        third += 1
+    low, second = _pair_values(rank - comb(third - 1, 3))
+    return low, second, third
+
+
+def _add_draw(pairs, star_pairs, triplets, numbers: List[int], stars: List[int]) -> None:
+    for index, high in enumerate(numbers):
+        base = comb(high - 1, 2) - 1
+        for low_index in range(index):
+            pairs[base + numbers[low_index]] += 1
+    for index, high in enumerate(stars):
+        for low in stars[:index]:
+            star_pairs[comb(high - 1, 2) + low - 1] += 1
+    for third_index in range(2, len(numbers)):
+        third = comb(numbers[third_index] - 1, 3) - 1
+        for second_index in range(1, third_index):
+            second = third + comb(numbers[second_index] - 1, 2)
+            for first in numbers[:second_index]:
+                triplets[second + first] += 1
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int) -> None:
+        self.data = data
+        self.offset = offset
+
+    def take(self, typecode: str, count: int) -> array:
+        values = array(typecode)
+        end = self.offset + values.itemsize * count
+        if end > len(self.data):
+            raise ValueError("truncated co-occurrence data")
+        values.frombytes(self.data[self.offset:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.offset = end
+        return values
+
+    def sparse(self) -> Dict[int, int]:
+        (count,) = self.take("I", 1)
+        return dict(zip(self.take("H", count), self.take("I", count)))
+
+
+def _sparse_bytes(counts: Dict[int, int]) -> bytes:
+    ranks = sorted(counts)
+    return _pack(array("I", [len(ranks)])) + _pack(array("H", ranks)) + _pack(array("I", [counts[r] for r in ranks]))
+
+
+class Cooccurrence:
+    """Number-pair, star-pair and number-triplet counts of a draw history.
+
+    Maintained draw by draw (``push``/``extend``): each draw adds its 10
+    number pairs, its star pair and its 10 number triplets, so keeping the
+    counts current costs O(1) per ingested draw.  Besides the totals, the
+    per-block deltas of every ``BLOCK_SIZE`` draws are kept: the counts of any
+    range of draws are the difference of two prefix states plus the draws of
+    at most two partial blocks.  Triplets are dense in memory (19,600 values
+    for 50 numbers) and sparse on disk.
+
+    ``to_bytes``/``from_bytes`` give a compact binary form: per-draw masks
+    and dates, then totals and block deltas as little-endian 32-bit counts;
+    triplets are stored as (16-bit rank, count) pairs, ranks fitting 16 bits
+    for the 64 numbers a ``DrawHistory`` supports.
+    """
+
+    __slots__ = (
+        "max_number", "max_star", "pairs", "star_pairs", "triplets",
+        "_numbers", "_stars", "_dates", "_blocks", "_prefix",
+    )
+
+    def __init__(self, max_number: int = 50, max_star: int = 12) -> None:
+        self.max_number = max_number
+        self.max_star = max_star
+        self.pairs = array("I", bytes(4 * comb(max_number, 2)))
+        self.star_pairs = array("I", bytes(4 * comb(max_star, 2)))
+        self.triplets = array("I", bytes(4 * comb(max_number, 3)))
+        self._numbers = array("Q")
+        self._stars = array("H")
+        self._dates = array("i")
+        # Deltas of each complete block: (pairs, star pairs, sparse triplets).
+        self._blocks: List[Counts] = []
+        self._prefix: List[Counts] | None = None
+
+    @classmethod
+    def from_history(cls, history: DrawHistory) -> "Cooccurrence":
+        state = cls(history.max_number, history.max_star)
+        state.extend_masks(history.numbers_masks, history.stars_masks, history.date_ordinals)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def copy(self) -> "Cooccurrence":
+        clone = Cooccurrence.__new__(Cooccurrence)
+        clone.max_number, clone.max_star = self.max_number, self.max_star
+        for name in ("pairs", "star_pairs", "triplets", "_numbers", "_stars", "_dates"):
+            setattr(clone, name, array(getattr(self, name).typecode, getattr(self, name)))
+        # Block deltas are never modified once complete, so they can be shared.
+        clone._blocks = list(self._blocks)
+        clone._prefix = self._prefix
+        return clone
+
+    def push(self, numbers_mask: int, stars_mask: int, ordinal: int = 0) -> None:
+        """Add one draw given as bitmasks (see ``DrawHistory``) and a date ordinal (0 if unknown)."""
+
+        numbers, stars = _mask_values(numbers_mask), _mask_values(stars_mask)
+        _add_draw(self.pairs, self.star_pairs, self.triplets, numbers, stars)
+        self._numbers.append(numbers_mask)
+        self._stars.append(stars_mask)
+        self._dates.append(ordinal)
+        if len(self) % BLOCK_SIZE == 0:
+            self._blocks.append(self._direct(len(self) - BLOCK_SIZE, len(self)))
+            self._prefix = None
+
+    def extend_masks(self, numbers_masks: Iterable[int], stars_masks: Iterable[int], ordinals: Iterable[int]) -> None:
+        for numbers_mask, stars_mask, ordinal in zip(numbers_masks, stars_masks, ordinals):
+            self.push(numbers_mask, stars_mask, ordinal)
+
+    def extend(self, history: DrawHistory) -> None:
+        """Push the draws of ``history`` (a ``DrawHistory``)."""
+
+        self.extend_masks(history.numbers_masks, history.stars_masks, history.date_ordinals)
+
+    def _direct(self, start: int, stop: int) -> Counts:
+        pairs = [0] * len(self.pairs)
+        star_pairs = [0] * len(self.star_pairs)
+        triplets: Dict[int, int] = {}
+        sparse = _SparseCounter(triplets)
+        for index in range(start, stop):
+            _add_draw(pairs, star_pairs, sparse, _mask_values(self._numbers[index]), _mask_values(self._stars[index]))
+        return pairs, star_pairs, triplets
+
+    def _prefixes(self) -> List[Counts]:
+        if self._prefix is None:
+            prefix: List[Counts] = [([0] * len(self.pairs), [0] * len(self.star_pairs), {})]
+            for pairs, star_pairs, triplets in self._blocks:
+                last_pairs, last_stars, last_triplets = prefix[-1]
+                merged = dict(last_triplets)
+                for rank, count in triplets.items():
+                    merged[rank] = merged.get(rank, 0) + count
+                prefix.append((
+                    [a + b for a, b in zip(last_pairs, pairs)],
+                    [a + b for a, b in zip(last_stars, star_pairs)],
+                    merged,
+                ))
+            self._prefix = prefix
+        return self._prefix
+
+    def counts(self, start: int | None = None, stop: int | None = None) -> Counts:
+        """Counts over ``draws[start:stop]``."""
+
+        begin, end, _ = slice(start, stop).indices(len(self))
+        end = max(begin, end)
+        if begin == 0 and end == len(self):
+            return list(self.pairs), list(self.star_pairs), {r: c for r, c in enumerate(self.triplets) if c}
+        first_block, last_block = -(-begin // BLOCK_SIZE), end // BLOCK_SIZE
+        if first_block >= last_block:
+            return self._direct(begin, end)
+        prefix = self._prefixes()
+        (high_pairs, high_stars, high_triplets), (low_pairs, low_stars, low_triplets) = (
+            prefix[last_block], prefix[first_block]
+        )
+        pairs = [a - b for a, b in zip(high_pairs, low_pairs)]
+        star_pairs = [a - b for a, b in zip(high_stars, low_stars)]
+        triplets = {rank: count - low_triplets.get(rank, 0) for rank, count in high_triplets.items()}
+        sparse = _SparseCounter(triplets)
+        for index in list(range(begin, first_block * BLOCK_SIZE)) + list(range(last_block * BLOCK_SIZE, end)):
+            _add_draw(pairs, star_pairs, sparse, _mask_values(self._numbers[index]), _mask_values(self._stars[index]))
+        return pairs, star_pairs, {rank: count for rank, count in triplets.items() if count}
+
+    def date_range(self, date_from: str | None = None, date_to: str | None = None) -> Tuple[Counts, int]:
+        """Counts over the draws dated within ``[date_from, date_to]`` (ISO dates, both optional), and their number.
+
+        Undated draws only count when no bound is given.  When the draws are
+        stored in date order the range is located by bisection; otherwise the
+        matching draws are counted one by one.
+        """
+
+        if date_from is None and date_to is None:
+            return self.counts(), len(self)
+        low = date.fromisoformat(date_from).toordinal() if date_from else 1
+        high = date.fromisoformat(date_to).toordinal() if date_to else date.max.toordinal()
+        dates = self._dates
+        if all(dates[i] <= dates[i + 1] for i in range(len(dates) - 1)):
+            begin, end = bisect_left(dates, max(low, 1)), bisect_right(dates, high)
+            return self.counts(begin, end), max(0, end - begin)
+        pairs = [0] * len(self.pairs)
+        star_pairs = [0] * len(self.star_pairs)
+        triplets: Dict[int, int] = {}
+        sparse = _SparseCounter(triplets)
+        matched = 0
+        for index, ordinal in enumerate(dates):
+            if ordinal and low <= ordinal <= high:
+                matched += 1
+                _add_draw(pairs, star_pairs, sparse, _mask_values(self._numbers[index]), _mask_values(self._stars[index]))
+        return (pairs, star_pairs, triplets), matched
+
+    def to_bytes(self) -> bytes:
+        parts = [
+            _MAGIC,
+            _HEADER.pack(self.max_number, self.max_star, len(self), BLOCK_SIZE, len(self._blocks)),
+            _pack(self._numbers), _pack(self._stars), _pack(self._dates),
+            _pack(self.pairs), _pack(self.star_pairs),
+            _sparse_bytes({rank: count for rank, count in enumerate(self.triplets) if count}),
+        ]
+        for pairs, star_pairs, triplets in self._blocks:
+            parts.extend((_pack(array("I", pairs)), _pack(array("I", star_pairs)), _sparse_bytes(triplets)))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Cooccurrence":
+        if not data.startswith(_MAGIC):
+            raise ValueError("not a co-occurrence state")
+        max_number, max_star, size, block_size, blocks = _HEADER.unpack_from(data, len(_MAGIC))
+        if block_size != BLOCK_SIZE:
+            raise ValueError("co-occurrence state built with another block size")
+        state = cls(max_number, max_star)
+        reader = _Reader(data, len(_MAGIC) + _HEADER.size)
+        state._numbers = reader.take("Q", size)
+        state._stars = reader.take("H", size)
+        state._dates = reader.take("i", size)
+        state.pairs = reader.take("I", len(state.pairs))
+        state.star_pairs = reader.take("I", len(state.star_pairs))
+        for rank, count in reader.sparse().items():
+            state.triplets[rank] = count
+        for _ in range(blocks):
+            pairs = reader.take("I", len(state.pairs)).tolist()
+            star_pairs = reader.take("I", len(state.star_pairs)).tolist()
+            state._blocks.append((pairs, star_pairs, reader.sparse()))
+        return state
+
+
+class _SparseCounter:
+    """``triplets[rank] += 1`` on a dict, for the shared ``_add_draw`` loop."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self, counts: Dict[int, int]) -> None:
+        self.counts = counts
+
+    def __getitem__(self, rank: int) -> int:
+        return self.counts.get(rank, 0)
+
+    def __setitem__(self, rank: int, count: int) -> None:
+        self.counts[rank] = count
+
+
+def pair_matrix(pairs: Sequence[int], pool: int) -> List[List[int]]:
+    """Symmetric ``pool x pool`` matrix (row/column ``v - 1`` for value ``v``) from pair counts."""
+
+    matrix = [[0] * pool for _ in range(pool)]
+    for high in range(2, pool + 1):
+        for low in range(1, high):
+            count = pairs[pair_rank(low, high)]
+            matrix[low - 1][high - 1] = matrix[high - 1][low - 1] = count
+    return matrix
+
+
+def top_pairs(pairs: Sequence[int], limit: int) -> List[Tuple[Tuple[int, int], int]]:
+    """The ``limit`` most frequent pairs, ties by pair order."""
+
+    ranked = sorted((rank for rank, count in enumerate(pairs) if count), key=lambda rank: -pairs[rank])
+    return [(_pair_values(rank), pairs[rank]) for rank in ranked[:limit]]
+
+
+def top_triplets(triplets: Dict[int, int], limit: int) -> List[Tuple[Tuple[int, int, int], int]]:
+    """The ``limit`` most frequent triplets, ties by triplet order."""
+
+    ranked = sorted(triplets, key=lambda rank: (-triplets[rank], rank))
+    return [(_triplet_values(rank), triplets[rank]) for rank in ranked[:limit]]
@@ -1,10 +1,61 @@
 from __future__ import annotations
 
+import base64
 import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import sqlite_store
+from cooccurrence import Cooccurrence
+from draw_history import DrawHistory
+from grid_codec import encode_grids, first_occurrences
+from match_index import MatchIndex
+from preparateur_donnees import FeatureState
+
+try:  # pragma: no cover - fcntl is POSIX only
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# The manual store is a JSON snapshot plus an append-only log of mutations
+# (one JSON record per line).  Writes only append to the log; the snapshot is
+# rewritten when the log grows past this fraction of the snapshot size, which
+# keeps the amortized cost of an ingest proportional to the batch.
+COMPACTION_RATIO = 0.5
+
+_STORE_LOCK = threading.RLock()
+_lock_depth = 0
+
+# Process-wide cache of the replayed store.  Entries are keyed by the on-disk
+# version of the snapshot and log (inode, size, mtime) plus a generation
+# counter bumped by local writes, so a write from another worker invalidates
+# the cache on the next read.
+_generation = 0
+_cache: Dict[str, object] = {"version": None, "store": None, "versions": None, "derived": {}}
+
+# Reserved snapshot key holding per-game version counters.  Every mutation
+# bumps "version"; replace/clear also move "rewritten_at", so a history is an
+# append-only extension of an earlier one as long as "rewritten_at" is equal.
+_META_KEY = "_meta"
+
+# Compaction generation.  The snapshot meta records the generation it was
+# written at and a log starts with a ``{"log_generation": n}`` header line:
+# a log older than the snapshot was already folded into it (the process died
+# before removing it) and is skipped on replay, then reset before the next
+# append.  Logs without a header (older layout) are always replayed.
+_LOG_GENERATION = "log_generation"
+# Snapshot generation as last read or written, keyed by its (inode, size, mtime).
+_snapshot_meta: Dict[str, object] = {"key": None, "generation": 0}
+
+Versions = Dict[str, Dict[str, int]]
+_cache_counters = {"hits": 0, "misses": 0}
+
+# Strategy parameters as last read, keyed by the file's (path, inode, size, mtime).
+_params_cache: Dict[str, object] = {"key": None, "params": {}}
 
 
 def _store_path() -> Path:
@@ -21,20 +72,391 @@ def _training_status_path() -> Path:
     return Path(__file__).parent / "data" / "training_status.json"
 
 
-def load_store() -> Dict[str, List[Dict[str, object]]]:
+def _strategy_params_path() -> Path:
+    override = os.environ.get("STRATEGY_PARAMS_PATH")
+    if override:
+        return Path(override)
+    return Path(__file__).parent / "data" / "strategy_params.json"
+
+
+def _log_path() -> Path:
+    path = _store_path()
+    return path.with_name(path.name + ".log")
+
+
+def _lock_path() -> Path:
+    path = _store_path()
+    return path.with_name(path.name + ".lock")
+
+
+def _feature_state_path() -> Path:
+    path = _store_path()
+    return path.with_name(path.name + ".features.json")
+
+
+def _cooccurrence_path(key: str) -> Path:
+    path = _store_path()
+    return path.with_name(f"{path.name}.{key.replace(':', '-')}.cooc")
+
+
+@contextmanager
+def _store_lock(exclusive: bool = True) -> Iterator[None]:
+    """Serialize store access across threads and, where supported, processes.
+
+    The lock is re-entrant within a thread; only the outermost acquisition
+    takes the file lock shared with other workers.  With the SQLite backend,
+    whose transactions already serialize workers, no lock file is used.
+    """
+
+    global _lock_depth
+    with _STORE_LOCK:
+        if fcntl is None or _lock_depth or sqlite_store.sqlite_enabled():
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+            return
+        lock_path = _lock_path()
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _read_snapshot() -> Tuple[Dict[str, List[Dict[str, object]]], Versions]:
     path = _store_path()
+    _snapshot_meta.update(key=_stat_key(path), generation=0)
     if not path.exists():
-        return {}
+        return {}, {}
     content = path.read_text(encoding="utf-8").strip()
     if not content:
-        return {}
+        return {}, {}
     try:
         data = json.loads(content)
     except json.JSONDecodeError:
-        return {}
+        return {}, {}
     if not isinstance(data, dict):
-        return {}
-    return {k: v for k, v in data.items() if isinstance(v, list)}
+        return {}, {}
+    meta = data.get(_META_KEY) if isinstance(data.get(_META_KEY), dict) else {}
+    versions = meta.get("versions") if isinstance(meta.get("versions"), dict) else {}
+    generation = meta.get(_LOG_GENERATION)
+    _snapshot_meta["generation"] = generation if isinstance(generation, int) else 0
+    return {k: v for k, v in data.items() if isinstance(v, list)}, versions
+
+
+def _snapshot_generation() -> int:
+    key = _stat_key(_store_path())
+    if key is None:
+        return 0
+    if _snapshot_meta["key"] != key:
+        _read_snapshot()
+    return _snapshot_meta["generation"]  # type: ignore[return-value]
+
+
+def _log_generation(path: Path) -> int | None:
+    """Generation in the log's header line; None for a missing log or one without header."""
+
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            first = handle.readline()
+    except FileNotFoundError:
+        return None
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        return None
+    generation = header.get(_LOG_GENERATION) if isinstance(header, dict) else None
+    return generation if isinstance(generation, int) else None
+
+
+def _bump_version(versions: Versions, game: str, *, rewrite: bool) -> None:
+    entry = dict(versions.get(game) or {"version": 0, "rewritten_at": 0})
+    entry["version"] = int(entry.get("version", 0)) + 1
+    if rewrite:
+        entry["rewritten_at"] = entry["version"]
+    versions[game] = entry
+
+
+def _apply_record(store: Dict[str, List[Dict[str, object]]], versions: Versions, record: Dict[str, object]) -> None:
+    game = record.get("game")
+    if not isinstance(game, str):
+        return
+    op = record.get("op")
+    draws = record.get("draws") if isinstance(record.get("draws"), list) else []
+    if op == "append":
+        store.setdefault(game, []).extend(draws)
+    elif op == "replace":
+        store[game] = list(draws)
+    elif op == "clear":
+        store.pop(game, None)
+    else:
+        return
+    _bump_version(versions, game, rewrite=op != "append")
+
+
+def _replay_log(state: Tuple[Dict[str, List[Dict[str, object]]], Versions]) -> Tuple[Dict[str, List[Dict[str, object]]], Versions]:
+    store, versions = state
+    path = _log_path()
+    if not path.exists():
+        return store, versions
+    generation = _log_generation(path)
+    if generation is not None and generation < _snapshot_generation():
+        return store, versions
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn trailing write from a crashed process: skip it.
+                continue
+            if isinstance(record, dict):
+                _apply_record(store, versions, record)
+    return store, versions
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _write_snapshot(store: Dict[str, List[Dict[str, object]]], versions: Versions) -> None:
+    # The new generation marks the current log as folded in: a crash between
+    # the two steps below leaves a stale log that replay skips.
+    log_path = _log_path()
+    generation = max(_snapshot_generation(), _log_generation(log_path) or 0) + 1
+    content: Dict[str, object] = dict(store)
+    content[_META_KEY] = {"versions": versions, _LOG_GENERATION: generation}
+    store_path = _store_path()
+    _write_atomic(store_path, json.dumps(content, indent=2, ensure_ascii=False))
+    _snapshot_meta.update(key=_stat_key(store_path), generation=generation)
+    log_path.unlink(missing_ok=True)
+
+
+def _prepare_log(path: Path) -> None:
+    """Make the log ready for an append: drop a torn last line, start a fresh one if stale."""
+
+    try:
+        with path.open("rb+") as handle:
+            size = end = handle.seek(0, os.SEEK_END)
+            while end:
+                start = max(end - 4096, 0)
+                handle.seek(start)
+                newline = handle.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                handle.truncate(end)
+    except FileNotFoundError:
+        pass
+    generation = _snapshot_generation()
+    current = _log_generation(path)
+    if not _file_size(path) or (current is not None and current < generation):
+        header = json.dumps({_LOG_GENERATION: generation}, separators=(",", ":")) + "\n"
+        _write_atomic(path, header)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _needs_compaction() -> bool:
+    log_size = _file_size(_log_path())
+    return log_size > 0 and log_size > _file_size(_store_path()) * COMPACTION_RATIO
+
+
+def _stat_key(path: Path) -> Tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _store_version() -> Tuple[object, ...]:
+    if sqlite_store.sqlite_enabled():
+        return ("sqlite", str(sqlite_store.database_path()), _generation, sqlite_store.generation())
+    path = _store_path()
+    return (str(path), _generation, _stat_key(path), _stat_key(_log_path()))
+
+
+def _invalidate_cache() -> None:
+    global _generation
+    with _STORE_LOCK:
+        _generation += 1
+        _cache.update(version=None, store=None, versions=None, derived={})
+
+
+def _load_state() -> Tuple[Dict[str, List[Dict[str, object]]], Versions]:
+    """Return the replayed store and versions, re-reading only when they changed.
+
+    The returned mappings are shared: callers must copy before mutating.
+    With the SQLite backend only the versions are read here: the store
+    mapping stays empty and per-game draws come from ``_game_draws``.
+    """
+
+    version = _store_version()
+    with _STORE_LOCK:
+        if _cache["version"] == version:
+            _cache_counters["hits"] += 1
+            return _cache["store"], _cache["versions"]  # type: ignore[return-value]
+    if sqlite_store.sqlite_enabled():
+        store, versions = {}, sqlite_store.load_versions()
+        with _STORE_LOCK:
+            _cache.update(version=version, store=store, versions=versions, derived={})
+            _cache_counters["misses"] += 1
+        return store, versions
+    with _store_lock(exclusive=False):
+        version = _store_version()
+        store, versions = _replay_log(_read_snapshot())
+        _cache.update(version=version, store=store, versions=versions, derived={})
+        _cache_counters["misses"] += 1
+    return store, versions
+
+
+def _cached_store() -> Dict[str, List[Dict[str, object]]]:
+    return _load_state()[0]
+
+
+def _game_draws(game: str) -> List[Dict[str, object]]:
+    """Stored draws of one game for the current store version (shared: copy before mutating)."""
+
+    if sqlite_store.sqlite_enabled():
+        return _cached_derived(f"draws:{game}", lambda _store: sqlite_store.get_draws(game))  # type: ignore[return-value]
+    return _cached_store().get(game, [])
+
+
+def _cached_derived(name: str, builder: Callable[[Dict[str, List[Dict[str, object]]]], object]) -> object:
+    """Memoize a value computed from the store for the current store version."""
+
+    store = _cached_store()
+    with _STORE_LOCK:
+        derived: Dict[str, object] = _cache["derived"]  # type: ignore[assignment]
+        if _cache["store"] is store and name in derived:
+            return derived[name]
+    value = builder(store)
+    with _STORE_LOCK:
+        if _cache["store"] is store:
+            _cache["derived"][name] = value  # type: ignore[index]
+    return value
+
+
+def cache_stats() -> Dict[str, object]:
+    """Hit/miss counters of the in-process store cache."""
+
+    with _STORE_LOCK:
+        hits = _cache_counters["hits"]
+        misses = _cache_counters["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+# Derived values (see ``_cached_derived``) extended in place of a rebuild when draws are appended.
+_INCREMENTAL_DERIVED = ("history", "features", "cooccurrence")
+
+
+def _carried_derived(derived: Dict[str, object], op: str, game: str,
+                     draws: List[Dict[str, object]] | None) -> Dict[str, object]:
+    """Derived values still valid after a mutation of ``game``.
+
+    Per-game values of the other games are kept as they are.  On an append,
+    the game's history, feature state and co-occurrence counts are copied
+    (flat array copies) and only the appended draws are pushed, instead of a
+    rebuild over the whole history.  Everything else is dropped and rebuilt
+    on demand.
+    """
+
+    carried: Dict[str, object] = {}
+    for name, value in derived.items():
+        kind, _, scope = name.partition(":")
+        owner, _, shape = scope.partition(":")
+        if not scope:
+            continue  # store-wide values such as the summary
+        if owner != game:
+            carried[name] = value
+            continue
+        if op != "append" or kind not in _INCREMENTAL_DERIVED:
+            continue
+        try:
+            if kind == "cooccurrence":
+                max_number, max_star = (int(part) for part in shape.split(":"))
+                batch = DrawHistory.from_draws(draws or [], max_number, max_star)
+                value = value.copy()  # type: ignore[attr-defined]
+                value.extend(batch)
+            else:
+                value = value.copy()  # type: ignore[attr-defined]
+                value.extend(draws or [])
+                if kind == "history":
+                    value.fingerprint()
+        except (TypeError, ValueError):
+            continue  # e.g. values outside this history's pools: rebuilt on demand
+        carried[name] = value
+    return carried
+
+
+def _append_record(op: str, game: str, draws: List[Dict[str, object]] | None = None) -> None:
+    global _generation
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.apply_mutation(op, game, draws)
+        _invalidate_cache()
+        return
+    record: Dict[str, object] = {"op": op, "game": game}
+    if draws is not None:
+        record["draws"] = list(draws)
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with _store_lock():
+        # Write-through: when the cache reflects the disk, apply the record in
+        # memory instead of re-reading the store after the write.
+        fresh = _cache["version"] == _store_version()
+        log_path = _log_path()
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        _prepare_log(log_path)
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+        state = None
+        derived: Dict[str, object] = {}
+        if fresh:
+            store = dict(_cache["store"])  # type: ignore[arg-type]
+            if game in store:
+                store[game] = list(store[game])
+            versions = dict(_cache["versions"])  # type: ignore[arg-type]
+            _apply_record(store, versions, record)
+            state = (store, versions)
+            derived = _carried_derived(_cache["derived"], op, game, draws)  # type: ignore[arg-type]
+        if _needs_compaction():
+            if state is None:
+                state = _replay_log(_read_snapshot())
+            _write_snapshot(*state)
+        _generation += 1
+        if state is not None:
+            _cache.update(version=_store_version(), store=state[0], versions=state[1], derived=derived)
+        else:
+            _cache.update(version=None, store=None, versions=None, derived={})
+
+
+def load_store() -> Dict[str, List[Dict[str, object]]]:
+    if sqlite_store.sqlite_enabled():
+        return sqlite_store.load_store()
+    return {game: list(draws) for game, draws in _cached_store().items()}
 
 
 def export_store() -> Dict[str, List[Dict[str, object]]]:
@@ -44,15 +466,66 @@ def export_store() -> Dict[str, List[Dict[str, object]]]:
 
 
 def save_store(store: Dict[str, List[Dict[str, object]]]) -> Dict[str, List[Dict[str, object]]]:
-    path = _store_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(store, indent=2, ensure_ascii=False), encoding="utf-8")
+    """Rewrite the whole snapshot and reset the mutation log."""
+
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.save_store(store)
+        _invalidate_cache()
+        return store
+    with _store_lock():
+        _, versions = _replay_log(_read_snapshot())
+        versions = dict(versions)
+        for game in set(versions) | set(store):
+            _bump_version(versions, game, rewrite=True)
+        _write_snapshot(store, versions)
+        _invalidate_cache()
     return store
 
 
+def store_size_bytes() -> int:
+    """Size on disk of the manual store (snapshot plus pending log)."""
+
+    if sqlite_store.sqlite_enabled():
+        return sqlite_store.size_bytes()
+    return _file_size(_store_path()) + _file_size(_log_path())
+
+
+def compact_store() -> Dict[str, object]:
+    """Compact the active backend and report the resulting sizes.
+
+    The JSON backend folds its mutation log into the snapshot; SQLite
+    checkpoints the WAL and runs VACUUM.
+    """
+
+    if sqlite_store.sqlite_enabled():
+        report = sqlite_store.vacuum()
+        _invalidate_cache()
+        return {"backend": "sqlite", **report}
+    with _store_lock():
+        before = store_size_bytes()
+        store, versions = _replay_log(_read_snapshot())
+        _write_snapshot(store, versions)
+        _invalidate_cache()
+        after = store_size_bytes()
+    return {
+        "backend": "json",
+        "reclaimed_bytes": max(before - after, 0),
+        "size_bytes": after,
+        "stored": sum(len(draws) for draws in store.values()),
+    }
+
+
 def load_training_status() -> Dict[str, object]:
     """Return the training status file (or defaults)."""
 
+    if sqlite_store.sqlite_enabled():
+        runs = sqlite_store.load_training_runs()
+        last = runs[-1] if runs else {}
+        return {
+            "last_mode": last.get("mode"),
+            "last_triggered_at": last.get("triggered_at"),
+            "runs": runs,
+        }
     path = _training_status_path()
     if not path.exists():
         return {"last_mode": None, "last_triggered_at": None, "runs": []}
@@ -74,6 +547,10 @@ def load_training_status() -> Dict[str, object]:
 
 
 def save_training_status(status: Dict[str, object]) -> Dict[str, object]:
+    if sqlite_store.sqlite_enabled():
+        runs = status.get("runs")
+        sqlite_store.save_training_runs(runs if isinstance(runs, list) else [])
+        return status
     path = _training_status_path()
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(status, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -84,58 +561,175 @@ def record_training_run(mode: str, *, source: str | None = None, note: str | Non
     """Persist a lightweight training trigger and return the new status."""
 
     now = datetime.utcnow().isoformat() + "Z"
-    status = load_training_status()
     run_entry = {"mode": mode, "source": source, "note": note, "triggered_at": now}
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.insert_training_run(run_entry)
+        return load_training_status()
+    status = load_training_status()
     status.setdefault("runs", []).append(run_entry)
     status["last_mode"] = mode
     status["last_triggered_at"] = now
     return save_training_status(status)
 
 
-def append_draws(game: str, draws: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    store = load_store()
+def load_strategy_params() -> Dict[str, Dict[str, object]]:
+    """Return the active strategy parameters stored by the sweep runner (per strategy)."""
+
+    if sqlite_store.sqlite_enabled():
+        return sqlite_store.load_state("strategy_params") or {}
+    path = _strategy_params_path()
+    # Read on every generation request: the file is only parsed again once it changed.
+    key = (str(path), _stat_key(path))
+    if _params_cache["key"] != key:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        _params_cache.update(key=key, params=data if isinstance(data, dict) else {})
+    return dict(_params_cache["params"])  # type: ignore[arg-type]
+
+
+def save_strategy_params(strategy: str, params: Dict[str, object]) -> Dict[str, Dict[str, object]]:
+    stored = load_strategy_params()
+    stored[strategy] = params
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.save_state("strategy_params", stored)
+        return stored
+    _write_atomic(_strategy_params_path(), json.dumps(stored, indent=2, ensure_ascii=False))
+    return stored
+
+
+def _count_draws(game: str) -> int:
+    if sqlite_store.sqlite_enabled():
+        return sqlite_store.count_draws(game)
+    return len(_game_draws(game))
+
+
+def append_draws(game: str, draws: List[Dict[str, object]]) -> int:
+    """Append draws for the given game; returns how many draws the game now holds."""
+
     normalized_key = game.lower()
-    game_draws = store.get(normalized_key, [])
-    game_draws.extend(draws)
-    store[normalized_key] = game_draws
-    save_store(store)
-    return game_draws
+    _append_record("append", normalized_key, draws)
+    return _count_draws(normalized_key)
+
 
+def persist_draws(game: str, draws: List[Dict[str, object]], *, replace: bool = False) -> int:
+    """Append or replace draws for the given game and persist to disk.
 
-def persist_draws(game: str, draws: List[Dict[str, object]], *, replace: bool = False) -> List[Dict[str, object]]:
-    """Append or replace draws for the given game and persist to disk."""
+    Returns how many draws the game now holds.
+    """
 
-    store = load_store()
     normalized_key = game.lower()
-    if replace:
-        store[normalized_key] = list(draws)
-    else:
-        store[normalized_key] = store.get(normalized_key, []) + list(draws)
-    save_store(store)
-    return store[normalized_key]
+    _append_record("replace" if replace else "append", normalized_key, draws)
+    return _count_draws(normalized_key)
+
+
+def commit_batch(game: str, draws: List[Dict[str, object]], *, replace: bool = False) -> None:
+    """Append (or replace with) one batch of draws without reading the stored history back."""
+
+    _append_record("replace" if replace else "append", game.lower(), draws)
 
 
 def clear_draws(game: str) -> bool:
     """Remove all draws for a given game. Returns True if something was deleted."""
 
-    store = load_store()
     normalized_key = game.lower()
-    deleted = normalized_key in store
-    store.pop(normalized_key, None)
-    save_store(store)
+    if sqlite_store.sqlite_enabled():
+        deleted = bool(_game_draws(normalized_key))
+    else:
+        deleted = normalized_key in _cached_store()
+    _append_record("clear", normalized_key)
     return deleted
 
 
 def get_draws(game: str) -> List[Dict[str, object]]:
-    store = load_store()
-    return store.get(game.lower(), [])
+    """Stored draws of a game, as copies: the cached store stays untouched whatever the caller does."""
 
+    return [
+        {key: list(value) if isinstance(value, list) else value for key, value in draw.items()}
+        for draw in _game_draws(game.lower())
+    ]
 
-def summarize_store() -> Dict[str, Dict[str, object]]:
-    """Return a summary of the stored manual draws per game."""
 
-    store = load_store()
-    summary: Dict[str, Dict[str, object]] = {}
+def get_store_version(game: str) -> Dict[str, int]:
+    """Monotonic version counters of a game's stored history.
+
+    ``version`` grows with every mutation; ``rewritten_at`` is the version of
+    the last replace/clear, so two states with the same ``rewritten_at`` are
+    append-only extensions of one another.
+    """
+
+    entry = _load_state()[1].get(game.lower()) or {}
+    return {"version": int(entry.get("version", 0)), "rewritten_at": int(entry.get("rewritten_at", 0))}
+
+
+def get_history(game: str, max_number: int = 50, max_star: int = 12) -> DrawHistory:
+    """Return the stored draws of a game as a compact ``DrawHistory``.
+
+    The history is built once per store version; callers get a copy they may
+    extend freely.
+    """
+
+    def build(_store: Dict[str, List[Dict[str, object]]]) -> DrawHistory:
+        history = DrawHistory.from_draws(_game_draws(normalized_key), max_number, max_star)
+        history.fingerprint()  # materialized once, then carried over by copies
+        return history
+
+    normalized_key = game.lower()
+    history = _cached_derived(f"history:{normalized_key}:{max_number}:{max_star}", build)
+    return history.copy()  # type: ignore[union-attr]
+
+
+def get_match_index(game: str, max_number: int = 50, max_star: int = 12) -> MatchIndex:
+    """Prize-match index over the stored draws of a game, built once per store version (read-only)."""
+
+    def build(_store: Dict[str, List[Dict[str, object]]]) -> MatchIndex:
+        return MatchIndex(DrawHistory.from_draws(_game_draws(normalized_key), max_number, max_star))
+
+    normalized_key = game.lower()
+    return _cached_derived(f"matches:{normalized_key}:{max_number}:{max_star}", build)  # type: ignore[return-value]
+
+
+def get_grid_ranks(game: str, game_profile: Dict | None = None) -> List[int]:
+    """Combinadic rank of every stored draw of a game (see ``grid_codec``), in store order."""
+
+    def build(_store: Dict[str, List[Dict[str, object]]]) -> List[int]:
+        draws = _game_draws(normalized_key)
+        ranks = encode_grids([d.get("numbers", []) for d in draws], [d.get("stars", []) for d in draws], profile)
+        return list(ranks) if isinstance(ranks, list) else ranks.tolist()
+
+    normalized_key = game.lower()
+    profile = dict(game_profile or {})
+    shape = ":".join(str(profile.get(name, "")) for name in ("max_number", "numbers_to_pick", "max_star", "stars_to_pick"))
+    return list(_cached_derived(f"ranks:{normalized_key}:{shape}", build))  # type: ignore[arg-type]
+
+
+def deduplicate_draws(game: str, game_profile: Dict | None = None) -> Dict[str, int]:
+    """Drop repeated draws of a game (same grid and same ``draw_date``), keeping the first one.
+
+    Draws are compared through their grid rank, so the scan is one sort (or
+    hash pass) whatever the history size; the game is rewritten only when
+    something was removed.
+    """
+
+    with _store_lock():
+        draws = get_draws(game)
+        ranks = get_grid_ranks(game, game_profile)
+        dates: Dict[object, int] = {}
+        groups = [dates.setdefault(draw.get("draw_date") or None, len(dates)) for draw in draws]
+        kept = first_occurrences(ranks, groups)
+        if len(kept) < len(draws):
+            persist_draws(game, [draws[index] for index in kept], replace=True)
+    return {"rows": len(draws), "removed": len(draws) - len(kept)}
+
+
+def _build_summary(store: Dict[str, List[Dict[str, object]]]) -> Dict[str, Dict[str, object]]:
+    # Cleared games only remain in the version counters: listed as empty, as SQLite does.
+    with _STORE_LOCK:
+        versions = _cache["versions"] if _cache["store"] is store else {}
+    summary: Dict[str, Dict[str, object]] = {
+        game: {"stored": 0, "last_draw_date": None} for game in versions  # type: ignore[union-attr]
+    }
     for game, draws in store.items():
         last_date = None
         for draw in draws:
@@ -153,3 +747,165 @@ def summarize_store() -> Dict[str, Dict[str, object]]:
             "last_draw_date": last_date.isoformat() if last_date else None,
         }
     return summary
+
+
+def summarize_store() -> Dict[str, Dict[str, object]]:
+    """Return a summary of the stored manual draws per game."""
+
+    if sqlite_store.sqlite_enabled():
+        summary = _cached_derived("summary", lambda _store: sqlite_store.summarize())
+    else:
+        summary = _cached_derived("summary", _build_summary)
+    return {game: dict(entry) for game, entry in summary.items()}  # type: ignore[union-attr]
+
+
+def _load_feature_states() -> Dict[str, Dict[str, object]]:
+    path = _feature_state_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _load_feature_state(key: str) -> Dict[str, object] | None:
+    if sqlite_store.sqlite_enabled():
+        return sqlite_store.load_state(f"feature_state:{key}")
+    return _load_feature_states().get(key)
+
+
+def _save_feature_state(key: str, entry: Dict[str, object]) -> None:
+    if sqlite_store.sqlite_enabled():
+        # One row per state: an upsert, no read-modify-write to serialize.
+        sqlite_store.save_state(f"feature_state:{key}", entry)
+        return
+    with _store_lock():
+        states = _load_feature_states()
+        states[key] = entry
+        _write_atomic(_feature_state_path(), json.dumps(states, separators=(",", ":")))
+
+
+def _history_prefix(history: DrawHistory, size: int) -> DrawHistory | None:
+    """First ``size`` draws of a history (the history itself when complete), or None when too short."""
+
+    if not 0 <= size <= len(history):
+        return None
+    return history if size == len(history) else history[:size]
+
+
+def _build_feature_state(game: str, max_number: int, max_star: int) -> FeatureState:
+    history = get_history(game, max_number, max_star)
+    rewritten_at = get_store_version(game)["rewritten_at"]
+    key = f"{game}:{max_number}:{max_star}"
+    saved = _load_feature_state(key)
+    state = None
+    if isinstance(saved, dict) and saved.get("rewritten_at") == rewritten_at:
+        size = int(saved.get("size", -1))
+        prefix = _history_prefix(history, size)
+        # The version counters only say the history grew; the fingerprint checks
+        # the saved tables still describe its first ``size`` draws.
+        if prefix is not None and saved.get("fingerprint") == prefix.fingerprint():
+            try:
+                state = FeatureState.from_dict(saved, prefix)
+            except (KeyError, TypeError, ValueError):
+                state = None
+            else:
+                state.extend(history[size:])
+                state.history.fingerprint()
+                if size == len(history):
+                    return state
+    if state is None:
+        state = FeatureState.from_history({"max_number": max_number, "max_star": max_star}, history)
+    _save_feature_state(
+        key, {**state.to_dict(), "rewritten_at": rewritten_at, "fingerprint": state.history.fingerprint()}
+    )
+    return state
+
+
+def get_feature_state(game: str, max_number: int = 50, max_star: int = 12) -> FeatureState:
+    """Incremental feature state of a game's stored history.
+
+    The state is persisted next to the store with the fingerprint of the
+    history it covers.  While the history only grows (same ``rewritten_at``
+    and the same fingerprint for its first draws), the saved state is reused
+    and only the new draws are pushed; otherwise it is rebuilt.  Callers get a
+    copy they may extend freely.
+    """
+
+    normalized_key = game.lower()
+    state = _cached_derived(
+        f"features:{normalized_key}:{max_number}:{max_star}",
+        lambda _store: _build_feature_state(normalized_key, max_number, max_star),
+    )
+    return state.copy()  # type: ignore[union-attr]
+
+
+def _load_cooccurrence(key: str) -> Tuple[int, str, Cooccurrence] | None:
+    try:
+        if sqlite_store.sqlite_enabled():
+            saved = sqlite_store.load_state(f"cooccurrence:{key}")
+            if not saved:
+                return None
+            rewritten_at, fingerprint = int(saved["rewritten_at"]), str(saved["fingerprint"])
+            data = base64.b64decode(str(saved["data"]))
+        else:
+            # 8 bytes of rewritten_at, the 16-byte history fingerprint, then the counts.
+            raw = _cooccurrence_path(key).read_bytes()
+            rewritten_at, fingerprint, data = int.from_bytes(raw[:8], "little"), raw[8:24].hex(), raw[24:]
+        return rewritten_at, fingerprint, Cooccurrence.from_bytes(data)
+    except (FileNotFoundError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_cooccurrence(key: str, rewritten_at: int, fingerprint: str, state: Cooccurrence) -> None:
+    data = state.to_bytes()
+    if sqlite_store.sqlite_enabled():
+        sqlite_store.save_state(
+            f"cooccurrence:{key}",
+            {"rewritten_at": rewritten_at, "fingerprint": fingerprint, "data": base64.b64encode(data).decode("ascii")},
+        )
+        return
+    with _store_lock():
+        path = _cooccurrence_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(rewritten_at.to_bytes(8, "little") + bytes.fromhex(fingerprint) + data)
+        os.replace(tmp_path, path)
+
+
+def _build_cooccurrence(game: str, max_number: int, max_star: int) -> Cooccurrence:
+    history = get_history(game, max_number, max_star)
+    rewritten_at = get_store_version(game)["rewritten_at"]
+    key = f"{game}:{max_number}:{max_star}"
+    saved = _load_cooccurrence(key)
+    if saved is not None and saved[0] == rewritten_at:
+        _, fingerprint, state = saved
+        prefix = _history_prefix(history, len(state))
+        matches = prefix is not None and prefix.fingerprint() == fingerprint
+        if matches and (state.max_number, state.max_star) == (max_number, max_star):
+            if len(state) == len(history):
+                return state
+            state.extend(history[len(state):])
+            _save_cooccurrence(key, rewritten_at, history.fingerprint(), state)
+            return state
+    state = Cooccurrence.from_history(history)
+    _save_cooccurrence(key, rewritten_at, history.fingerprint(), state)
+    return state
+
+
+def get_cooccurrence(game: str, max_number: int = 50, max_star: int = 12) -> Cooccurrence:
+    """Pair and triplet co-occurrence counts of a game's stored history (read-only).
+
+    Persisted in binary form next to the store and maintained like the
+    feature state: while the history only grows, the saved counts are
+    reused and only the new draws are pushed.  Within a process, an append
+    through this module pushes the appended draws onto the cached counts
+    (see ``_carried_derived``) without reading the history or the saved file
+    back; the file is refreshed the next time the counts are built from disk.
+    """
+
+    normalized_key = game.lower()
+    return _cached_derived(  # type: ignore[return-value]
+        f"cooccurrence:{normalized_key}:{max_number}:{max_star}",
+        lambda _store: _build_cooccurrence(normalized_key, max_number, max_star),
+    )
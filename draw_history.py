@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from array import array
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+def _mask_values(mask: int) -> List[int]:
+    values = []
+    while mask:
+        low = mask & -mask
+        values.append(low.bit_length())
+        mask ^= low
+    return values
+
+
+def _values_mask(values: Iterable[int], max_value: int) -> int:
+    mask = 0
+    for value in values:
+        value = int(value)
+        if not 1 <= value <= max_value:
+            raise ValueError(f"value {value} outside 1..{max_value}")
+        mask |= 1 << (value - 1)
+    return mask
+
+
+def _bit_columns(masks: Sequence[int], width: int) -> List[int]:
+    """Transpose per-draw masks into one integer bitset per value.
+
+    Bit ``i`` of ``columns[v - 1]`` is set when draw ``i`` contains ``v``.
+    """
+
+    rows = [bytearray((len(masks) + 7) // 8) for _ in range(width)]
+    for index, mask in enumerate(masks):
+        byte, bit = index >> 3, 1 << (index & 7)
+        while mask:
+            low = mask & -mask
+            rows[low.bit_length() - 1][byte] |= bit
+            mask ^= low
+    return [int.from_bytes(row, "little") for row in rows]
+
+
+_EMPTY_FINGERPRINT = bytes(16)
+_RECORD = struct.Struct("<QHi")
+
+
+def _chain(fingerprint: bytes, numbers: int, stars: int, ordinal: int) -> bytes:
+    return hashlib.blake2b(fingerprint + _RECORD.pack(numbers, stars, ordinal), digest_size=16).digest()
+
+
+class DrawHistory:
+    """Compact, append-only draw history.
+
+    Each draw is a numbers bitmask (bit ``n - 1`` for number ``n``), a stars
+    bitmask and a date ordinal (0 when the date is unknown), stored in typed
+    arrays: about 14 bytes per draw instead of a dict of lists.  Per-value
+    column bitsets are built lazily so that counting over any window is a
+    popcount per value.
+
+    Values are kept as sets, so draws are handed back with sorted numbers and
+    stars whatever their input order: features read from a history (sliding
+    windows, the order of tied frequencies) see the canonical order.  Iteration and integer indexing yield plain dicts, which keeps the
+    type usable wherever a list of draw dicts was expected.
+
+    ``fingerprint()`` is a content hash chained draw by draw, so appending
+    keeps it current in O(1) instead of rehashing the whole history.
+    """
+
+    __slots__ = ("max_number", "max_star", "_numbers", "_stars", "_dates", "_columns", "_fingerprint")
+
+    def __init__(self, max_number: int = 50, max_star: int = 12) -> None:
+        if max_number > 64 or max_star > 16:
+            raise ValueError("DrawHistory supports at most 64 numbers and 16 stars")
+        self.max_number = max_number
+        self.max_star = max_star
+        self._numbers = array("Q")
+        self._stars = array("H")
+        self._dates = array("i")
+        self._columns: Tuple[List[int], List[int]] | None = None
+        # None when unknown (slices); computed lazily by ``fingerprint``.
+        self._fingerprint: bytes | None = _EMPTY_FINGERPRINT
+
+    @classmethod
+    def from_draws(cls, draws: Iterable[Dict], max_number: int = 50, max_star: int = 12) -> "DrawHistory":
+        if isinstance(draws, DrawHistory):
+            return draws.copy()
+        history = cls(max_number, max_star)
+        history.extend(draws)
+        return history
+
+    @classmethod
+    def for_profile(cls, game_profile: Dict, draws: Iterable[Dict] = ()) -> "DrawHistory":
+        return cls.from_draws(draws, game_profile.get("max_number", 50), game_profile.get("max_star", 12))
+
+    def copy(self) -> "DrawHistory":
+        clone = DrawHistory(self.max_number, self.max_star)
+        clone._numbers = array("Q", self._numbers)
+        clone._stars = array("H", self._stars)
+        clone._dates = array("i", self._dates)
+        clone._columns = self._columns
+        clone._fingerprint = self._fingerprint
+        return clone
+
+    def _record(self, draw: Dict) -> Tuple[int, int, int]:
+        draw_date = draw.get("draw_date")
+        return (
+            _values_mask(draw.get("numbers", []), self.max_number),
+            _values_mask(draw.get("stars", []), self.max_star),
+            date.fromisoformat(str(draw_date)).toordinal() if draw_date else 0,
+        )
+
+    def append(self, draw: Dict) -> None:
+        self.extend((draw,))
+
+    def extend(self, draws: Iterable[Dict]) -> None:
+        # Every draw is encoded before the arrays grow: a rejected draw leaves the history unchanged.
+        records = [self._record(draw) for draw in draws]
+        if not records:
+            return
+        for numbers, stars, ordinal in records:
+            self._numbers.append(numbers)
+            self._stars.append(stars)
+            self._dates.append(ordinal)
+            if self._fingerprint is not None:
+                self._fingerprint = _chain(self._fingerprint, numbers, stars, ordinal)
+        self._columns = None
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def _draw(self, index: int) -> Dict[str, object]:
+        draw: Dict[str, object] = {
+            "numbers": _mask_values(self._numbers[index]),
+            "stars": _mask_values(self._stars[index]),
+        }
+        if self._dates[index]:
+            draw["draw_date"] = date.fromordinal(self._dates[index]).isoformat()
+        return draw
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = DrawHistory(self.max_number, self.max_star)
+            view._numbers = self._numbers[index]
+            view._stars = self._stars[index]
+            view._dates = self._dates[index]
+            view._fingerprint = None
+            return view
+        return self._draw(index)
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        for index in range(len(self)):
+            yield self._draw(index)
+
+    def to_dicts(self) -> List[Dict[str, object]]:
+        return list(self)
+
+    @property
+    def numbers_masks(self) -> array:
+        """Underlying ``array('Q')`` of numbers masks (read-only by convention)."""
+
+        return self._numbers
+
+    @property
+    def stars_masks(self) -> array:
+        """Underlying ``array('H')`` of stars masks (read-only by convention)."""
+
+        return self._stars
+
+    @property
+    def date_ordinals(self) -> array:
+        """Underlying ``array('i')`` of draw date ordinals, 0 when undated (read-only by convention)."""
+
+        return self._dates
+
+    def numbers_mask(self, index: int) -> int:
+        return self._numbers[index]
+
+    def stars_mask(self, index: int) -> int:
+        return self._stars[index]
+
+    def fingerprint(self) -> str:
+        """Content hash of the draws (values and dates), as hex."""
+
+        if self._fingerprint is None:
+            fingerprint = _EMPTY_FINGERPRINT
+            for record in zip(self._numbers, self._stars, self._dates):
+                fingerprint = _chain(fingerprint, *record)
+            self._fingerprint = fingerprint
+        return self._fingerprint.hex()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the per-draw arrays (excluding lazily built columns)."""
+
+        return sum(arr.itemsize * len(arr) for arr in (self._numbers, self._stars, self._dates))
+
+    def columns(self) -> Tuple[List[int], List[int]]:
+        """Per-value bitsets over draw indexes, for numbers and stars."""
+
+        if self._columns is None:
+            self._columns = (
+                _bit_columns(self._numbers, self.max_number),
+                _bit_columns(self._stars, self.max_star),
+            )
+        return self._columns
+
+    def _window(self, start: int | None, stop: int | None) -> Tuple[int, int]:
+        begin, end, _ = slice(start, stop).indices(len(self))
+        return begin, max(begin, end)
+
+    def counts(self, start: int | None = None, stop: int | None = None) -> Dict[str, Counter]:
+        """Occurrence counts of every value over ``draws[start:stop]``.
+
+        Counters list values in order of first appearance in the window, as
+        iterating the draws would.
+        """
+
+        begin, end = self._window(start, stop)
+        window = (1 << (end - begin)) - 1
+        numbers_cols, stars_cols = self.columns()
+        return {
+            "numbers": _window_counter(numbers_cols, begin, window),
+            "stars": _window_counter(stars_cols, begin, window),
+        }
+
+
+def _window_counter(columns: List[int], begin: int, window: int) -> Counter:
+    found = []
+    for value, column in enumerate(columns, start=1):
+        bits = (column >> begin) & window
+        if bits:
+            found.append(((bits & -bits).bit_length(), value, bits.bit_count()))
+    found.sort()
+    return Counter({value: count for _, value, count in found})
+
+
+def count_values(draw_history: Sequence[Dict], last: int | None = None) -> Tuple[Counter, Counter]:
+    """Count numbers and stars over the whole history or its ``last`` draws."""
+
+    start = -last if last else None
+    if isinstance(draw_history, DrawHistory):
+        counts = draw_history.counts(start=start)
+        return counts["numbers"], counts["stars"]
+    numbers_counter: Counter[int] = Counter()
+    stars_counter: Counter[int] = Counter()
+    for draw in draw_history[start:] if start else draw_history:
+        numbers_counter.update(draw.get("numbers", []))
+        stars_counter.update(draw.get("stars", []))
+    return numbers_counter, stars_counter
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+# Reasons a draw is rejected, in the order the checks apply to one draw.
+SHAPE = "shape"
+VALUE_TYPE = "value_type"
+DUPLICATE = "duplicate"
+NUMBER_RANGE = "number_range"
+STAR_RANGE = "star_range"
+DATE = "date"
+_REASONS = (None, SHAPE, VALUE_TYPE, DUPLICATE, NUMBER_RANGE, STAR_RANGE, DATE)
+
+# Below this many draws the plain loop beats building arrays.
+NUMPY_MIN_DRAWS = 64
+
+
+def _invalid_dates(dates: Sequence[object]) -> List[bool]:
+    # Each distinct date string is parsed once.
+    verdicts: Dict[object, bool] = {}
+    flags = []
+    for value in dates:
+        if not value:
+            flags.append(False)
+            continue
+        verdict = verdicts.get(value)
+        if verdict is None:
+            try:
+                date.fromisoformat(value)  # type: ignore[arg-type]
+                verdict = False
+            except (TypeError, ValueError):
+                verdict = True
+            verdicts[value] = verdict
+        flags.append(verdict)
+    return flags
+
+
+def _integers(values: Sequence[object]) -> bool:
+    # Plain ints only: bools, floats and numeric strings are rejected by both paths alike.
+    return all(type(value) is int for value in values)
+
+
+def _python_reason(numbers: Sequence[int], stars: Sequence[int], bad_date: bool, game_profile: Dict) -> str | None:
+    if len(numbers) != game_profile["numbers_to_pick"] or len(stars) != game_profile["stars_to_pick"]:
+        return SHAPE
+    if not (_integers(numbers) and _integers(stars)):
+        return VALUE_TYPE
+    if len(set(numbers)) != len(numbers) or len(set(stars)) != len(stars):
+        return DUPLICATE
+    if not all(1 <= n <= game_profile["max_number"] for n in numbers):
+        return NUMBER_RANGE
+    if not all(1 <= s <= game_profile["max_star"] for s in stars):
+        return STAR_RANGE
+    if bad_date:
+        return DATE
+    return None
+
+
+def _numpy_reasons(values: "np.ndarray", pool: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    ordered = np.sort(values, axis=1)
+    duplicate = (np.diff(ordered, axis=1) == 0).any(axis=1)
+    out_of_range = (ordered[:, 0] < 1) | (ordered[:, -1] > pool) if ordered.shape[1] else np.zeros(len(ordered), bool)
+    return duplicate, out_of_range
+
+
+def _numpy_codes(numbers: Sequence[Sequence[int]], stars: Sequence[Sequence[int]], date_flags: List[bool],
+                 game_profile: Dict) -> "np.ndarray | None":
+    """Reason code (index in ``_REASONS``) of every draw; None when the values do not fit the arrays."""
+
+    numbers_to_pick, stars_to_pick = game_profile["numbers_to_pick"], game_profile["stars_to_pick"]
+    shape_ok = np.fromiter(
+        (len(n) == numbers_to_pick and len(s) == stars_to_pick for n, s in zip(numbers, stars)),
+        dtype=bool,
+        count=len(numbers),
+    )
+    # np.array would parse "1" and truncate 1.5: value types are checked first, per draw
+    # only when the one pass over every value finds something other than an int.
+    if set(map(type, chain.from_iterable(numbers))) | set(map(type, chain.from_iterable(stars))) <= {int}:
+        typed = np.ones(len(numbers), dtype=bool)
+    else:
+        typed = np.fromiter((_integers(n) and _integers(s) for n, s in zip(numbers, stars)), dtype=bool,
+                            count=len(numbers))
+    rows = np.flatnonzero(shape_ok & typed)
+    try:
+        numbers_array = np.array([numbers[i] for i in rows], dtype=np.int64).reshape(len(rows), numbers_to_pick)
+        stars_array = np.array([stars[i] for i in rows], dtype=np.int64).reshape(len(rows), stars_to_pick)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+    numbers_duplicate, numbers_range = _numpy_reasons(numbers_array, game_profile["max_number"])
+    stars_duplicate, stars_range = _numpy_reasons(stars_array, game_profile["max_star"])
+    # Each draw gets its first failing check, as in the plain loop.
+    codes = np.where(shape_ok, np.where(typed, 0, 2), 1).astype(np.int8)
+    codes[rows] = np.select(
+        [numbers_duplicate | stars_duplicate, numbers_range, stars_range, np.asarray(date_flags, dtype=bool)[rows]],
+        [3, 4, 5, 6],
+        0,
+    )
+    return codes
+
+
+def _checked(numbers: Sequence[Sequence[int]], stars: Sequence[Sequence[int]], dates: Sequence[object],
+             game_profile: Dict) -> Tuple[List[bool], "np.ndarray | None"]:
+    if not len(numbers) == len(stars) == len(dates):
+        raise ValueError("numbers, stars and dates must describe the same draws")
+    date_flags = _invalid_dates(dates)
+    codes = None
+    if np is not None and len(numbers) >= NUMPY_MIN_DRAWS:
+        codes = _numpy_codes(numbers, stars, date_flags, game_profile)
+    return date_flags, codes
+
+
+def first_invalid(numbers: Sequence[Sequence[int]], stars: Sequence[Sequence[int]], dates: Sequence[object],
+                  game_profile: Dict) -> Tuple[int, str] | None:
+    """Index and reason of the first invalid draw, or None when every draw is valid.
+
+    A draw needs the profile's count of distinct integer numbers and stars,
+    within range, and an ISO date when it has one; for each draw the checks apply in
+    that order.  With NumPy the count and range checks run over ``(draws,
+    values)`` arrays at once; dates are parsed once per distinct value.
+    """
+
+    date_flags, codes = _checked(numbers, stars, dates, game_profile)
+    if codes is not None:
+        invalid = np.flatnonzero(codes)
+        return (int(invalid[0]), _REASONS[int(codes[invalid[0]])]) if len(invalid) else None
+    for index, (draw_numbers, draw_stars) in enumerate(zip(numbers, stars)):
+        reason = _python_reason(draw_numbers, draw_stars, date_flags[index], game_profile)
+        if reason is not None:
+            return index, reason
+    return None
+
+
+def invalid_draws(numbers: Sequence[Sequence[int]], stars: Sequence[Sequence[int]], dates: Sequence[object],
+                  game_profile: Dict) -> List[Tuple[int, str]]:
+    """Index and reason of every invalid draw (same checks as ``first_invalid``)."""
+
+    date_flags, codes = _checked(numbers, stars, dates, game_profile)
+    if codes is not None:
+        return [(index, _REASONS[codes[index]]) for index in np.flatnonzero(codes).tolist()]
+    reasons = (
+        _python_reason(draw_numbers, draw_stars, bad_date, game_profile)
+        for draw_numbers, draw_stars, bad_date in zip(numbers, stars, date_flags)
+    )
+    return [(index, reason) for index, reason in enumerate(reasons) if reason is not None]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from functools import lru_cache
+from math import comb
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+Grid = Tuple[List[int], List[int]]
+
+# Ranks fit in an unsigned 32-bit integer for every supported profile (139,838,160
+# EuroMillions grids), which is the on-disk width used by ``pack_ranks``.
+RANK_BYTES = 4
+
+
+def grid_space(game_profile: Dict) -> int:
+    """Number of distinct grids allowed by a game profile (every rank is below it)."""
+
+    return comb(game_profile.get("max_number", 50), game_profile.get("numbers_to_pick", 5)) * comb(
+        game_profile.get("max_star", 12), game_profile.get("stars_to_pick", 2)
+    )
+
+
+def _profile_shape(game_profile: Dict) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    return (
+        (game_profile.get("max_number", 50), game_profile.get("numbers_to_pick", 5)),
+        (game_profile.get("max_star", 12), game_profile.get("stars_to_pick", 2)),
+    )
+
+
+def _subset_rank(values: Iterable[int], pool: int, pick: int) -> int:
+    # Combinadic (colex) rank: sum of C(value - 1, i) over the sorted values, i from 1.
+    ordered = sorted(values)
+    if len(ordered) != pick or len(set(ordered)) != pick or ordered[0] < 1 or ordered[-1] > pool:
+        raise ValueError(f"expected {pick} distinct values between 1 and {pool}")
+    return sum(comb(value - 1, index) for index, value in enumerate(ordered, start=1))
+
+
+def _subset_unrank(rank: int, pick: int) -> List[int]:
+    values = []
+    for index in range(pick, 0, -1):
+        position = index - 1
+        while comb(position + 1, index) <= rank:
+            position += 1
+        rank -= comb(position, index)
+        values.append(position + 1)
+    return values[::-1]
+
+
+def encode_grid(numbers: Iterable[int], stars: Iterable[int], game_profile: Dict | None = None) -> int:
+    """Rank of a grid in ``[0, grid_space(profile))``; the order of the values does not matter."""
+
+    (max_number, numbers_to_pick), (max_star, stars_to_pick) = _profile_shape(game_profile or {})
+    return _subset_rank(numbers, max_number, numbers_to_pick) * comb(max_star, stars_to_pick) + _subset_rank(
+        stars, max_star, stars_to_pick
+    )
+
+
+def decode_grid(rank: int, game_profile: Dict | None = None) -> Grid:
+    """Sorted numbers and stars of the grid with this rank."""
+
+    game_profile = game_profile or {}
+    if not 0 <= rank < grid_space(game_profile):
+        raise ValueError(f"grid rank must be between 0 and {grid_space(game_profile) - 1}")
+    (_, numbers_to_pick), (max_star, stars_to_pick) = _profile_shape(game_profile)
+    numbers_rank, stars_rank = divmod(rank, comb(max_star, stars_to_pick))
+    return _subset_unrank(numbers_rank, numbers_to_pick), _subset_unrank(stars_rank, stars_to_pick)
+
+
+@lru_cache(maxsize=16)
+def _binomials(pool: int, pick: int) -> "np.ndarray":
+    """``table[c, i] = C(c, i)`` for every position ``c <= pool`` and ``i <= pick``."""
+
+    return np.array([[comb(c, i) for i in range(pick + 1)] for c in range(pool + 1)], dtype=np.int64)
+
+
+def _numpy_subset_ranks(values: "np.ndarray", pool: int, pick: int) -> "np.ndarray":
+    values = np.sort(np.asarray(values, dtype=np.int64).reshape(len(values), pick), axis=1)
+    if len(values) and (
+        values[:, 0].min() < 1 or values[:, -1].max() > pool or (pick > 1 and (np.diff(values, axis=1) == 0).any())
+    ):
+        raise ValueError(f"expected {pick} distinct values between 1 and {pool}")
+    table = _binomials(pool, pick)
+    return table[values - 1, np.arange(1, pick + 1)].sum(axis=1)
+
+
+def _numpy_subset_unranks(ranks: "np.ndarray", pool: int, pick: int) -> "np.ndarray":
+    table = _binomials(pool, pick)
+    ranks = ranks.copy()
+    values = np.empty((len(ranks), pick), dtype=np.int64)
+    for index in range(pick, 0, -1):
+        # Largest position whose C(position, index) does not exceed the remaining rank.
+        position = np.searchsorted(table[:, index], ranks, side="right") - 1
+        ranks -= table[position, index]
+        values[:, index - 1] = position + 1
+    return values
+
+
+def subset_masks(ranks: "np.ndarray", pool: int, pick: int) -> "np.ndarray":
+    """Bitmask (bit ``v - 1`` for value ``v``) of the ``pick``-subset with each combinadic rank (NumPy only)."""
+
+    table = _binomials(pool, pick)
+    ranks = np.array(ranks, dtype=np.int64)
+    masks = np.zeros(len(ranks), dtype=np.uint64)
+    for index in range(pick, 0, -1):
+        position = np.searchsorted(table[:, index], ranks, side="right") - 1
+        ranks -= table[position, index]
+        masks |= np.left_shift(np.uint64(1), position.astype(np.uint64))
+    return masks
+
+
+def encode_grids(numbers: Sequence[Sequence[int]], stars: Sequence[Sequence[int]],
+                 game_profile: Dict | None = None):
+    """Vectorized ``encode_grid``: an ``int64`` array with NumPy, a list otherwise."""
+
+    (max_number, numbers_to_pick), (max_star, stars_to_pick) = _profile_shape(game_profile or {})
+    if len(numbers) != len(stars):
+        raise ValueError("numbers and stars must describe the same grids")
+    if np is None:
+        profile = game_profile or {}
+        return [encode_grid(grid_numbers, grid_stars, profile) for grid_numbers, grid_stars in zip(numbers, stars)]
+    try:
+        numbers_array = np.asarray(numbers, dtype=np.int64).reshape(len(numbers), numbers_to_pick)
+        stars_array = np.asarray(stars, dtype=np.int64).reshape(len(stars), stars_to_pick)
+    except ValueError as exc:
+        raise ValueError(f"expected {numbers_to_pick} numbers and {stars_to_pick} stars per grid") from exc
+    return _numpy_subset_ranks(numbers_array, max_number, numbers_to_pick) * comb(
+        max_star, stars_to_pick
+    ) + _numpy_subset_ranks(stars_array, max_star, stars_to_pick)
+
+
+def decode_grids(ranks: Sequence[int], game_profile: Dict | None = None) -> List[Grid]:
+    """Vectorized ``decode_grid``."""
+
+    game_profile = game_profile or {}
+    if np is None:
+        return [decode_grid(rank, game_profile) for rank in ranks]
+    (max_number, numbers_to_pick), (max_star, stars_to_pick) = _profile_shape(game_profile)
+    ranks = np.asarray(ranks, dtype=np.int64)
+    if len(ranks) and (ranks.min() < 0 or ranks.max() >= grid_space(game_profile)):
+        raise ValueError(f"grid rank must be between 0 and {grid_space(game_profile) - 1}")
+    numbers_ranks, stars_ranks = np.divmod(ranks, comb(max_star, stars_to_pick))
+    numbers = _numpy_subset_unranks(numbers_ranks, max_number, numbers_to_pick).tolist()
+    stars = _numpy_subset_unranks(stars_ranks, max_star, stars_to_pick).tolist()
+    return list(zip(numbers, stars))
+
+
+def first_occurrences(ranks: Sequence[int], groups: Sequence[int] | None = None) -> List[int]:
+    """Indexes of the first occurrence of every distinct rank (or ``(group, rank)`` pair), in input order.
+
+    One stable sort of the keys with NumPy, one hash-set pass otherwise:
+    never a pairwise comparison.
+    """
+
+    if np is None:
+        keys = ranks if groups is None else list(zip(groups, ranks))
+        seen = set()
+        kept = []
+        for index, key in enumerate(keys):
+            if key not in seen:
+                seen.add(key)
+                kept.append(index)
+        return kept
+    ranks = np.asarray(ranks, dtype=np.int64)
+    groups = np.zeros(len(ranks), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    if not len(ranks):
+        return []
+    # Stable sort: within a run of equal keys the first index is the earliest occurrence.
+    order = np.lexsort((ranks, groups))
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (np.diff(ranks[order]) != 0) | (np.diff(groups[order]) != 0)
+    return np.sort(order[starts]).tolist()
+
+
+def unique_ranks(ranks: Sequence[int]) -> List[int]:
+    """Sorted distinct ranks."""
+
+    if np is None:
+        return sorted(set(ranks))
+    return np.unique(np.asarray(ranks, dtype=np.int64)).tolist()
+
+
+def union_ranks(left: Sequence[int], right: Sequence[int]) -> List[int]:
+    """Sorted ranks present in either collection."""
+
+    if np is None:
+        return sorted(set(left) | set(right))
+    return np.union1d(np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)).tolist()
+
+
+def intersect_ranks(left: Sequence[int], right: Sequence[int]) -> List[int]:
+    """Sorted ranks present in both collections."""
+
+    if np is None:
+        return sorted(set(left) & set(right))
+    return np.intersect1d(np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)).tolist()
+
+
+def difference_ranks(left: Sequence[int], right: Sequence[int]) -> List[int]:
+    """Sorted ranks of ``left`` absent from ``right``."""
+
+    if np is None:
+        return sorted(set(left) - set(right))
+    return np.setdiff1d(np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)).tolist()
+
+
+def pack_ranks(ranks: Iterable[int]) -> bytes:
+    """On-disk form of a grid collection: little-endian unsigned 32-bit ranks (4 bytes per grid)."""
+
+    packed = array("I", ranks) if array("I").itemsize == RANK_BYTES else array("L", ranks)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ranks(data: bytes) -> List[int]:
+    """Inverse of ``pack_ranks``."""
+
+    if len(data) % RANK_BYTES:
+        raise ValueError("packed ranks must be a multiple of 4 bytes")
+    packed = array("I") if array("I").itemsize == RANK_BYTES else array("L")
+    packed.frombytes(data)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+# Memory budget of the NumPy engine: at most this many combinations are scored at once,
+# on top of the (pick - 1)-combination table shared by every chunk.
+CHUNK_ROWS = 1 << 18
+
+# Ranked combinations are (score, values); values are sorted and 1-based.
+Ranked = Tuple[float, Tuple[int, ...]]
+
+
+def default_workers() -> int:
+    """Process count for rankings, from ``RANKING_WORKERS`` (1 = in-process)."""
+
+    try:
+        workers = int(os.environ.get("RANKING_WORKERS", "1"))
+    except ValueError:
+        return 1
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+def _combo_score(scores: Sequence[float], combo: Sequence[int]) -> float:
+    # Head plus left-to-right sum of the tail: the exact order of the NumPy engine,
+    # so that both engines break ties on bit-identical scores.
+    tail = 0.0
+    for position in combo[1:]:
+        tail += scores[position]
+    return scores[combo[0]] + tail
+
+
+def _python_top(scores: Sequence[float], pick: int, k: int) -> List[Ranked]:
+    """Best-first enumeration of the ``k`` best ``pick``-subsets.
+
+    Positions are visited by decreasing score (ties by value), so moving any
+    chosen position one step down never improves a subset: popping a heap of
+    frontier subsets yields them in exact rank order.
+    """
+
+    order = sorted(range(len(scores)), key=lambda position: (-scores[position], position))
+
+    def entry(indexes: Tuple[int, ...]) -> Tuple[float, Tuple[int, ...], Tuple[int, ...]]:
+        combo = tuple(sorted(order[index] for index in indexes))
+        return -_combo_score(scores, combo), combo, indexes
+
+    start = tuple(range(pick))
+    heap = [entry(start)]
+    seen = {start}
+    ranked: List[Ranked] = []
+    while heap and len(ranked) < k:
+        negative, combo, indexes = heapq.heappop(heap)
+        ranked.append((-negative, tuple(position + 1 for position in combo)))
+        for slot in range(pick):
+            bound = indexes[slot + 1] if slot + 1 < pick else len(scores)
+            if indexes[slot] + 1 < bound:
+                successor = indexes[:slot] + (indexes[slot] + 1,) + indexes[slot + 1:]
+                if successor not in seen:
+                    seen.add(successor)
+                    heapq.heappush(heap, entry(successor))
+    return ranked
+
+
+@lru_cache(maxsize=8)
+def _tails(pool: int, size: int) -> "np.ndarray":
+    """Every ``size``-combination of ``range(pool)``, in lexicographic order."""
+
+    flat = np.fromiter((value for combo in combinations(range(pool), size) for value in combo), dtype=np.int16)
+    return flat.reshape(-1, size)
+
+
+def _select(scores: "np.ndarray", heads: "np.ndarray", rows: "np.ndarray", k: int) -> "np.ndarray":
+    """Indexes of the ``k`` best candidates, by score then lexicographic order."""
+
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        chosen = np.concatenate([above, ties])
+    else:
+        chosen = np.arange(len(scores))
+    return chosen[np.lexsort((rows[chosen], heads[chosen], -scores[chosen]))]
+
+
+def _numpy_top(scores: Sequence[float], pick: int, k: int, heads: Sequence[int], chunk_rows: int) -> List[Ranked]:
+    """Score every ``pick``-subset whose smallest position is in ``heads`` and keep the ``k`` best.
+
+    A subset is a head plus a (pick - 1)-combination of the larger positions;
+    in lexicographic order those combinations are a suffix of one shared
+    table, so each head only adds its score to a slice of precomputed tail
+    sums, ``chunk_rows`` rows at a time.
+    """
+
+    values = np.asarray(scores, dtype=np.float64)
+    pool = len(values)
+    tails = _tails(pool, pick - 1)
+    tail_scores = np.zeros(len(tails))
+    for column in range(pick - 1):
+        tail_scores += values[tails[:, column]]
+
+    best_scores = np.empty(0)
+    best_heads = np.empty(0, dtype=np.int64)
+    best_tails = np.empty(0, dtype=np.int64)
+    for head in heads:
+        # Tails whose first position is above ``head`` start at this offset.
+        first = len(tails) - comb(pool - head - 1, pick - 1)
+        for start in range(first, len(tails), chunk_rows):
+            stop = min(start + chunk_rows, len(tails))
+            chunk = values[head] + tail_scores[start:stop]
+            chunk_heads = np.full(len(chunk), head, dtype=np.int64)
+            chunk_tails = np.arange(start, stop, dtype=np.int64)
+            kept = _select(chunk, chunk_heads, chunk_tails, k)
+            best_scores = np.concatenate([best_scores, chunk[kept]])
+            best_heads = np.concatenate([best_heads, chunk_heads[kept]])
+            best_tails = np.concatenate([best_tails, chunk_tails[kept]])
+            kept = _select(best_scores, best_heads, best_tails, k)
+            best_scores, best_heads, best_tails = best_scores[kept], best_heads[kept], best_tails[kept]
+
+    return [
+        (score, (head + 1,) + tuple(position + 1 for position in tail))
+        for score, head, tail in zip(best_scores.tolist(), best_heads.tolist(), tails[best_tails].tolist())
+    ]
+
+
+def top_combinations(scores: Sequence[float], pick: int, k: int, *, workers: int = 1,
+                     chunk_rows: int = CHUNK_ROWS) -> List[Ranked]:
+    """The ``k`` best ``pick``-subsets of values for an additive score.
+
+    ``scores`` is indexed by value (index 0 unused) and a subset scores the
+    sum of its values; ties are ranked by lexicographic order of the values.
+    With NumPy every subset is scored by chunks and the per-head winners are
+    heap-merged, the heads being spread over ``workers`` processes; without
+    it, a best-first enumeration visits only about ``k * pick`` subsets.
+    """
+
+    positions = list(scores[1:])
+    if not 1 <= pick <= len(positions):
+        raise ValueError(f"pick must be between 1 and {len(positions)}")
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    k = min(k, comb(len(positions), pick))
+    if np is None or pick == 1:
+        return _python_top(positions, pick, k)
+
+    heads = range(len(positions) - pick + 1)
+    workers = max(1, min(workers, len(heads)))
+    if workers == 1:
+        return _numpy_top(positions, pick, k, heads, chunk_rows)
+    # Heads are dealt round-robin: the first ones own the largest suffixes.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_numpy_top, positions, pick, k, heads[index::workers], chunk_rows)
+            for index in range(workers)
+        ]
+        parts = [future.result() for future in futures]
+    merged = heapq.merge(*parts, key=lambda ranked: (-ranked[0], ranked[1]))
+    return [ranked for ranked, _ in zip(merged, range(k))]
+
+
+def top_grids(scores: Tuple[Sequence[float], Sequence[float]], picks: Tuple[int, int], k: int, *,
+              workers: int | None = None, chunk_rows: int = CHUNK_ROWS) -> Dict[str, object]:
+    """Exact top-``k`` full grids for additive per-value ``(numbers, stars)`` scores.
+
+    A grid's score is its numbers' score plus its stars' score, so the ``k``
+    best grids only combine the ``k`` best numbers subsets with the ``k``
+    best stars subsets; a heap walks that product best first.  Returns
+    ``{"grids": [(numbers, stars, score)], "space", "workers", "elapsed"}``
+    where ``space`` is the number of grids ranked.
+    """
+
+    started = time.perf_counter()
+    workers = default_workers() if workers is None else max(1, workers)
+    numbers = top_combinations(scores[0], picks[0], k, workers=workers, chunk_rows=chunk_rows)
+    stars = top_combinations(scores[1], picks[1], k, chunk_rows=chunk_rows)
+
+    def entry(i: int, j: int) -> Tuple[float, Tuple[int, ...], Tuple[int, ...], int, int]:
+        return -(numbers[i][0] + stars[j][0]), numbers[i][1], stars[j][1], i, j
+
+    heap = [entry(0, 0)]
+    seen = {(0, 0)}
+    grids = []
+    while heap and len(grids) < k:
+        negative, grid_numbers, grid_stars, i, j = heapq.heappop(heap)
+        grids.append((list(grid_numbers), list(grid_stars), -negative))
+        for successor in ((i + 1, j), (i, j + 1)):
+            if successor[0] < len(numbers) and successor[1] < len(stars) and successor not in seen:
+                seen.add(successor)
+                heapq.heappush(heap, entry(*successor))
+
+    return {
+        "grids": grids,
+        "space": comb(len(scores[0]) - 1, picks[0]) * comb(len(scores[1]) - 1, picks[1]),
+        "workers": workers,
+        "elapsed": time.perf_counter() - started,
+    }
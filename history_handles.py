@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from draw_history import DrawHistory
+from preparateur_donnees import FeatureState
+
+# Length of a handle: a hex prefix of the SHA-256 of the game and the history content.
+HANDLE_LENGTH = 32
+_HANDLE_PATTERN = re.compile(f"[0-9a-f]{{{HANDLE_LENGTH}}}")
+# Handle files carry their own suffix: the directory may hold other JSON files.
+FILE_SUFFIX = ".history.json"
+
+
+def history_handle(game: str, history: DrawHistory) -> str:
+    """Content-addressed handle of a history: same game and draws, same handle."""
+
+    content = f"{game.lower()}:{history.max_number}:{history.max_star}:{history.fingerprint()}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:HANDLE_LENGTH]
+
+
+def is_history_handle(value: object) -> bool:
+    """True when ``value`` has the shape of a ``history_handle`` (lowercase hex digest)."""
+
+    return isinstance(value, str) and _HANDLE_PATTERN.fullmatch(value) is not None
+
+
+class HistoryHandles:
+    """Bounded store of validated histories addressed by ``history_handle``.
+
+    Each entry keeps the game and a ``FeatureState`` (the history plus its
+    incremental feature tables), so a request naming a handle skips
+    normalization, validation and featurization.  Entries live in an LRU of
+    ``maxsize`` handles; with a ``directory`` each one is also written there
+    as ``<handle>.history.json``, and a handle missing from memory is loaded from its file, so
+    workers sharing the directory see each other's handles.  Every use
+    refreshes the file's mtime and the directory keeps the ``maxsize`` most
+    recently used files, whichever worker used them.
+    """
+
+    def __init__(self, maxsize: int = 64, directory: Path | None = None) -> None:
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries: "OrderedDict[str, Tuple[str, FeatureState]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls) -> "HistoryHandles":
+        """Store sized by ``HISTORY_HANDLES_SIZE``, persisted only when ``HISTORY_HANDLES_PATH`` is set."""
+
+        try:
+            maxsize = int(os.environ.get("HISTORY_HANDLES_SIZE", "64"))
+        except ValueError:
+            maxsize = 64
+        directory = os.environ.get("HISTORY_HANDLES_PATH")
+        return cls(maxsize, Path(directory) if directory else None)
+
+    def _path(self, handle: str) -> Path:
+        # Only a well-formed handle may become a file name (no "../" escape).
+        if not is_history_handle(handle):
+            raise ValueError(f"invalid history handle: {handle!r}")
+        return self.directory / f"{handle}{FILE_SUFFIX}"  # type: ignore[operator]
+
+    def _touch(self, handle: str) -> None:
+        # Nanosecond mtimes keep the recency order exact across workers.
+        if self.directory is not None:
+            now = time.time_ns()
+            try:
+                os.utime(self._path(handle), ns=(now, now))
+            except FileNotFoundError:
+                pass  # pruned by another worker; the entry stays usable in memory
+
+    def put(self, game: str, game_profile: Dict, draws: Iterable[Dict]) -> Tuple[str, FeatureState]:
+        """Store already validated draws; returns the handle and the state (shared, read-only)."""
+
+        state = FeatureState.from_history(game_profile, draws)
+        handle = history_handle(game, state.history)
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                self._entries.move_to_end(handle)
+        if entry is not None and (self.directory is None or self._path(handle).exists()):
+            self._touch(handle)
+            return handle, entry[1]
+        if self.directory is not None and self.maxsize > 0:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(handle)
+            # A per-process temporary name: workers may write the same handle at once.
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            content = {
+                "game": game.lower(),
+                "max_number": state.max_number,
+                "max_star": state.max_star,
+                "draws": state.history.to_dicts(),
+            }
+            tmp_path.write_text(json.dumps(content, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, path)
+            self._touch(handle)
+            self._prune()
+        if entry is not None:
+            return handle, entry[1]
+        self._remember(handle, game.lower(), state)
+        return handle, state
+
+    def get(self, handle: str) -> Tuple[str, FeatureState] | None:
+        """Game and state (shared, read-only) of a handle, or None if unknown, evicted or malformed."""
+
+        if not is_history_handle(handle):
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                self._entries.move_to_end(handle)
+                self._counters["hits"] += 1
+        if entry is not None:
+            self._touch(handle)
+            return entry
+        entry = self._load(handle)
+        if entry is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        self._touch(handle)
+        self._remember(handle, *entry)
+        return entry
+
+    def _load(self, handle: str) -> Tuple[str, FeatureState] | None:
+        if self.directory is None:
+            return None
+        try:
+            content = json.loads(self._path(handle).read_text(encoding="utf-8"))
+            game = str(content["game"])
+            state = FeatureState.from_history(content, content["draws"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+        if history_handle(game, state.history) != handle:
+            return None  # altered on disk
+        with self._lock:
+            self._counters["loads"] += 1
+        return game, state
+
+    def _remember(self, handle: str, game: str, state: FeatureState) -> None:
+        if self.maxsize < 1:
+            return
+        with self._lock:
+            self._entries[handle] = (game, state)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def _prune(self) -> None:
+        """Delete the least recently used handle files beyond ``maxsize``; files other workers removed are skipped."""
+
+        files = []
+        for path in self.directory.glob(f"*{FILE_SUFFIX}"):  # type: ignore[union-attr]
+            try:
+                files.append((path.stat().st_mtime_ns, path.name, path))
+            except FileNotFoundError:
+                continue
+        files.sort(reverse=True)
+        for _, _, path in files[max(self.maxsize, 0):]:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {**self._counters, "size": len(self._entries), "maxsize": self.maxsize}
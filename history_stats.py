@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterable, List, Tuple
+
+from draw_history import DrawHistory, _mask_values
+
+
+def _value_positions(masks: Iterable[int], pool: int) -> List[array]:
+    positions = [array("I") for _ in range(pool + 1)]
+    for index, mask in enumerate(masks):
+        while mask:
+            low = mask & -mask
+            positions[low.bit_length()].append(index)
+            mask ^= low
+    return positions
+
+
+def _prefix_counts(positions: array, size: int) -> array:
+    hits = bytearray(size)
+    for index in positions:
+        hits[index] = 1
+    return array("I", accumulate(hits, initial=0))
+
+
+class HistoryStats:
+    """Per-request statistics shared by every strategy.
+
+    Built in one pass over a ``DrawHistory``: for each value, the sorted
+    indexes of the draws containing it and a prefix-count array, so the
+    count of any window ``draws[start:stop]`` is a subtraction per value and
+    a whole ``Counter`` costs O(pool) whatever the window length.
+
+    ``prefix(t)`` is an O(1) view restricted to the first ``t`` draws, which
+    lets walk-forward evaluations reuse the same arrays; ``history`` stays the
+    full underlying history.
+    """
+
+    __slots__ = ("history", "size", "_positions", "_prefix")
+
+    def __init__(self, history: DrawHistory) -> None:
+        self.history = history
+        self.size = size = len(history)
+        self._positions = {
+            "numbers": _value_positions(history.numbers_masks, history.max_number),
+            "stars": _value_positions(history.stars_masks, history.max_star),
+        }
+        self._prefix = {
+            key: [_prefix_counts(values, size) for values in positions]
+            for key, positions in self._positions.items()
+        }
+
+    @classmethod
+    def from_history(cls, game_profile: Dict, draw_history: Iterable[Dict] | "HistoryStats") -> "HistoryStats":
+        """Return ``draw_history`` itself if it already is a ``HistoryStats``."""
+
+        if isinstance(draw_history, HistoryStats):
+            return draw_history
+        if not isinstance(draw_history, DrawHistory):
+            draw_history = DrawHistory.for_profile(game_profile, draw_history)
+        return cls(draw_history)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def prefix(self, stop: int) -> "HistoryStats":
+        """Statistics of ``draws[:stop]``, sharing this object's arrays."""
+
+        view = HistoryStats.__new__(HistoryStats)
+        view.history = self.history
+        view.size = max(0, min(stop, self.size))
+        view._positions = self._positions
+        view._prefix = self._prefix
+        return view
+
+    def fingerprint(self) -> str:
+        """Content hash of the visible draws (see ``DrawHistory.fingerprint``)."""
+
+        if self.size == len(self.history):
+            return self.history.fingerprint()
+        return self.history[: self.size].fingerprint()
+
+    def counts(self, key: str, start: int | None = None, stop: int | None = None) -> Counter:
+        """Counts of ``key`` values over ``draws[start:stop]``.
+
+        Like ``DrawHistory.counts``, values are listed in order of first
+        appearance in the window.
+        """
+
+        begin, end, _ = slice(start, stop).indices(len(self))
+        end = max(begin, end)
+        found = []
+        positions = self._positions[key]
+        for value, prefix in enumerate(self._prefix[key]):
+            before = prefix[begin]
+            count = prefix[end] - before
+            if count:
+                found.append((positions[value][before], value, count))
+        found.sort()
+        return Counter({value: count for _, value, count in found})
+
+    def value_counts(self, key: str, start: int | None = None, stop: int | None = None) -> List[int]:
+        """Counts over ``draws[start:stop]`` as a list indexed by value (index 0 unused).
+
+        Cheaper than ``counts`` when the first-appearance order is not needed.
+        """
+
+        begin, end, _ = slice(start, stop).indices(len(self))
+        end = max(begin, end)
+        return [prefix[end] - prefix[begin] for prefix in self._prefix[key]]
+
+    def window(self, last: int | None = None) -> Tuple[Counter, Counter]:
+        """Numbers and stars counts over the whole history or its ``last`` draws."""
+
+        start = -last if last else None
+        return self.counts("numbers", start), self.counts("stars", start)
+
+    def draw_values(self, index: int) -> Tuple[List[int], List[int]]:
+        """Sorted numbers and stars of one draw."""
+
+        index = range(self.size)[index]
+        return (
+            _mask_values(self.history.numbers_mask(index)),
+            _mask_values(self.history.stars_mask(index)),
+        )
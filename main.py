@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import io
+import time
 from datetime import date
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+import draw_validation
 import ml_strategies
 from admin_state import (
     append_log,
@@ -26,17 +29,45 @@ from admin_state import (
     update_celery_status,
     update_system_health,
 )
+from backtest import run_backtest
+from bulk_import import BATCH_SIZE as IMPORT_BATCH_SIZE
+from bulk_import import FORMATS as IMPORT_FORMATS
+from bulk_import import PARSE as IMPORT_PARSE_ERROR
+from bulk_import import UNKNOWN_GAME as IMPORT_UNKNOWN_GAME
+from bulk_import import import_archive
+from cooccurrence import pair_matrix, top_pairs, top_triplets
 from data_store import (
-    _store_path,
+    cache_stats,
     clear_draws,
+    compact_store,
+    deduplicate_draws,
     export_store,
+    get_cooccurrence,
     get_draws,
+    get_feature_state,
+    get_history,
+    get_match_index,
+    get_store_version,
+    load_store,
+    load_strategy_params,
     load_training_status,
     persist_draws,
     record_training_run,
+    save_strategy_params,
+    store_size_bytes,
     summarize_store,
 )
-from preparateur_donnees import prepare_features
+from draw_history import DrawHistory
+from grid_ranking import top_grids
+from history_handles import HistoryHandles, is_history_handle
+from history_stats import HistoryStats
+from ml_strategies.meta_ia import MEMBER_STRATEGIES as META_IA_MEMBERS
+from preparateur_donnees import FEATURE_SECTIONS, FeatureState, prepare_features
+from prize_simulator import default_workers as simulation_workers
+from prize_simulator import simulate_prizes
+from result_cache import ResultCache, result_key
+from strategy_params import DEFAULT_PARAMS, active_params, expand_grid
+from sweep import run_sweep
 
 
 class Draw(BaseModel):
@@ -57,6 +88,140 @@ class GenerateRequest(BaseModel):
             "Si vrai, utilise l'historique manuel persisté pour le jeu ciblé et fusionne avec le payload fourni."
         ),
     )
+    features: List[str] | str = Field(
+        default_factory=lambda: list(FEATURE_SECTIONS),
+        description="Sections de features à calculer : frequencies, gaps, windows, all ou none.",
+    )
+    window_size: int = Field(default=5, description="Taille des fenêtres glissantes (section windows).")
+    max_windows: int | None = Field(
+        default=None,
+        description="Nombre maximal de fenêtres renvoyées par type (toutes si absent).",
+    )
+    count: int = Field(default=1, description="Nombre de grilles distinctes à générer (stratégies multi-grilles).")
+    seed: int | None = Field(default=None, description="Graine optionnelle pour un tirage reproductible.")
+    simulations: int | None = Field(
+        default=None, description="Nombre de grilles simulées par la stratégie Monte Carlo (mcc)."
+    )
+    time_budget_ms: int | None = Field(
+        default=None, description="Budget de temps de la simulation Monte Carlo, en millisecondes."
+    )
+    members: Dict[str, float] | None = Field(
+        default=None, description="Membres du consensus meta_ia et leurs poids (ex. {\"fibo\": 1, \"mcc\": 2})."
+    )
+    member_timeout_ms: int | None = Field(
+        default=None, description="Délai par membre meta_ia, en millisecondes ; un membre en retard est écarté."
+    )
+    history_id: str | None = Field(
+        default=None,
+        description="Handle renvoyé par POST /api/histories : réutilise l'historique validé côté serveur (draws s'y ajoutent).",
+    )
+    base_version: int | None = Field(
+        default=None,
+        description=(
+            "Avec use_manual_draws : version du store connue du client ; draws ne contient alors que les tirages "
+            "ajoutés depuis (409 si le store a changé)."
+        ),
+    )
+
+
+class BatchGenerateRequest(BaseModel):
+    strategies: List[str] | str = Field(
+        default="all", description="Stratégies à exécuter sur le même historique, ou \"all\"."
+    )
+    draws: List[Draw] = Field(default_factory=list, description="Historique des tirages")
+    game: str = Field(default="euromillion", description="Nom du jeu ciblé")
+    use_manual_draws: bool = Field(
+        default=False,
+        description="Si vrai, fusionne l'historique manuel persisté avec le payload fourni.",
+    )
+    history_id: str | None = Field(
+        default=None,
+        description="Handle renvoyé par POST /api/histories : réutilise l'historique validé côté serveur (draws s'y ajoutent).",
+    )
+    base_version: int | None = Field(
+        default=None,
+        description=(
+            "Avec use_manual_draws : version du store connue du client ; draws ne contient alors que les tirages "
+            "ajoutés depuis (409 si le store a changé)."
+        ),
+    )
+    features: List[str] | str = Field(
+        default_factory=lambda: list(FEATURE_SECTIONS),
+        description="Sections de features à calculer : frequencies, gaps, windows, all ou none.",
+    )
+    window_size: int = Field(default=5, description="Taille des fenêtres glissantes (section windows).")
+    max_windows: int | None = Field(
+        default=None,
+        description="Nombre maximal de fenêtres renvoyées par type (toutes si absent).",
+    )
+
+
+class ArchiveImport(BaseModel):
+    content: str = Field(default="", description="Archive CSV (avec en-tête) ou NDJSON (un tirage par ligne)")
+    format: str = Field(default="ndjson", description="Format de l'archive : csv ou ndjson")
+    game: str | None = Field(default=None, description="Jeu des lignes sans colonne game")
+    batch_size: int = Field(default=IMPORT_BATCH_SIZE, description="Lignes validées et enregistrées par lot")
+    replace: bool = Field(
+        default=False,
+        description="Si vrai, remplace l'historique manuel de chaque jeu importé.",
+    )
+
+
+class HistoryUpload(BaseModel):
+    game: str = Field(default="euromillion", description="Nom du jeu ciblé")
+    draws: List[Draw] = Field(default_factory=list, description="Historique des tirages à conserver côté serveur")
+
+
+class BacktestRequest(BaseModel):
+    draws: List[Draw] = Field(default_factory=list, description="Historique des tirages, du plus ancien au plus récent")
+    game: str = Field(default="euromillion", description="Nom du jeu ciblé")
+    use_manual_draws: bool = Field(
+        default=False,
+        description="Si vrai, fusionne l'historique manuel persisté avec le payload fourni.",
+    )
+    start: int = Field(default=1, description="Premier tirage évalué (au moins 1 tirage d'historique avant lui).")
+    seed: int | None = Field(default=None, description="Graine de base, déclinée par tirage évalué.")
+    simulations: int | None = Field(
+        default=None, description="Simulations Monte Carlo par tirage évalué (mcc, meta_ia)."
+    )
+    workers: int | None = Field(default=None, description="Nombre de processus (tous les cœurs par défaut).")
+    details: bool = Field(default=False, description="Si vrai, renvoie le résultat de chaque tirage évalué.")
+
+
+class SweepRequest(BaseModel):
+    grid: Dict[str, List[object]] = Field(
+        default_factory=dict,
+        description="Valeurs candidates par paramètre (ex. {\"window\": [40, 80, 120]}), combinées en produit cartésien.",
+    )
+    game: str = Field(default="euromillion", description="Nom du jeu ciblé")
+    draws: List[Draw] = Field(default_factory=list, description="Tirages ajoutés à l'historique évalué")
+    use_manual_draws: bool = Field(default=True, description="Évalue sur l'historique manuel persisté.")
+    start: int = Field(default=1, description="Premier tirage évalué.")
+    seed: int | None = Field(default=None, description="Graine de base, déclinée par tirage évalué.")
+    simulations: int | None = Field(default=None, description="Simulations Monte Carlo par tirage évalué (mcc).")
+    workers: int | None = Field(default=None, description="Nombre de processus (tous les cœurs par défaut).")
+    apply: bool = Field(default=True, description="Enregistre la meilleure configuration comme paramètres actifs.")
+
+
+class HistoryMatchRequest(BaseModel):
+    game: str = Field(default="euromillion", description="Jeu dont l'historique persisté est interrogé")
+    grids: List[Draw] = Field(default_factory=list, description="Grilles à confronter à l'historique")
+    dates: bool = Field(default=True, description="Si vrai, renvoie aussi les dates des tirages gagnants par rang.")
+
+
+class PrizeSimulationRequest(BaseModel):
+    game: str = Field(default="euromillion", description="Jeu ciblé")
+    grids: List[Draw] = Field(default_factory=list, description="Grilles jouées (ou utiliser strategy + count)")
+    strategy: str | None = Field(default=None, description="Stratégie générant les grilles jouées")
+    count: int = Field(default=1, description="Nombre de grilles générées par la stratégie.")
+    draws: List[Draw] = Field(default_factory=list, description="Historique transmis à la stratégie")
+    use_manual_draws: bool = Field(
+        default=False, description="Si vrai, la stratégie utilise aussi l'historique manuel persisté."
+    )
+    seed: int | None = Field(default=None, description="Graine des tirages simulés (et de la stratégie).")
+    simulations: int | None = Field(default=None, description="Simulations Monte Carlo de la stratégie (mcc).")
+    simulated_draws: int = Field(default=1_000_000, description="Nombre de tirages aléatoires simulés.")
+    workers: int | None = Field(default=None, description="Nombre de processus (SIMULATION_WORKERS par défaut).")
 
 
 class ManualDrawImport(BaseModel):
@@ -81,6 +246,11 @@ class StrategyResponse(BaseModel):
     method_used: str
     explanation: str
     features: Dict[str, object]
+    grids: List[Dict[str, List[int]]]
+
+
+class BatchGenerateResponse(BaseModel):
+    results: List[StrategyResponse]
 
 
 GAME_PROFILES = {
@@ -129,6 +299,47 @@ STRATEGIES = {
     "spectre": ml_strategies.spectre_strategy,
 }
 
+# Scores additifs par valeur de chaque stratégie, utilisés par le classement exact des grilles.
+STRATEGY_SCORES = {
+    "fibo": ml_strategies.fibo_scores,
+    "frequency": ml_strategies.frequency_scores,
+    "mcc": ml_strategies.mcc_scores,
+    "meta_ia": ml_strategies.meta_ia_scores,
+    "random": ml_strategies.random_scores,
+    "spectre": ml_strategies.spectre_scores,
+}
+SCORE_OPTIONS = {"meta_ia": {"members"}, "random": {"seed"}}
+MAX_TOP_GRIDS = 10_000
+
+# Options de génération acceptées par chaque stratégie ; les autres sont déterministes et
+# produisent une seule grille. simulations/time_budget_ms sont bornés pour garder une latence maîtrisée.
+STRATEGY_OPTIONS = {
+    "mcc": {"count", "seed", "simulations", "time_budget"},
+    "meta_ia": {"simulations", "members", "member_timeout"},
+    "random": {"count", "seed"},
+}
+MAX_GRIDS_PER_REQUEST = 100_000
+MAX_SIMULATIONS = 5_000_000
+MAX_TIME_BUDGET_MS = 60_000
+# Simulations Monte Carlo par tirage évalué lors d'un backtest (une simulation par tirage).
+BACKTEST_SIMULATIONS = 1_000
+MAX_SWEEP_CONFIGS = 1_000
+MAX_SIMULATED_DRAWS = 50_000_000
+# Borne du travail d'une simulation de gains : grilles jouées × tirages simulés.
+MAX_SIMULATED_PLAYS = 2_000_000_000
+# Paires et triplets renvoyés par défaut (et au plus) par /api/history/cooccurrence.
+DEFAULT_COOCCURRENCE_TOP = 20
+MAX_COOCCURRENCE_TOP = 1_000
+
+# Cache LRU + TTL des résultats de stratégies. Les stratégies aléatoires ne sont des fonctions
+# pures de l'historique qu'avec une graine, et un budget de temps (mcc, membres meta_ia) rend le
+# résultat non déterministe.
+RESULT_CACHE = ResultCache.from_env()
+# Historiques validés et featurisés déposés via POST /api/histories, adressés par leur contenu.
+HISTORY_HANDLES = HistoryHandles.from_env()
+RANDOMIZED_STRATEGIES = {"random"}
+TIME_BOUND_OPTIONS = {"time_budget", "member_timeout"}
+
 
 @app.get("/")
 def homepage() -> Dict[str, object]:
@@ -159,33 +370,51 @@ def health() -> Dict[str, str]:
     }
 
 
+# Message d'erreur par motif de rejet d'un tirage (voir draw_validation).
+DRAW_ERRORS = {
+    draw_validation.SHAPE: "Tirage invalide : nombre de numéros/étoiles incorrect.",
+    draw_validation.VALUE_TYPE: "Tirage invalide : numéros et étoiles doivent être des entiers.",
+    draw_validation.DUPLICATE: "Tirage invalide : doublons détectés.",
+    draw_validation.NUMBER_RANGE: "Tirage invalide : numéro hors plage.",
+    draw_validation.STAR_RANGE: "Tirage invalide : étoile hors plage.",
+    draw_validation.DATE: "Date de tirage invalide : format attendu YYYY-MM-DD.",
+}
+
+
+# Motifs de rejet propres à l'import d'archives (lignes illisibles ou jeu inconnu).
+IMPORT_ERRORS = {
+    IMPORT_PARSE_ERROR: "Ligne illisible : JSON/CSV invalide ou valeur non entière.",
+    IMPORT_UNKNOWN_GAME: "Jeu inconnu : ligne ignorée.",
+}
+MAX_IMPORT_BATCH_SIZE = 100_000
+
+
 def _validate_draw(draw: Draw, game_profile: Dict) -> None:
-    numbers = draw.numbers
-    stars = draw.stars
-    if len(numbers) != game_profile["numbers_to_pick"] or len(stars) != game_profile["stars_to_pick"]:
-        raise HTTPException(
-            status_code=422,
-            detail="Tirage invalide : nombre de numéros/étoiles incorrect.",
-        )
-    if len(set(numbers)) != len(numbers) or len(set(stars)) != len(stars):
-        raise HTTPException(status_code=422, detail="Tirage invalide : doublons détectés.")
-    if not all(1 <= n <= game_profile["max_number"] for n in numbers):
-        raise HTTPException(status_code=422, detail="Tirage invalide : numéro hors plage.")
-    if not all(1 <= s <= game_profile["max_star"] for s in stars):
-        raise HTTPException(status_code=422, detail="Tirage invalide : étoile hors plage.")
-    if draw.draw_date:
-        try:
-            date.fromisoformat(draw.draw_date)
-        except ValueError:
-            raise HTTPException(status_code=422, detail="Date de tirage invalide : format attendu YYYY-MM-DD.")
+    _validate_draws([draw], game_profile)
+
+
+def _validate_draws(draws: List[Draw] | List[Dict], game_profile: Dict) -> None:
+    """Bulk validation: one pass over the field lists, no model built per draw."""
+
+    numbers, stars, dates = [], [], []
+    for draw in draws:
+        if isinstance(draw, dict):
+            numbers.append(draw.get("numbers") or [])
+            stars.append(draw.get("stars") or [])
+            dates.append(draw.get("draw_date"))
+        else:
+            numbers.append(draw.numbers)
+            stars.append(draw.stars)
+            dates.append(draw.draw_date)
+    invalid = draw_validation.first_invalid(numbers, stars, dates, game_profile)
+    if invalid is not None:
+        raise HTTPException(status_code=422, detail=DRAW_ERRORS[invalid[1]])
 
 
 def _validate_history(draws: List[Draw] | List[Dict], game_profile: Dict) -> None:
     if not draws:
         raise HTTPException(status_code=422, detail="Historique vide : impossible de générer.")
-    for draw in draws:
-        draw_obj = draw if isinstance(draw, Draw) else Draw(**draw)
-        _validate_draw(draw_obj, game_profile)
+    _validate_draws(draws, game_profile)
 
 
 def _normalize_draws(draws: List[Draw] | List[Dict]) -> List[Dict[str, object]]:
@@ -200,6 +429,31 @@ def _normalize_draws(draws: List[Draw] | List[Dict]) -> List[Dict[str, object]]:
     return normalized
 
 
+def _feature_sections(payload: GenerateRequest) -> List[str]:
+    requested = payload.features
+    if requested is None:
+        return list(FEATURE_SECTIONS)
+    if isinstance(requested, str):
+        requested = [part for part in requested.split(",") if part.strip()]
+    sections: List[str] = []
+    for name in requested:
+        normalized = str(name).strip().lower()
+        if normalized == "none":
+            continue
+        if normalized == "all":
+            sections.extend(section for section in FEATURE_SECTIONS if section not in sections)
+        elif normalized in FEATURE_SECTIONS:
+            if normalized not in sections:
+                sections.append(normalized)
+        else:
+            raise HTTPException(status_code=422, detail=f"Section de features inconnue: {name}")
+    if payload.window_size is None or payload.window_size < 1:
+        raise HTTPException(status_code=422, detail="window_size invalide : au moins 1.")
+    if payload.max_windows is not None and payload.max_windows < 0:
+        raise HTTPException(status_code=422, detail="max_windows invalide : valeur positive attendue.")
+    return sections
+
+
 def _parse_weekday(value: str) -> int:
     try:
         weekday = int(value)
@@ -246,45 +500,518 @@ def _weekday_for_draw(draw: Dict[str, object]) -> int | None:
         return None
 
 
+def _request_draws(payload, game_profile: Dict) -> List[Dict[str, object]]:
+    """Validate and normalize the payload draws.
+
+    Stored histories (manual store, ``history_id``) were validated when they
+    were written and are trusted: only the payload draws are checked.
+    """
+
+    _check_base_version(payload)
+    stored = 0
+    if payload.use_manual_draws:
+        stored = summarize_store().get(payload.game.lower(), {}).get("stored", 0)
+        if not stored and not payload.draws:
+            raise HTTPException(
+                status_code=404,
+                detail="Aucun tirage manuel disponible pour ce jeu : fournissez un historique ou désactivez use_manual_draws.",
+            )
+    if stored or getattr(payload, "history_id", None):
+        if payload.draws:
+            _validate_draws(payload.draws, game_profile)
+    else:
+        _validate_history(payload.draws, game_profile)
+    return _normalize_draws(payload.draws)
+
+
+def _check_base_version(payload) -> bool:
+    """409 unless the request's ``base_version`` is the game's current store version; True when one is given."""
+
+    base_version = getattr(payload, "base_version", None)
+    if base_version is None:
+        return False
+    if not payload.use_manual_draws:
+        raise HTTPException(status_code=422, detail="base_version n'a de sens qu'avec use_manual_draws.")
+    current = get_store_version(payload.game)["version"]
+    if base_version != current:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Version du store obsolète : renvoyez les tirages ajoutés depuis la version courante.",
+                "current_version": current,
+            },
+        )
+    return True
+
+
+def _stored_state(payload) -> FeatureState | None:
+    """Copy of the state behind the request's ``history_id`` (None without one)."""
+
+    history_id = getattr(payload, "history_id", None)
+    if not history_id:
+        return None
+    if payload.use_manual_draws:
+        raise HTTPException(status_code=422, detail="history_id et use_manual_draws ne peuvent pas être combinés.")
+    if not is_history_handle(history_id):
+        raise HTTPException(status_code=422, detail="history_id invalide : identifiant renvoyé par POST /api/histories attendu.")
+    entry = HISTORY_HANDLES.get(history_id)
+    if entry is None:
+        raise HTTPException(
+            status_code=404, detail="Historique inconnu ou expiré : renvoyez-le via POST /api/histories."
+        )
+    game, state = entry
+    if game != payload.game.lower():
+        raise HTTPException(status_code=422, detail=f"history_id ne correspond pas au jeu {payload.game}.")
+    return state.copy()
+
+
+def _request_history(payload, game_profile: Dict) -> DrawHistory:
+    state = _stored_state(payload)
+    payload_draws = _request_draws(payload, game_profile)
+    if state is not None:
+        state.history.extend(payload_draws)
+        return state.history
+    if payload.use_manual_draws:
+        history = get_history(payload.game, game_profile["max_number"], game_profile["max_star"])
+        _check_base_version(payload)  # the store may have moved while the history was read
+        history.extend(payload_draws)
+        return history
+    return DrawHistory.for_profile(game_profile, payload_draws)
+
+
+def _prepare_generation(payload) -> Tuple[Dict, HistoryStats, Dict[str, object]]:
+    """Validate the history once and compute the features and shared statistics."""
+
+    game_profile = get_game_profile(payload.game)
+    sections = _feature_sections(payload)
+
+    state = _stored_state(payload)
+    payload_draws = _request_draws(payload, game_profile)
+    if state is not None or payload.use_manual_draws:
+        if state is None:
+            state = get_feature_state(payload.game, game_profile["max_number"], game_profile["max_star"])
+            _check_base_version(payload)  # the store may have moved while the state was read
+        state.extend(payload_draws)
+        history = state.history
+        features = state.features(sections, window_size=payload.window_size, max_windows=payload.max_windows)
+    else:
+        history = DrawHistory.for_profile(game_profile, payload_draws)
+        features = prepare_features(
+            game_profile,
+            history,
+            window_size=payload.window_size,
+            sections=sections,
+            max_windows=payload.max_windows,
+        )
+    return game_profile, HistoryStats.from_history(game_profile, history), features
+
+
+def _run_options(payload) -> Dict[str, object]:
+    options: Dict[str, object] = {}
+    if payload.simulations is not None:
+        if not 1 <= payload.simulations <= MAX_SIMULATIONS:
+            raise HTTPException(
+                status_code=422, detail=f"simulations invalide : entre 1 et {MAX_SIMULATIONS}."
+            )
+        options["simulations"] = payload.simulations
+    if getattr(payload, "time_budget_ms", None) is not None:
+        if not 1 <= payload.time_budget_ms <= MAX_TIME_BUDGET_MS:
+            raise HTTPException(
+                status_code=422, detail=f"time_budget_ms invalide : entre 1 et {MAX_TIME_BUDGET_MS}."
+            )
+        options["time_budget"] = payload.time_budget_ms / 1000
+    if payload.seed is not None:
+        options["seed"] = payload.seed
+    if getattr(payload, "members", None) is not None:
+        unknown = sorted(set(payload.members) - set(META_IA_MEMBERS))
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Membre meta_ia inconnu: {', '.join(unknown)}")
+        if not payload.members or any(weight is None or weight <= 0 for weight in payload.members.values()):
+            raise HTTPException(
+                status_code=422, detail="members invalide : au moins un membre, avec des poids positifs."
+            )
+        options["members"] = dict(payload.members)
+    if getattr(payload, "member_timeout_ms", None) is not None:
+        if not 1 <= payload.member_timeout_ms <= MAX_TIME_BUDGET_MS:
+            raise HTTPException(
+                status_code=422, detail=f"member_timeout_ms invalide : entre 1 et {MAX_TIME_BUDGET_MS}."
+            )
+        options["member_timeout"] = payload.member_timeout_ms / 1000
+    return options
+
+
+def _strategy_options(strategie: str, payload: GenerateRequest) -> Dict[str, object]:
+    if payload.count is None or not 1 <= payload.count <= MAX_GRIDS_PER_REQUEST:
+        raise HTTPException(
+            status_code=422, detail=f"count invalide : entre 1 et {MAX_GRIDS_PER_REQUEST}."
+        )
+    accepted = STRATEGY_OPTIONS.get(strategie, set())
+    if payload.count > 1 and "count" not in accepted:
+        raise HTTPException(
+            status_code=422,
+            detail=f"La stratégie {strategie} ne produit qu'une grille : count doit valoir 1.",
+        )
+    options = {"count": payload.count, **_run_options(payload)}
+    return {name: value for name, value in options.items() if name in accepted}
+
+
+def _active_params(strategie: str, stored: Dict[str, Dict[str, object]] | None = None) -> Dict[str, object]:
+    """Paramètres actifs d'une stratégie (issus du dernier sweep appliqué, sinon valeurs par défaut)."""
+
+    stored = load_strategy_params() if stored is None else stored
+    if strategie == "meta_ia":
+        return {"member_params": {name: active_params(stored, name) for name in DEFAULT_PARAMS}}
+    return active_params(stored, strategie)
+
+
+def _run_strategy(strategie: str, game_profile: Dict, stats: HistoryStats, options: Dict[str, object]) -> Dict:
+    """Exécute une stratégie via le cache de résultats (clé : stratégie, profil, empreinte de l'historique, options)."""
+
+    cacheable = not TIME_BOUND_OPTIONS & set(options) and (
+        strategie not in RANDOMIZED_STRATEGIES or options.get("seed") is not None
+    )
+    key = result_key(strategie, game_profile, stats.fingerprint(), options) if cacheable else None
+    return RESULT_CACHE.get_or_compute(key, lambda: STRATEGIES[strategie](game_profile, stats, **options))
+
+
+def _strategy_response(result: Dict[str, object], features: Dict[str, object]) -> StrategyResponse:
+    result = dict(result)
+    grids = result.pop("grids", None) or [{"numbers": result["numbers"], "stars": result["stars"]}]
+    return StrategyResponse(**result, features=features, grids=grids)
+
+
+def _batch_strategies(requested: List[str] | str) -> List[str]:
+    names = [requested] if isinstance(requested, str) else list(requested)
+    if "all" in names:
+        return sorted(STRATEGIES.keys())
+    if not names:
+        raise HTTPException(status_code=422, detail="Aucune stratégie demandée.")
+    for name in names:
+        if name not in STRATEGIES:
+            raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {name}")
+    return list(dict.fromkeys(names))
+
+
+@app.post("/api/histories")
+def upload_history(payload: HistoryUpload) -> Dict[str, object]:
+    """Valide et conserve un historique ; le handle renvoyé remplace ``draws`` dans les requêtes de génération."""
+
+    game_profile = get_game_profile(payload.game)
+    _validate_history(payload.draws, game_profile)
+    history_id, state = HISTORY_HANDLES.put(payload.game, game_profile, _normalize_draws(payload.draws))
+    return {"history_id": history_id, "game": payload.game.lower(), "draws": state.size}
+
+
+# Déclarée avant /api/generate/{strategie} pour que "batch" ne soit pas pris pour un nom de stratégie.
+@app.post("/api/generate/batch", response_model=BatchGenerateResponse)
+def generate_batch(payload: BatchGenerateRequest) -> BatchGenerateResponse:
+    strategies = _batch_strategies(payload.strategies)
+    game_profile, stats, features = _prepare_generation(payload)
+    stored = load_strategy_params()
+    try:
+        results = [
+            _strategy_response(_run_strategy(name, game_profile, stats, _active_params(name, stored)), features)
+            for name in strategies
+        ]
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Génération impossible : {exc}") from exc
+    return BatchGenerateResponse(results=results)
+
+
 @app.post("/api/generate/{strategie}", response_model=StrategyResponse)
 def generate(strategie: str, payload: GenerateRequest) -> StrategyResponse:
     strategy_callable = STRATEGIES.get(strategie)
     if strategy_callable is None:
         raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {strategie}")
 
+    options = _strategy_options(strategie, payload)
+    game_profile, stats, features = _prepare_generation(payload)
+    try:
+        result = _run_strategy(strategie, game_profile, stats, {**options, **_active_params(strategie)})
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Génération impossible : {exc}") from exc
+
+    return _strategy_response(result, features)
+
+
+@app.post("/api/generate/{strategie}/top")
+def generate_top(strategie: str, payload: GenerateRequest, k: int = 10) -> Dict[str, object]:
+    """Classement exact des k meilleures grilles parmi toutes les grilles du jeu (score additif par valeur)."""
+
+    scorer = STRATEGY_SCORES.get(strategie)
+    if scorer is None:
+        raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {strategie}")
+    if k is None or not 1 <= k <= MAX_TOP_GRIDS:
+        raise HTTPException(status_code=422, detail=f"k invalide : entre 1 et {MAX_TOP_GRIDS}.")
+
+    accepted = SCORE_OPTIONS.get(strategie, set())
+    options = {name: value for name, value in _run_options(payload).items() if name in accepted}
     game_profile = get_game_profile(payload.game)
+    stats = HistoryStats(_request_history(payload, game_profile))
+    try:
+        scores = scorer(game_profile, stats, **options, **_active_params(strategie))
+        ranking = top_grids(scores, (game_profile["numbers_to_pick"], game_profile["stars_to_pick"]), k)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Classement impossible : {exc}") from exc
+
+    return {
+        "strategy": strategie,
+        "k": len(ranking["grids"]),
+        "space": ranking["space"],
+        "workers": ranking["workers"],
+        "elapsed_ms": round(ranking["elapsed"] * 1000, 2),
+        "grids": [
+            {"numbers": numbers, "stars": stars, "score": round(score, 6)}
+            for numbers, stars, score in ranking["grids"]
+        ],
+    }
+
+
+@app.post("/api/history/matches")
+def history_matches(payload: HistoryMatchRequest) -> Dict[str, object]:
+    """Rangs de gains qu'auraient obtenus une ou plusieurs grilles sur l'historique persisté du jeu."""
+
+    game_profile = get_game_profile(payload.game)
+    if not payload.grids:
+        raise HTTPException(status_code=422, detail="Aucune grille à confronter à l'historique.")
+    if len(payload.grids) > MAX_GRIDS_PER_REQUEST:
+        raise HTTPException(status_code=422, detail=f"Trop de grilles : au plus {MAX_GRIDS_PER_REQUEST}.")
+    _validate_draws(payload.grids, game_profile)
+
+    started = time.perf_counter()
+    index = get_match_index(payload.game, game_profile["max_number"], game_profile["max_star"])
+    if not len(index):
+        raise HTTPException(status_code=404, detail="Aucun tirage persisté pour ce jeu : historique vide.")
+    grids = [
+        (grid.numbers, grid.stars) if isinstance(grid, Draw) else (grid["numbers"], grid["stars"])
+        for grid in payload.grids
+    ]
+    results = index.match(grids, dates=payload.dates)
+    return {
+        "game": payload.game.lower(),
+        "draws": len(index),
+        "grids": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
 
-    manual_draws: List[Dict[str, object]] = []
-    if payload.use_manual_draws:
-        manual_draws = get_draws(payload.game)
-        if not manual_draws and not payload.draws:
-            raise HTTPException(
-                status_code=404,
-                detail="Aucun tirage manuel disponible pour ce jeu : fournissez un historique ou désactivez use_manual_draws.",
-            )
 
-    draw_history = manual_draws + _normalize_draws(payload.draws)
-    _validate_history(draw_history, game_profile)
-    features = prepare_features(game_profile, draw_history)
-    result = strategy_callable(game_profile, draw_history)
+@app.get("/api/history/cooccurrence/{game}")
+def history_cooccurrence(game: str, date_from: str | None = None, date_to: str | None = None,
+                         top: int | None = None, matrix: bool | None = None) -> Dict[str, object]:
+    """Paires de numéros, paires d'étoiles et triplets de numéros sortis ensemble, sur une plage de dates optionnelle."""
 
-    return StrategyResponse(**result, features=features)
+    game_profile = get_game_profile(game)
+    top = DEFAULT_COOCCURRENCE_TOP if top is None else top
+    if not 1 <= top <= MAX_COOCCURRENCE_TOP:
+        raise HTTPException(status_code=422, detail=f"top invalide : entre 1 et {MAX_COOCCURRENCE_TOP}.")
+    try:
+        bounds = [date.fromisoformat(value) for value in (date_from, date_to) if value]
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="Date invalide : format attendu YYYY-MM-DD.") from exc
+    if date_from and date_to and bounds[0] > bounds[1]:
+        raise HTTPException(status_code=422, detail="Plage de dates invalide : date_from est après date_to.")
+
+    started = time.perf_counter()
+    state = get_cooccurrence(game, game_profile["max_number"], game_profile["max_star"])
+    (pairs, star_pairs, triplets), draws = state.date_range(date_from, date_to)
+    result: Dict[str, object] = {
+        "game": game.lower(),
+        "date_from": date_from,
+        "date_to": date_to,
+        "draws": draws,
+        "pairs": [{"numbers": list(values), "count": count} for values, count in top_pairs(pairs, top)],
+        "star_pairs": [{"stars": list(values), "count": count} for values, count in top_pairs(star_pairs, top)],
+        "triplets": [{"numbers": list(values), "count": count} for values, count in top_triplets(triplets, top)],
+    }
+    if matrix:
+        result["matrix"] = {
+            "numbers": pair_matrix(pairs, game_profile["max_number"]),
+            "stars": pair_matrix(star_pairs, game_profile["max_star"]),
+        }
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+@app.post("/api/simulate/prizes")
+def simulate_prize_distribution(payload: PrizeSimulationRequest) -> Dict[str, object]:
+    """Répartition des rangs de gains d'un jeu de grilles sur des tirages aléatoires simulés."""
+
+    game_profile = get_game_profile(payload.game)
+    if bool(payload.grids) == bool(payload.strategy):
+        raise HTTPException(status_code=422, detail="Fournissez soit des grilles, soit une stratégie (strategy + count).")
+    if payload.simulated_draws is None or not 1 <= payload.simulated_draws <= MAX_SIMULATED_DRAWS:
+        raise HTTPException(
+            status_code=422, detail=f"simulated_draws invalide : entre 1 et {MAX_SIMULATED_DRAWS}."
+        )
+    if payload.workers is not None and payload.workers < 1:
+        raise HTTPException(status_code=422, detail="workers invalide : au moins 1 processus.")
+    played = len(payload.grids) if payload.grids else max(payload.count or 1, 1)
+    if played * payload.simulated_draws > MAX_SIMULATED_PLAYS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Simulation trop lourde : grilles × simulated_draws au plus {MAX_SIMULATED_PLAYS}.",
+        )
+
+    if payload.strategy:
+        if payload.strategy not in STRATEGIES:
+            raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {payload.strategy}")
+        options = _strategy_options(payload.strategy, payload)
+        stats = HistoryStats(_request_history(payload, game_profile))
+        try:
+            result = _run_strategy(payload.strategy, game_profile, stats, {**options, **_active_params(payload.strategy)})
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=f"Génération impossible : {exc}") from exc
+        tickets = result.get("grids") or [{"numbers": result["numbers"], "stars": result["stars"]}]
+    else:
+        if len(payload.grids) > MAX_GRIDS_PER_REQUEST:
+            raise HTTPException(status_code=422, detail=f"Trop de grilles : au plus {MAX_GRIDS_PER_REQUEST}.")
+        _validate_draws(payload.grids, game_profile)
+        tickets = [
+            {"numbers": sorted(grid.numbers), "stars": sorted(grid.stars)} if isinstance(grid, Draw)
+            else {"numbers": sorted(grid["numbers"]), "stars": sorted(grid["stars"])}
+            for grid in payload.grids
+        ]
+
+    report = simulate_prizes(
+        [(ticket["numbers"], ticket["stars"]) for ticket in tickets],
+        game_profile,
+        draws=payload.simulated_draws,
+        seed=payload.seed,
+        workers=simulation_workers() if payload.workers is None else payload.workers,
+    )
+    elapsed = report.pop("elapsed")
+    report.update(elapsed_ms=round(elapsed * 1000, 2), draws_per_second=round(report["draws_per_second"]))
+    if payload.strategy:
+        report["tickets"] = tickets
+    return report
+
+
+@app.post("/api/backtest/{strategie}")
+def backtest_strategy(strategie: str, payload: BacktestRequest) -> Dict[str, object]:
+    strategy_callable = STRATEGIES.get(strategie)
+    if strategy_callable is None:
+        raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {strategie}")
+    if payload.start is None or payload.start < 1:
+        raise HTTPException(status_code=422, detail="start invalide : au moins 1 tirage d'historique.")
+    if payload.workers is not None and payload.workers < 1:
+        raise HTTPException(status_code=422, detail="workers invalide : au moins 1.")
+
+    accepted = STRATEGY_OPTIONS.get(strategie, set())
+    options = {"simulations": BACKTEST_SIMULATIONS, **_run_options(payload)}
+    options = {name: value for name, value in options.items() if name in accepted}
+    options.update(_active_params(strategie))
+
+    game_profile = get_game_profile(payload.game)
+    history = _request_history(payload, game_profile)
+    if len(history) <= payload.start:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Historique trop court : au moins {payload.start + 1} tirages nécessaires pour le backtest.",
+        )
+
+    report = run_backtest(
+        strategy_callable,
+        game_profile,
+        history,
+        start=payload.start,
+        workers=payload.workers,
+        options=options,
+        details=payload.details,
+    )
+    return {"strategy": strategie, "game": payload.game.lower(), **report}
+
+
+@app.get("/api/admin/strategy-params")
+def get_strategy_params() -> Dict[str, object]:
+    stored = load_strategy_params()
+    return {"params": {name: active_params(stored, name) for name in DEFAULT_PARAMS}}
+
+
+@app.post("/api/admin/strategy-params/sweep/{strategie}")
+def sweep_strategy_params(strategie: str, payload: SweepRequest) -> Dict[str, object]:
+    strategy_callable = STRATEGIES.get(strategie)
+    if strategy_callable is None:
+        raise HTTPException(status_code=404, detail=f"Stratégie inconnue: {strategie}")
+    if strategie not in DEFAULT_PARAMS:
+        raise HTTPException(status_code=422, detail=f"La stratégie {strategie} n'a pas de paramètres ajustables.")
+    if payload.workers is not None and payload.workers < 1:
+        raise HTTPException(status_code=422, detail="workers invalide : au moins 1.")
+    try:
+        configs = expand_grid(strategie, payload.grid or {})
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Grille de paramètres invalide : {exc}") from exc
+    if len(configs) > MAX_SWEEP_CONFIGS:
+        raise HTTPException(
+            status_code=422, detail=f"Grille trop large : au plus {MAX_SWEEP_CONFIGS} configurations."
+        )
+
+    accepted = STRATEGY_OPTIONS.get(strategie, set())
+    options = {"simulations": BACKTEST_SIMULATIONS, **_run_options(payload)}
+    options = {name: value for name, value in options.items() if name in accepted}
+
+    game_profile = get_game_profile(payload.game)
+    history = _request_history(payload, game_profile)
+    if payload.start is None or not 1 <= payload.start < len(history):
+        raise HTTPException(
+            status_code=422,
+            detail=f"start invalide : entre 1 et {len(history) - 1} pour cet historique.",
+        )
+
+    report = run_sweep(
+        strategy_callable, game_profile, history, configs, start=payload.start, workers=payload.workers, options=options
+    )
+    if payload.apply:
+        save_strategy_params(strategie, report["best"]["params"])
+        append_log("backend", f"Paramètres {strategie} mis à jour par sweep : {report['best']['params']}")
+    return {"strategy": strategie, "applied": payload.apply, **report}
 
 
 @app.post("/api/admin/manual-draws")
 def ingest_manual_draws(payload: ManualDrawImport) -> Dict[str, object]:
     game_profile = get_game_profile(payload.game)
     _validate_history(payload.draws, game_profile)
-    stored_draws = persist_draws(
-        payload.game, _normalize_draws(payload.draws), replace=payload.replace
-    )
+    stored = persist_draws(payload.game, _normalize_draws(payload.draws), replace=payload.replace)
+    # Counts already cached by this process were extended by the append; otherwise they are built and saved here.
+    get_cooccurrence(payload.game, game_profile["max_number"], game_profile["max_star"])
     return {
         "game": payload.game.lower(),
-        "stored": len(stored_draws),
+        "stored": stored,
         "mode": "replace" if payload.replace else "append",
     }
 
 
+@app.post("/api/admin/manual-draws/import")
+def import_manual_archive(payload: ArchiveImport) -> Dict[str, object]:
+    """Import d'une archive historique ligne par ligne, validée et enregistrée par lots ; les lignes invalides sont signalées."""
+
+    fmt = (payload.format or "").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"Format inconnu : utilisez {' ou '.join(IMPORT_FORMATS)}.")
+    if payload.batch_size is None or not 1 <= payload.batch_size <= MAX_IMPORT_BATCH_SIZE:
+        raise HTTPException(status_code=422, detail=f"batch_size invalide : entre 1 et {MAX_IMPORT_BATCH_SIZE}.")
+    if payload.game is not None:
+        get_game_profile(payload.game)
+
+    report = import_archive(
+        io.StringIO(payload.content),
+        fmt=fmt,
+        game_profiles=GAME_PROFILES,
+        default_game=payload.game,
+        batch_size=payload.batch_size,
+        replace=payload.replace,
+    )
+    append_log("backend", f"Import d'archive : {report['imported']}/{report['rows']} lignes importées")
+    return {
+        **{name: report[name] for name in ("rows", "imported", "rejected", "batches", "games", "errors_truncated")},
+        "errors": [
+            {**error, "message": DRAW_ERRORS.get(error["reason"]) or IMPORT_ERRORS[error["reason"]]}
+            for error in report["errors"]
+        ],
+        "elapsed_ms": round(report["elapsed"] * 1000, 2),
+        "rows_per_second": round(report["rows_per_second"]),
+    }
+
+
 @app.get("/api/admin/manual-draws")
 def summarize_manual_store() -> Dict[str, object]:
     summary = summarize_store()
@@ -317,7 +1044,7 @@ def list_manual_draws(game: str, weekday: str | None = None) -> Dict[str, object
             d for d in draws if (found := _weekday_for_draw(d)) is not None and found == target_weekday
         ]
 
-    return {"game": game.lower(), "stored": len(draws), "draws": draws}
+    return {"game": game.lower(), "stored": len(draws), "version": get_store_version(game)["version"], "draws": draws}
 
 
 @app.delete("/api/admin/manual-draws/{game}")
@@ -357,9 +1084,11 @@ def get_admin_stats() -> Dict[str, object]:
         candidate = entry.get("last_draw_date")
         if candidate and (last_import is None or candidate > last_import):
             last_import = candidate
-    manual_store_path = _store_path()
-    size_bytes = manual_store_path.stat().st_size if manual_store_path.exists() else 0
-    return synthetic_stats(total_draws, total_draws, size_bytes, last_import)
+    stats = synthetic_stats(total_draws, total_draws, store_size_bytes(), last_import)
+    stats["storeCache"] = cache_stats()
+    stats["resultCache"] = RESULT_CACHE.stats()
+    stats["historyHandles"] = HISTORY_HANDLES.stats()
+    return stats
 
 
 @app.get("/api/admin/db/tables")
@@ -388,15 +1117,30 @@ def get_table_content(name: str) -> Dict[str, object]:
 
 
 @app.post("/api/admin/db/vacuum")
-def run_vacuum() -> Dict[str, str]:
+def run_vacuum() -> Dict[str, object]:
     append_log("backend", f"[{date.today().isoformat()}] VACUUM started")
-    return {"status": "vacuum started"}
+    report = compact_store()
+    append_log(
+        "backend",
+        f"[{date.today().isoformat()}] VACUUM done ({report['backend']}, {report['reclaimed_bytes']} bytes reclaimed)",
+    )
+    return {"status": "vacuum done", **report}
 
 
 @app.post("/api/admin/db/fix-duplicates")
-def run_fix_duplicates() -> Dict[str, str]:
+def run_fix_duplicates() -> Dict[str, object]:
+    """Supprime les tirages en double (même grille, même date) de chaque jeu, via leur rang combinatoire."""
+
     append_log("backend", f"[{date.today().isoformat()}] dedup launched")
-    return {"status": "dedup started"}
+    games: Dict[str, Dict[str, int]] = {}
+    for game in sorted(load_store()):
+        try:
+            games[game] = deduplicate_draws(game, GAME_PROFILES.get(game))
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=f"Déduplication impossible ({game}) : {exc}") from exc
+    removed = sum(report["removed"] for report in games.values())
+    append_log("backend", f"[{date.today().isoformat()}] dedup done ({removed} duplicates removed)")
+    return {"status": "dedup done", "removed": removed, "games": games}
 
 
 @app.post("/api/admin/db/backup")
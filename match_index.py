@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from draw_history import DrawHistory, _mask_values, _values_mask
+from prize_tiers import EUROMILLIONS_TIERS, tier_label
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+# At most this many (grid, draw) pairs are compared at once by the NumPy kernel; small
+# enough for the intermediate matrices to stay in cache.
+CHUNK_CELLS = 1 << 19
+
+# Tier rank (0 = no prize) of every (matched numbers, matched stars) pair, as a flat
+# table indexed by ``numbers * TIER_STRIDE + stars``.
+TIER_STRIDE = 8
+_TIER_TABLE = [0] * (TIER_STRIDE * 8)
+for (_numbers, _stars), _rank in EUROMILLIONS_TIERS.items():
+    _TIER_TABLE[_numbers * TIER_STRIDE + _stars] = _rank
+# Labels by tier rank, index 0 unused.
+TIER_LABELS = [""] + [tier_label(*match) for match, _ in sorted(EUROMILLIONS_TIERS.items(), key=lambda item: item[1])]
+
+
+def grid_masks(grids: Iterable[Tuple[Sequence[int], Sequence[int]]], max_number: int = 50,
+               max_star: int = 12) -> Tuple[List[int], List[int]]:
+    """Numbers and stars bitmasks of each grid (same layout as ``DrawHistory``)."""
+
+    numbers_masks, stars_masks = [], []
+    for numbers, stars in grids:
+        numbers_masks.append(_values_mask(numbers, max_number))
+        stars_masks.append(_values_mask(stars, max_star))
+    return numbers_masks, stars_masks
+
+
+if np is not None and hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+elif np is not None:  # pragma: no cover - NumPy < 2.0
+    _BYTE_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+    def _popcount(values: "np.ndarray") -> "np.ndarray":
+        view = np.ascontiguousarray(values, dtype=np.uint64)
+        return _BYTE_COUNTS[view.view(np.uint8)].reshape(view.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+if np is not None:
+    _TIER_RANKS = np.asarray(_TIER_TABLE, dtype=np.uint8)
+
+
+def tier_matrix(grid_numbers: "np.ndarray", grid_stars: "np.ndarray", draw_numbers: "np.ndarray",
+                draw_stars: "np.ndarray") -> "np.ndarray":
+    """Prize rank (0 = none) of every grid (rows) against every draw (columns).
+
+    One AND and one popcount per pair on the numbers (``uint64``) and stars
+    (``uint16``) bitmasks; the caller bounds the matrix size.
+    """
+
+    # Both popcounts are already uint8: shift and OR in place, no extra copy.
+    codes = _popcount(grid_numbers[:, None] & draw_numbers[None, :])
+    codes <<= 3  # TIER_STRIDE
+    codes |= _popcount(grid_stars[:, None] & draw_stars[None, :])
+    return _TIER_RANKS[codes]
+
+
+def _bit_counts(columns: Sequence[int]) -> List[int]:
+    """Bit-sliced sum of ``columns``: planes ``p`` such that draw ``i`` matched ``sum(p[k] bit i << k)`` values."""
+
+    planes: List[int] = []
+    for column in columns:
+        carry = column
+        for level in range(len(planes)):
+            planes[level], carry = planes[level] ^ carry, planes[level] & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def _planes_equal(planes: List[int], count: int, full: int) -> int:
+    # Draws whose bit-sliced count equals ``count``.
+    if count >> len(planes):
+        return 0
+    selected = full
+    for level, plane in enumerate(planes):
+        selected &= plane if count >> level & 1 else ~plane & full
+    return selected
+
+
+def _bit_indexes(bits: int) -> List[int]:
+    return [value - 1 for value in _mask_values(bits)]
+
+
+class MatchIndex:
+    """Prize matches of grids against a fixed draw history.
+
+    Holds the per-draw numbers and stars bitmasks as contiguous arrays (NumPy
+    when available) plus the draw dates, so matching many grids is a chunked
+    AND + popcount over a grids x draws matrix.  Without NumPy, each grid is
+    matched through the history's per-value column bitsets: a bit-sliced sum
+    gives every draw's match count in a few big-integer operations.
+    """
+
+    __slots__ = ("history", "dates", "_numbers", "_stars")
+
+    def __init__(self, history: DrawHistory) -> None:
+        self.history = history
+        self.dates = [draw.get("draw_date") for draw in history]
+        if np is not None:
+            self._numbers = np.frombuffer(history.numbers_masks, dtype=np.uint64).copy()
+            self._stars = np.frombuffer(history.stars_masks, dtype=np.uint16).copy()
+        else:
+            self._numbers = self._stars = None
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def _numpy_ranks(self, numbers_masks: List[int], stars_masks: List[int]) -> Iterable["np.ndarray"]:
+        grid_numbers = np.asarray(numbers_masks, dtype=np.uint64)
+        grid_stars = np.asarray(stars_masks, dtype=np.uint16)
+        rows = max(1, CHUNK_CELLS // max(1, len(self)))
+        for start in range(0, len(grid_numbers), rows):
+            yield tier_matrix(
+                grid_numbers[start:start + rows], grid_stars[start:start + rows], self._numbers, self._stars
+            )
+
+    def _python_hits(self, numbers_mask: int, stars_mask: int) -> Dict[int, int]:
+        numbers_columns, stars_columns = self.history.columns()
+        full = (1 << len(self)) - 1
+        numbers_planes = _bit_counts([numbers_columns[v - 1] for v in _mask_values(numbers_mask)])
+        stars_planes = _bit_counts([stars_columns[v - 1] for v in _mask_values(stars_mask)])
+        hits = {}
+        for (matched_numbers, matched_stars), rank in EUROMILLIONS_TIERS.items():
+            bits = _planes_equal(numbers_planes, matched_numbers, full) & _planes_equal(
+                stars_planes, matched_stars, full
+            )
+            if bits:
+                hits[rank] = bits
+        return hits
+
+    def match(self, grids: Sequence[Tuple[Sequence[int], Sequence[int]]], *,
+              dates: bool = True) -> List[Dict[str, object]]:
+        """Per grid: winning draws count and, per tier label, the count and (optionally) the draw dates."""
+
+        numbers_masks, stars_masks = grid_masks(grids, self.history.max_number, self.history.max_star)
+        results: List[Dict[str, object]] = []
+        if np is not None and len(self):
+            draw_dates = np.array(self.dates, dtype=object)
+            width = len(TIER_LABELS)
+            for ranks in self._numpy_ranks(numbers_masks, stars_masks):
+                # Only winning cells are visited: hits come out ordered by grid, then draw.
+                flat_ranks = ranks.ravel()
+                hits = np.flatnonzero(flat_ranks)
+                grid_rows = hits // len(self)
+                # One cell per (grid, tier): hits and non-zero cells below share its row-major order.
+                cells = grid_rows * width + flat_ranks[hits]
+                counts = np.bincount(cells, minlength=len(ranks) * width)
+                nonzero = np.flatnonzero(counts)
+                cell_counts = counts[nonzero]
+                if dates:
+                    # A stable sort regroups each grid's hits by tier, draws staying in order;
+                    # small keys take NumPy's linear-time radix sort.
+                    keys = cells.astype(np.uint16) if len(counts) <= 1 << 16 else cells
+                    hit_dates = draw_dates[hits[np.argsort(keys, kind="stable")] % len(self)].tolist()
+                    ends = np.cumsum(cell_counts).tolist()
+                chunk: List[Dict[str, Dict[str, object]]] = [{} for _ in range(len(ranks))]
+                for position, (cell, count) in enumerate(zip(nonzero.tolist(), cell_counts.tolist())):
+                    row, rank = divmod(cell, width)
+                    tier: Dict[str, object] = {"count": count}
+                    if dates:
+                        tier["dates"] = hit_dates[ends[position] - count:ends[position]]
+                    chunk[row][TIER_LABELS[rank]] = tier
+                results.extend(chunk)
+        else:
+            for numbers_mask, stars_mask in zip(numbers_masks, stars_masks):
+                tiers = {}
+                for rank, bits in sorted(self._python_hits(numbers_mask, stars_mask).items()):
+                    tier: Dict[str, object] = {"count": bits.bit_count()}
+                    if dates:
+                        tier["dates"] = [self.dates[index] for index in _bit_indexes(bits)]
+                    tiers[TIER_LABELS[rank]] = tier
+                results.append(tiers)
+
+        return [
+            {
+                "numbers": sorted(numbers),
+                "stars": sorted(stars),
+                "wins": sum(tier["count"] for tier in tiers.values()),
+                "tiers": tiers,
+            }
+            for (numbers, stars), tiers in zip(grids, results)
+        ]
@@ -1,17 +1,29 @@
 """Machine learning and heuristic strategies for EuroMillions generation."""
 
 from .fibo import run_strategy as fibo_strategy
+from .fibo import value_scores as fibo_scores
 from .frequency_strategy import run_strategy as frequency_strategy
+from .frequency_strategy import value_scores as frequency_scores
 from .mcc import run_strategy as mcc_strategy
+from .mcc import value_scores as mcc_scores
 from .meta_ia import run_strategy as meta_ia_strategy
+from .meta_ia import value_scores as meta_ia_scores
 from .random_strategy import run_strategy as random_strategy
+from .random_strategy import value_scores as random_scores
 from .spectre import run_strategy as spectre_strategy
+from .spectre import value_scores as spectre_scores
 
 __all__ = [
+    "fibo_scores",
     "fibo_strategy",
+    "frequency_scores",
     "frequency_strategy",
+    "mcc_scores",
     "mcc_strategy",
+    "meta_ia_scores",
     "meta_ia_strategy",
+    "random_scores",
     "random_strategy",
+    "spectre_scores",
     "spectre_strategy",
 ]
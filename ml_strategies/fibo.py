@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Dict, List, Sequence
+from typing import Dict, List, Sequence, Tuple
+
+from history_stats import HistoryStats
 
 
 FIBO_INTERVALS = [1, 2, 3, 5, 8, 13]
@@ -18,17 +20,20 @@ def _pick_top(counter: Counter[int], count: int, pool: range) -> List[int]:
     return selected
 
 
-def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
+def run_strategy(game_profile: Dict, draw_history: Sequence[Dict], intervals: Sequence[int] = FIBO_INTERVALS) -> Dict:
     """Fibonacci inversé: exploite des tirages espacés selon la suite de Fibonacci."""
 
+    if not intervals or any(interval < 1 for interval in intervals):
+        raise ValueError("intervals must be positive")
+    stats = HistoryStats.from_history(game_profile, draw_history)
     numbers_counter: Counter[int] = Counter()
     stars_counter: Counter[int] = Counter()
 
-    for interval in FIBO_INTERVALS:
-        if interval <= len(draw_history):
-            draw = draw_history[-interval]
-            numbers_counter.update(draw.get("numbers", []))
-            stars_counter.update(draw.get("stars", []))
+    for interval in intervals:
+        if interval <= len(stats):
+            numbers, stars = stats.draw_values(-interval)
+            numbers_counter.update(numbers)
+            stars_counter.update(stars)
 
     numbers_range = range(1, game_profile.get("max_number", 50) + 1)
     stars_range = range(1, game_profile.get("max_star", 12) + 1)
@@ -37,7 +42,7 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
     stars = _pick_top(stars_counter, game_profile.get("stars_to_pick", 2), stars_range)
 
     explanation = (
-        "Fibonacci inversé : sélection des valeurs récurrentes aux intervalles 1,2,3,5,8,13 tirages."
+        f"Fibonacci inversé : sélection des valeurs récurrentes aux intervalles {','.join(map(str, intervals))} tirages."
         if numbers_counter or stars_counter
         else "Historique insuffisant : sélection des premiers numéros et étoiles disponibles."
     )
@@ -49,3 +54,22 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
         "method_used": "fibo",
         "explanation": explanation,
     }
+
+
+def value_scores(game_profile: Dict, draw_history: Sequence[Dict],
+                 intervals: Sequence[int] = FIBO_INTERVALS) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): occurrences at the Fibonacci intervals."""
+
+    if not intervals or any(interval < 1 for interval in intervals):
+        raise ValueError("intervals must be positive")
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    numbers_scores = [0.0] * (game_profile.get("max_number", 50) + 1)
+    stars_scores = [0.0] * (game_profile.get("max_star", 12) + 1)
+    for interval in intervals:
+        if interval <= len(stats):
+            numbers, stars = stats.draw_values(-interval)
+            for value in numbers:
+                numbers_scores[value] += 1
+            for value in stars:
+                stars_scores[value] += 1
+    return numbers_scores, stars_scores
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Dict, List, Sequence
+from typing import Dict, List, Sequence, Tuple
+
+from history_stats import HistoryStats
 
 
 def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
@@ -9,18 +11,15 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
 
     Args:
         game_profile: Metadata describing the game ranges and counts.
-        draw_history: Iterable of past draw dictionaries with "numbers" and "stars".
+        draw_history: Iterable of past draw dictionaries with "numbers" and "stars",
+            or the ``HistoryStats`` already computed for the request.
 
     Returns:
         A dictionary containing the generated "numbers", "stars", "confidence_score",
         "method_used" and an "explanation".
     """
 
-    numbers_counter: Counter[int] = Counter()
-    stars_counter: Counter[int] = Counter()
-    for draw in draw_history:
-        numbers_counter.update(draw.get("numbers", []))
-        stars_counter.update(draw.get("stars", []))
+    numbers_counter, stars_counter = HistoryStats.from_history(game_profile, draw_history).window()
 
     def _top_elements(counter: Counter, count: int, fallback_range: range) -> List[int]:
         if not counter:
@@ -51,3 +50,13 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
         "method_used": "frequency",
         "explanation": explanation,
     }
+
+
+def value_scores(game_profile: Dict, draw_history: Sequence[Dict]) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): the count over the whole history."""
+
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    return (
+        [float(count) for count in stats.value_counts("numbers")],
+        [float(count) for count in stats.value_counts("stars")],
+    )
@@ -1,50 +1,113 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict, List, Sequence
+import time
+from math import comb, log
+from typing import Dict, List, Sequence, Tuple
 
+from history_stats import HistoryStats
 
-WINDOW = 80
+from .monte_carlo import DEFAULT_SIMULATIONS, default_workers, simulate
 
 
-def _least_frequent(counter: Counter[int], count: int, pool: range) -> List[int]:
-    if not counter:
-        return list(pool)[:count]
-    ordered = sorted(counter.items(), key=lambda item: (item[1], item[0]))
-    selected = [value for value, _ in ordered[:count]]
-    if len(selected) < count:
-        missing = [n for n in pool if n not in counter]
-        selected.extend(missing[: count - len(selected)])
-    return selected
+WINDOW = 80
+# Seed used when the request does not set one, so that mcc stays deterministic.
+DEFAULT_SEED = 0
+# Extra simulation rounds drawn when the first one holds fewer than ``count`` distinct grids.
+MAX_ROUNDS = 8
 
 
-def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
-    """Monte Carlo combinatoire: favorise les valeurs les moins sorties récemment."""
+def _inverse_weights(counts: List[int]) -> List[float]:
+    return [1.0 / (1 + count) for count in counts[1:]]
 
-    recent_draws = draw_history[-WINDOW:]
-    numbers_counter: Counter[int] = Counter()
-    stars_counter: Counter[int] = Counter()
 
-    for draw in recent_draws:
-        numbers_counter.update(draw.get("numbers", []))
-        stars_counter.update(draw.get("stars", []))
+def run_strategy(
+    game_profile: Dict,
+    draw_history: Sequence[Dict],
+    count: int = 1,
+    seed: int | None = None,
+    simulations: int | None = None,
+    time_budget: float | None = None,
+    window: int = WINDOW,
+) -> Dict:
+    """Monte Carlo combinatoire: simule des grilles pondérées par l'inverse des fréquences récentes.
 
-    numbers_range = range(1, game_profile.get("max_number", 50) + 1)
-    stars_range = range(1, game_profile.get("max_star", 12) + 1)
+    Les poids ``1 / (1 + occurrences)`` sur les ``window`` derniers tirages favorisent
+    les valeurs en retard ; ``simulations`` grilles sont tirées selon ces poids, notées
+    (somme des log-poids) et les ``count`` meilleures grilles distinctes sont renvoyées.
+    ``time_budget`` (secondes) borne la durée de la simulation.  Si les doublons laissent
+    moins de ``count`` grilles distinctes, d'autres tours sont simulés ; ValueError si le
+    budget ou ``MAX_ROUNDS`` est épuisé avant.
+    """
 
-    numbers = _least_frequent(numbers_counter, game_profile.get("numbers_to_pick", 5), numbers_range)
-    stars = _least_frequent(stars_counter, game_profile.get("stars_to_pick", 2), stars_range)
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    weights = (
+        _inverse_weights(stats.value_counts("numbers", -window)),
+        _inverse_weights(stats.value_counts("stars", -window)),
+    )
+    picks = (game_profile.get("numbers_to_pick", 5), game_profile.get("stars_to_pick", 2))
+    space = comb(len(weights[0]), picks[0]) * comb(len(weights[1]), picks[1])
+    if count > space:
+        raise ValueError(f"count exceeds the {space} possible grids")
+    seed = DEFAULT_SEED if seed is None else seed
+    started = time.monotonic()
+    found: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float] = {}
+    simulated, truncated = 0, False
+    # Duplicate samples can leave a round short of ``count`` distinct grids: further
+    # rounds (with their own seeds) run until there are enough, never returning fewer.
+    for round_index in range(MAX_ROUNDS):
+        remaining = None if time_budget is None else time_budget - (time.monotonic() - started)
+        if round_index and remaining is not None and remaining <= 0:
+            break
+        result = simulate(
+            weights,
+            picks,
+            simulations=max(simulations or DEFAULT_SIMULATIONS, count),
+            top=count,
+            seed=seed + round_index,
+            time_budget=remaining,
+            workers=default_workers(),
+        )
+        found.update(((tuple(numbers), tuple(stars)), score) for numbers, stars, score in result["grids"])
+        simulated += result["simulated"]
+        truncated = truncated or result["truncated"]
+        if len(found) >= count:
+            break
+    if len(found) < count:
+        reason = "the time budget ran out" if truncated else "too many duplicate samples"
+        raise ValueError(f"only {len(found)} distinct grids out of {count} requested: {reason}")
+    best = sorted(found.items(), key=lambda item: (-item[1], item[0]))[:count]
+    grids = [(list(numbers), list(stars), score) for (numbers, stars), score in best]
+    numbers, stars, _ = grids[0]
 
     explanation = (
-        "Monte Carlo combinatoire : pondération inversée sur les 80 derniers tirages pour privilégier les numéros en retard."
-        if recent_draws
-        else "Historique insuffisant : sélection des premiers numéros et étoiles disponibles."
+        f"Monte Carlo combinatoire : {simulated} grilles simulées, pondérées à l'inverse des fréquences "
+        f"sur les {window} derniers tirages pour privilégier les numéros en retard."
+        if len(stats)
+        else "Historique insuffisant : simulation à poids uniformes sur les numéros et étoiles disponibles."
     )
+    if truncated:
+        explanation += " Simulation écourtée par le budget de temps."
 
     return {
         "numbers": numbers,
         "stars": stars,
-        "confidence_score": 0.5 if recent_draws else 0.3,
+        "confidence_score": 0.5 if len(stats) else 0.3,
         "method_used": "mcc",
         "explanation": explanation,
+        "grids": [{"numbers": grid_numbers, "stars": grid_stars} for grid_numbers, grid_stars, _ in grids],
     }
+
+
+def value_scores(game_profile: Dict, draw_history: Sequence[Dict],
+                 window: int = WINDOW) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): the log-weights used to score simulated grids."""
+
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    return tuple(
+        [0.0] + [log(weight) for weight in _inverse_weights(stats.value_counts(key, -window))]
+        for key in ("numbers", "stars")
+    )
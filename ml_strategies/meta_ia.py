@@ -1,17 +1,70 @@
 from __future__ import annotations
 
+import inspect
+import logging
+import os
+import threading
+import time
 from collections import Counter
-from typing import Dict, List, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from history_stats import HistoryStats
 
 from .fibo import run_strategy as fibo_strategy
+from .fibo import value_scores as fibo_scores
+from .frequency_strategy import run_strategy as frequency_strategy
+from .frequency_strategy import value_scores as frequency_scores
 from .mcc import run_strategy as mcc_strategy
+from .mcc import value_scores as mcc_scores
 from .spectre import run_strategy as spectre_strategy
+from .spectre import value_scores as spectre_scores
+
+# Stratégies pouvant participer au consensus ; une nouvelle stratégie s'ajoute ici.
+MEMBER_STRATEGIES: Dict[str, Callable[..., Dict]] = {
+    "fibo": fibo_strategy,
+    "frequency": frequency_strategy,
+    "mcc": mcc_strategy,
+    "spectre": spectre_strategy,
+}
+MEMBER_SCORES: Dict[str, Callable[..., Tuple[List[float], List[float]]]] = {
+    "fibo": fibo_scores,
+    "frequency": frequency_scores,
+    "mcc": mcc_scores,
+    "spectre": spectre_scores,
+}
+DEFAULT_MEMBERS: Dict[str, float] = {"fibo": 1.0, "mcc": 1.0, "spectre": 1.0}
+
+logger = logging.getLogger(__name__)
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_PID: int | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every meta_ia call (``META_IA_WORKERS`` threads, 8 by default).
 
+    Recreated after a fork, since the parent's threads do not exist in a child process.
+    """
 
-def _consensus(values: List[List[int]], pool: range, count: int) -> List[int]:
+    global _EXECUTOR, _EXECUTOR_PID
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR_PID != os.getpid():
+            try:
+                workers = max(1, int(os.environ.get("META_IA_WORKERS", "8")))
+            except ValueError:
+                workers = 8
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meta_ia")
+            _EXECUTOR_PID = os.getpid()
+        return _EXECUTOR
+
+
+def _consensus(values: List[List[int]], weights: List[float], pool: range, count: int) -> List[int]:
     counter: Counter[int] = Counter()
-    for proposal in values:
-        counter.update(proposal)
+    for proposal, weight in zip(values, weights):
+        for value in proposal:
+            counter[value] += weight
     if not counter:
         return list(pool)[:count]
     ordered = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
@@ -22,29 +75,131 @@ def _consensus(values: List[List[int]], pool: range, count: int) -> List[int]:
     return selected
 
 
-def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
-    """META IA : consensus des stratégies FIBO, MCC et SPECTRE."""
+def _run_member(name: str, deadline: float | None, game_profile: Dict, stats: HistoryStats, options: Dict) -> Dict:
+    # A running thread cannot be cancelled: a member only starts if the deadline is
+    # not already past (it may have waited in the shared pool's queue) and, when it
+    # takes a ``time_budget``, gets the time left so that it stops by itself.
+    strategy = MEMBER_STRATEGIES[name]
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"{name} did not start before the member timeout")
+        if "time_budget" in inspect.signature(strategy).parameters:
+            budget = options.get("time_budget")
+            options["time_budget"] = remaining if budget is None else min(budget, remaining)
+    return strategy(game_profile, stats, **options)
+
+
+def _validate_members(members: Dict[str, float]) -> Dict[str, float]:
+    if not members:
+        raise ValueError("at least one member strategy is required")
+    unknown = sorted(set(members) - set(MEMBER_STRATEGIES))
+    if unknown:
+        raise ValueError(f"unknown member strategies: {', '.join(unknown)}")
+    if any(not isinstance(weight, (int, float)) or weight <= 0 for weight in members.values()):
+        raise ValueError("member weights must be positive")
+    return {name: float(weight) for name, weight in members.items()}
+
 
-    fibo = fibo_strategy(game_profile, draw_history)
-    mcc = mcc_strategy(game_profile, draw_history)
-    spectre = spectre_strategy(game_profile, draw_history)
+def run_strategy(
+    game_profile: Dict,
+    draw_history: Sequence[Dict],
+    simulations: int | None = None,
+    member_params: Dict[str, Dict] | None = None,
+    members: Dict[str, float] | None = None,
+    member_timeout: float | None = None,
+) -> Dict:
+    """META IA : consensus pondéré de stratégies membres (FIBO, MCC et SPECTRE par défaut).
+
+    ``members`` associe chaque membre à son poids dans le vote. Les membres sont
+    exécutés en parallèle sur un pool partagé ; un membre qui dépasse
+    ``member_timeout`` (secondes) ou échoue est écarté du consensus et journalisé.
+    Le délai restant est transmis comme ``time_budget`` aux membres qui l'acceptent
+    (MCC), pour qu'ils libèrent leur thread d'eux-mêmes. ``simulations``
+    est transmis à MCC pour borner sa simulation Monte Carlo et ``member_params``
+    porte les paramètres de chaque membre (clé = nom de stratégie).
+    """
+
+    members = _validate_members(DEFAULT_MEMBERS if members is None else members)
+    member_params = member_params or {}
+    # Les membres partagent les mêmes statistiques, calculées une seule fois.
+    stats = HistoryStats.from_history(game_profile, draw_history)
+
+    executor = shared_executor()
+    deadline = None if member_timeout is None else time.monotonic() + member_timeout
+    futures = {}
+    for name in members:
+        options = dict(member_params.get(name, {}))
+        if name == "mcc":
+            options["simulations"] = simulations
+        futures[name] = executor.submit(_run_member, name, deadline, game_profile, stats, options)
+    wait(futures.values(), timeout=member_timeout)
+
+    results: Dict[str, Dict] = {}
+    dropped: List[str] = []
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            logger.warning("meta_ia member %s exceeded the %ss member timeout", name, member_timeout)
+            dropped.append(name)
+        elif future.exception() is not None:
+            error = future.exception()
+            logger.warning("meta_ia member %s failed: %s", name, error, exc_info=error)
+            dropped.append(name)
+        else:
+            results[name] = future.result()
 
     numbers_range = range(1, game_profile.get("max_number", 50) + 1)
     stars_range = range(1, game_profile.get("max_star", 12) + 1)
+    weights = [members[name] for name in results]
 
-    numbers = _consensus([fibo["numbers"], mcc["numbers"], spectre["numbers"]], numbers_range, game_profile.get("numbers_to_pick", 5))
-    stars = _consensus([fibo["stars"], mcc["stars"], spectre["stars"]], stars_range, game_profile.get("stars_to_pick", 2))
-
-    explanation = (
-        "META IA : consensus entre FIBO, MCC et SPECTRE pour stabiliser les propositions."
-    )
+    numbers = _consensus([r["numbers"] for r in results.values()], weights, numbers_range, game_profile.get("numbers_to_pick", 5))
+    stars = _consensus([r["stars"] for r in results.values()], weights, stars_range, game_profile.get("stars_to_pick", 2))
 
-    avg_confidence = (fibo["confidence_score"] + mcc["confidence_score"] + spectre["confidence_score"]) / 3
+    if results:
+        used = ", ".join(f"{name.upper()} ({members[name]:g})" for name in results)
+        explanation = f"META IA : consensus pondéré entre {used} pour stabiliser les propositions."
+        total = sum(weights)
+        confidence = sum(r["confidence_score"] * members[name] for name, r in results.items()) / total
+    else:
+        explanation = "META IA : aucun membre n'a abouti dans le budget, sélection des premières valeurs disponibles."
+        confidence = 0.3
+    if dropped and results:
+        explanation += f" Membres écartés (délai dépassé ou erreur) : {', '.join(name.upper() for name in dropped)}."
 
     return {
         "numbers": numbers,
         "stars": stars,
-        "confidence_score": round(avg_confidence, 2),
+        "confidence_score": round(confidence, 2),
         "method_used": "meta_ia",
         "explanation": explanation,
     }
+
+
+def _normalized(scores: List[float]) -> List[float]:
+    # Min-max scaling puts every member on [0, 1] before weighting.
+    low, high = min(scores[1:]), max(scores[1:])
+    if high == low:
+        return [0.0] * len(scores)
+    return [0.0] + [(score - low) / (high - low) for score in scores[1:]]
+
+
+def value_scores(
+    game_profile: Dict,
+    draw_history: Sequence[Dict],
+    member_params: Dict[str, Dict] | None = None,
+    members: Dict[str, float] | None = None,
+) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): weighted sum of the members' normalized scores."""
+
+    members = _validate_members(DEFAULT_MEMBERS if members is None else members)
+    member_params = member_params or {}
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    numbers_scores = [0.0] * (game_profile.get("max_number", 50) + 1)
+    stars_scores = [0.0] * (game_profile.get("max_star", 12) + 1)
+    for name, weight in members.items():
+        member_numbers, member_stars = MEMBER_SCORES[name](game_profile, stats, **member_params.get(name, {}))
+        for total, scores in ((numbers_scores, member_numbers), (stars_scores, member_stars)):
+            for value, score in enumerate(_normalized(scores)):
+                total[value] += weight * score
+    return numbers_scores, stars_scores
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+CHUNK_SIZE = 50_000
+# Default simulation size; the pure-Python sampler is ~50x slower than NumPy.
+DEFAULT_SIMULATIONS = 20_000 if np is not None else 2_000
+# Grids kept per chunk are (score, numbers, stars); higher scores are better.
+Candidate = Tuple[float, Tuple[int, ...], Tuple[int, ...]]
+
+
+def _chunk_seed(seed: int, chunk: int) -> int:
+    return seed * 1_000_003 + chunk
+
+
+def _python_chunk(weights: Tuple[Sequence[float], Sequence[float]], picks: Tuple[int, int], rows: int,
+                  seed: int) -> Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float]:
+    rng = random.Random(seed)
+    found = {}
+    pools = [range(1, len(w) + 1) for w in weights]
+    logs = [[math.log(value) for value in w] for w in weights]
+    for _ in range(rows):
+        grid = []
+        score = 0.0
+        for w, log_w, pool, pick in zip(weights, logs, pools, picks):
+            # Efraimidis-Spirakis: the ``pick`` largest u ** (1 / w) form a
+            # weighted sample without replacement.
+            chosen = heapq.nlargest(pick, pool, key=lambda v: rng.random() ** (1.0 / w[v - 1]))
+            grid.append(tuple(sorted(chosen)))
+            score += sum(log_w[v - 1] for v in chosen)
+        found[(grid[0], grid[1])] = score
+    return found
+
+
+def _numpy_chunk(weights: Tuple[Sequence[float], Sequence[float]], picks: Tuple[int, int], rows: int,
+                 seed: int, top: int) -> Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float]:
+    rng = np.random.default_rng(seed)
+    chosen = []
+    score = np.zeros(rows)
+    keys = np.zeros(rows, dtype=np.uint64)
+    for w, pick in zip(weights, picks):
+        w = np.asarray(w, dtype=float)
+        # Same Efraimidis-Spirakis sampling in log space: -log(u) is an
+        # exponential variate, and the ``pick`` smallest E / w are kept.
+        sampled = np.argpartition(rng.standard_exponential((rows, len(w))) / w, pick - 1, axis=1)[:, :pick]
+        sampled.sort(axis=1)
+        chosen.append(sampled)
+        score += np.log(w)[sampled].sum(axis=1)
+        keys = (keys << np.uint64(len(w))) | (np.uint64(1) << sampled.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+    _, first = np.unique(keys, return_index=True)
+    if len(first) > top:
+        first = first[np.argpartition(-score[first], top - 1)[:top]]
+    numbers = (chosen[0][first] + 1).tolist()
+    stars = (chosen[1][first] + 1).tolist()
+    return {(tuple(n), tuple(s)): value for n, s, value in zip(numbers, stars, score[first].tolist())}
+
+
+def _run_chunks(weights: Tuple[Sequence[float], Sequence[float]], picks: Tuple[int, int], seed: int,
+                chunks: Sequence[Tuple[int, int]], top: int, deadline: float | None) -> Tuple[List[Candidate], int]:
+    """Simulate a range of ``(chunk index, rows)`` and keep the ``top`` best grids."""
+
+    found: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float] = {}
+    simulated = 0
+    for index, rows in chunks:
+        if deadline is not None and simulated and time.monotonic() >= deadline:
+            break
+        if np is not None and sum(len(w) for w in weights) <= 64:
+            found.update(_numpy_chunk(weights, picks, rows, _chunk_seed(seed, index), top))
+        else:
+            found.update(_python_chunk(weights, picks, rows, _chunk_seed(seed, index)))
+        simulated += rows
+    best = heapq.nsmallest(top, ((-score, numbers, stars) for (numbers, stars), score in found.items()))
+    return [(-score, numbers, stars) for score, numbers, stars in best], simulated
+
+
+def simulate(weights: Tuple[Sequence[float], Sequence[float]], picks: Tuple[int, int], *, simulations: int,
+             top: int = 1, seed: int = 0, time_budget: float | None = None, workers: int = 1,
+             chunk_size: int = CHUNK_SIZE) -> Dict[str, object]:
+    """Sample weighted grids, score them and return the ``top`` distinct ones.
+
+    ``weights`` holds one positive weight per number and per star; a grid is
+    drawn without replacement proportionally to them and scored by the sum
+    of its log-weights.  Work is split in chunks whose seeds only depend on
+    ``seed`` and the chunk index, so results are reproducible whatever the
+    number of ``workers`` (as long as no ``time_budget`` cuts the run
+    short).  With ``workers > 1`` contiguous chunk ranges are dispatched to a
+    ``ProcessPoolExecutor``.
+    """
+
+    if simulations < 1 or top < 1:
+        raise ValueError("simulations and top must be positive")
+    if any(value <= 0 for w in weights for value in w):
+        raise ValueError("weights must be positive")
+    started = time.monotonic()
+    deadline = started + time_budget if time_budget is not None else None
+    chunks = [(index, min(chunk_size, simulations - start)) for index, start in enumerate(range(0, simulations, chunk_size))]
+    workers = max(1, min(workers, len(chunks)))
+
+    if workers == 1:
+        parts = [_run_chunks(weights, picks, seed, chunks, top, deadline)]
+    else:
+        step = math.ceil(len(chunks) / workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_chunks, weights, picks, seed, chunks[i:i + step], top, deadline)
+                for i in range(0, len(chunks), step)
+            ]
+            parts = [future.result() for future in futures]
+
+    merged: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float] = {}
+    for candidates, _ in parts:
+        merged.update({(numbers, stars): score for score, numbers, stars in candidates})
+    best = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:top]
+    simulated = sum(count for _, count in parts)
+    return {
+        "grids": [(list(numbers), list(stars), score) for (numbers, stars), score in best],
+        "simulated": simulated,
+        "truncated": simulated < simulations,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def default_workers() -> int:
+    """Process count for simulations, from ``MCC_WORKERS`` (1 = in-process)."""
+
+    try:
+        workers = int(os.environ.get("MCC_WORKERS", "1"))
+    except ValueError:
+        return 1
+    return max(1, min(workers, os.cpu_count() or 1))
@@ -1,29 +1,103 @@
 from __future__ import annotations
 
 import random
-from typing import Dict, Sequence
+from typing import Dict, List, Sequence, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
 
-def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
-    """Generate numbers by shuffling the allowed ranges.
+from grid_codec import Grid, grid_space
+
+
+def _python_grids(game_profile: Dict, count: int, seed: int | None) -> List[Grid]:
+    rng = random.Random(seed)
+    numbers_range = range(1, game_profile.get("max_number", 50) + 1)
+    stars_range = range(1, game_profile.get("max_star", 12) + 1)
+    numbers_to_pick = game_profile.get("numbers_to_pick", 5)
+    stars_to_pick = game_profile.get("stars_to_pick", 2)
+    seen = set()
+    grids: List[Grid] = []
+    while len(grids) < count:
+        numbers = sorted(rng.sample(numbers_range, numbers_to_pick))
+        stars = sorted(rng.sample(stars_range, stars_to_pick))
+        key = (tuple(numbers), tuple(stars))
+        if key not in seen:
+            seen.add(key)
+            grids.append((numbers, stars))
+    return grids
+
+
+def _numpy_subsets(rng: "np.random.Generator", rows: int, pool: int, pick: int) -> "np.ndarray":
+    # The ``pick`` smallest of ``pool`` uniform keys form a uniform random subset.
+    picked = np.argpartition(rng.random((rows, pool)), pick - 1, axis=1)[:, :pick]
+    return np.sort(picked, axis=1).astype(np.uint64)
+
+
+def _numpy_grids(game_profile: Dict, count: int, seed: int | None) -> List[Grid]:
+    rng = np.random.default_rng(seed)
+    max_number = game_profile.get("max_number", 50)
+    max_star = game_profile.get("max_star", 12)
+    numbers_to_pick = game_profile.get("numbers_to_pick", 5)
+    stars_to_pick = game_profile.get("stars_to_pick", 2)
+    one = np.uint64(1)
+
+    seen = np.empty(0, dtype=np.uint64)
+    numbers_parts, stars_parts = [], []
+    missing = count
+    while missing:
+        rows = missing + missing // 8 + 16
+        numbers = _numpy_subsets(rng, rows, max_number, numbers_to_pick)
+        stars = _numpy_subsets(rng, rows, max_star, stars_to_pick)
+        # One 64-bit key per grid (numbers mask above the stars mask) makes the
+        # duplicate check a sort instead of a pairwise comparison.
+        keys = ((one << numbers).sum(axis=1, dtype=np.uint64) << np.uint64(max_star)) | (one << stars).sum(
+            axis=1, dtype=np.uint64
+        )
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        first = first[~np.isin(keys[first], seen)][:missing]
+        seen = np.concatenate([seen, keys[first]])
+        numbers_parts.append(numbers[first] + one)
+        stars_parts.append(stars[first] + one)
+        missing -= len(first)
+    numbers = np.concatenate(numbers_parts).tolist()
+    stars = np.concatenate(stars_parts).tolist()
+    return list(zip(numbers, stars))
+
+
+def sample_grids(game_profile: Dict, count: int = 1, seed: int | None = None) -> List[Grid]:
+    """Draw ``count`` distinct uniform grids, reproducibly when ``seed`` is set.
+
+    Uses a vectorized NumPy sampler when available (a given seed is
+    reproducible for a given engine).  Duplicates are removed through a
+    hash set or a sort of 64-bit grid keys, never by pairwise comparison.
+    """
+
+    if count < 1 or count > grid_space(game_profile):
+        raise ValueError(f"count must be between 1 and {grid_space(game_profile)}")
+    if np is not None and game_profile.get("max_number", 50) + game_profile.get("max_star", 12) <= 64:
+        return _numpy_grids(game_profile, count, seed)
+    return _python_grids(game_profile, count, seed)
+
+
+def run_strategy(game_profile: Dict, draw_history: Sequence[Dict], count: int = 1, seed: int | None = None) -> Dict:
+    """Generate numbers by sampling the allowed ranges uniformly.
 
     Args:
         game_profile: Metadata describing the game ranges and counts.
         draw_history: Iterable of past draw dictionaries. Unused but kept for signature.
+        count: Number of distinct grids to draw.
+        seed: Optional seed making the draw reproducible.
 
     Returns:
         A dictionary containing the generated "numbers", "stars", "confidence_score",
-        "method_used" and an "explanation".
+        "method_used", an "explanation" and every drawn grid in "grids".
     """
 
-    numbers_range = list(range(1, game_profile.get("max_number", 50) + 1))
-    stars_range = list(range(1, game_profile.get("max_star", 12) + 1))
-
-    random.shuffle(numbers_range)
-    random.shuffle(stars_range)
-
-    numbers = sorted(numbers_range[: game_profile.get("numbers_to_pick", 5)])
-    stars = sorted(stars_range[: game_profile.get("stars_to_pick", 2)])
+    grids = sample_grids(game_profile, count, seed)
+    numbers, stars = grids[0]
 
     return {
         "numbers": numbers,
@@ -31,4 +105,16 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
         "confidence_score": 0.2,
         "method_used": "random",
         "explanation": "Sélection entièrement aléatoire dans les plages autorisées.",
+        "grids": [{"numbers": grid_numbers, "stars": grid_stars} for grid_numbers, grid_stars in grids],
     }
+
+
+def value_scores(game_profile: Dict, draw_history: Sequence[Dict],
+                 seed: int | None = None) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): uniform random, reproducible with ``seed``."""
+
+    rng = random.Random(seed)
+    return (
+        [0.0] + [rng.random() for _ in range(game_profile.get("max_number", 50))],
+        [0.0] + [rng.random() for _ in range(game_profile.get("max_star", 12))],
+    )
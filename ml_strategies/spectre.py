@@ -1,50 +1,47 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict, List, Sequence
+from typing import Dict, List, Sequence, Tuple
+
+from history_stats import HistoryStats
 
 
 SHORT_WINDOW = 20
 LONG_WINDOW = 120
 
 
-def _compute_score(short_counter: Counter[int], long_counter: Counter[int], value: int) -> float:
-    short_freq = short_counter.get(value, 0)
-    long_freq = long_counter.get(value, 0)
+def _compute_score(short_freq: int, long_freq: int) -> float:
     if long_freq == 0:
         return -1.0  # absent du long terme
     # score élevé si valeur présente au long terme mais absente/réduite récemment
     return (long_freq - short_freq) + (0.5 if short_freq == 0 else 0.0)
 
 
-def _select_values(short_counter: Counter[int], long_counter: Counter[int], pool: range, count: int) -> List[int]:
+def _select_values(short_counts: List[int], long_counts: List[int], pool: range, count: int) -> List[int]:
     scored = []
     for value in pool:
-        score = _compute_score(short_counter, long_counter, value)
+        score = _compute_score(short_counts[value], long_counts[value])
         scored.append((score, value))
     scored.sort(key=lambda item: (-item[0], item[1]))
     selected = [value for _, value in scored[:count]]
     return selected
 
 
-def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
+def run_strategy(
+    game_profile: Dict,
+    draw_history: Sequence[Dict],
+    short_window: int = SHORT_WINDOW,
+    long_window: int = LONG_WINDOW,
+) -> Dict:
     """SPECTRE IA : contraste des tendances court terme vs long terme."""
 
-    short_draws = draw_history[-SHORT_WINDOW:]
-    long_draws = draw_history[-LONG_WINDOW:]
-
-    short_numbers: Counter[int] = Counter()
-    short_stars: Counter[int] = Counter()
-    long_numbers: Counter[int] = Counter()
-    long_stars: Counter[int] = Counter()
-
-    for draw in short_draws:
-        short_numbers.update(draw.get("numbers", []))
-        short_stars.update(draw.get("stars", []))
-
-    for draw in long_draws:
-        long_numbers.update(draw.get("numbers", []))
-        long_stars.update(draw.get("stars", []))
+    if not 1 <= short_window < long_window:
+        raise ValueError("short_window must be at least 1 and below long_window")
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    # Comptes indexés par valeur : le contraste n'a pas besoin de l'ordre d'apparition.
+    short_numbers = stats.value_counts("numbers", -short_window)
+    short_stars = stats.value_counts("stars", -short_window)
+    long_numbers = stats.value_counts("numbers", -long_window)
+    long_stars = stats.value_counts("stars", -long_window)
 
     numbers_range = range(1, game_profile.get("max_number", 50) + 1)
     stars_range = range(1, game_profile.get("max_star", 12) + 1)
@@ -52,9 +49,9 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
     numbers = _select_values(short_numbers, long_numbers, numbers_range, game_profile.get("numbers_to_pick", 5))
     stars = _select_values(short_stars, long_stars, stars_range, game_profile.get("stars_to_pick", 2))
 
-    has_history = bool(long_draws)
+    has_history = len(stats) > 0
     explanation = (
-        "SPECTRE IA : contraste fréquence long terme (120) vs court terme (20) pour repérer les retours probables."
+        f"SPECTRE IA : contraste fréquence long terme ({long_window}) vs court terme ({short_window}) pour repérer les retours probables."
         if has_history
         else "Historique insuffisant : classement par ordre naturel faute de contraste temporel."
     )
@@ -66,3 +63,18 @@ def run_strategy(game_profile: Dict, draw_history: Sequence[Dict]) -> Dict:
         "method_used": "spectre",
         "explanation": explanation,
     }
+
+
+def value_scores(game_profile: Dict, draw_history: Sequence[Dict], short_window: int = SHORT_WINDOW,
+                 long_window: int = LONG_WINDOW) -> Tuple[List[float], List[float]]:
+    """Additive per-value scores (lists indexed by value): the short/long term contrast."""
+
+    if not 1 <= short_window < long_window:
+        raise ValueError("short_window must be at least 1 and below long_window")
+    stats = HistoryStats.from_history(game_profile, draw_history)
+    scores = []
+    for key in ("numbers", "stars"):
+        short_counts = stats.value_counts(key, -short_window)
+        long_counts = stats.value_counts(key, -long_window)
+        scores.append([0.0] + [_compute_score(short, long) for short, long in zip(short_counts[1:], long_counts[1:])])
+    return scores[0], scores[1]
@@ -1,14 +1,39 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict, Iterable, List, Sequence
+from collections import Counter, deque
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
+from draw_history import DrawHistory
 
-def _sliding_windows(sequence: Sequence[int], window_size: int) -> List[List[int]]:
-    return [list(sequence[i : i + window_size]) for i in range(len(sequence) - window_size + 1)]
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+FEATURE_ENGINES = ("auto", "python", "numpy")
+FEATURE_SECTIONS = ("frequencies", "gaps", "windows")
+# Below this many draws the pure-Python path is faster than building arrays.
+NUMPY_MIN_DRAWS = 256
+
+
+def iter_windows(draw_history: Iterable[Dict], key: str, window_size: int) -> Iterator[List[int]]:
+    """Lazily yield every sliding window over the flattened ``key`` values.
+
+    Draws are only read as far as the consumer iterates, so truncating the
+    generator never materializes the full list of windows.
+    """
+
+    values = chain.from_iterable(draw.get(key, []) for draw in draw_history)
+    window = deque(islice(values, window_size - 1), maxlen=window_size)
+    for value in values:
+        window.append(value)
+        yield list(window)
 
 
 def calculate_frequencies(draw_history: Iterable[Dict]) -> Dict[str, Counter]:
+    if isinstance(draw_history, DrawHistory):
+        return draw_history.counts()
     numbers_counter: Counter[int] = Counter()
     stars_counter: Counter[int] = Counter()
     for draw in draw_history:
@@ -17,47 +42,365 @@ def calculate_frequencies(draw_history: Iterable[Dict]) -> Dict[str, Counter]:
     return {"numbers": numbers_counter, "stars": stars_counter}
 
 
+def _column_gap_stats(column: int, size: int) -> Tuple[int, int, int]:
+    """(current gap, longest gap, occurrences) from a draw-index bitset."""
+
+    longest = 0
+    previous = -1
+    seen = 0
+    while column:
+        low = column & -column
+        index = low.bit_length() - 1
+        longest = max(longest, index - previous - 1)
+        previous = index
+        seen += 1
+        column ^= low
+    current = size - 1 - previous
+    return current, max(longest, current), seen
+
+
+def _gap_tables(draw_history: Iterable[Dict], game_profile: Dict) -> Dict[str, Dict[str, Dict[int, object]]]:
+    """Current, longest and mean gap per value in one pass over the history.
+
+    Runs in O(total balls + pool): each value keeps the index of its last
+    appearance, so a draw only touches the values it contains.  The mean is
+    taken over every absence run (before the first appearance, between
+    appearances and the current one), i.e. ``(draws - hits) / (hits + 1)``.
+    """
+
+    pools = {"numbers": game_profile.get("max_number", 50), "stars": game_profile.get("max_star", 12)}
+    stats: Dict[str, Tuple[List[int], List[int], List[int]]] = {}
+    if isinstance(draw_history, DrawHistory):
+        size = len(draw_history)
+        numbers_cols, stars_cols = draw_history.columns()
+        for key, columns in (("numbers", numbers_cols), ("stars", stars_cols)):
+            rows = [_column_gap_stats(columns[v - 1], size) for v in range(1, pools[key] + 1)]
+            stats[key] = ([0] + [r[0] for r in rows], [0] + [r[1] for r in rows], [0] + [r[2] for r in rows])
+    else:
+        last = {key: [-1] * (pool + 1) for key, pool in pools.items()}
+        longest = {key: [0] * (pool + 1) for key, pool in pools.items()}
+        seen = {key: [0] * (pool + 1) for key, pool in pools.items()}
+        size = 0
+        for index, draw in enumerate(draw_history):
+            size = index + 1
+            for key, pool in pools.items():
+                last_key, longest_key, seen_key = last[key], longest[key], seen[key]
+                for value in draw.get(key, []):
+                    if not 1 <= value <= pool or last_key[value] == index:
+                        continue
+                    run = index - last_key[value] - 1
+                    if run > longest_key[value]:
+                        longest_key[value] = run
+                    last_key[value] = index
+                    seen_key[value] += 1
+        for key, pool in pools.items():
+            current = [size - 1 - last[key][v] for v in range(pool + 1)]
+            stats[key] = (current, [max(longest[key][v], current[v]) for v in range(pool + 1)], seen[key])
+
+    return {
+        key: {
+            "current": {v: stats[key][0][v] for v in range(1, pool + 1)},
+            "max": {v: stats[key][1][v] for v in range(1, pool + 1)},
+            "mean": {v: round((size - stats[key][2][v]) / (stats[key][2][v] + 1), 2) for v in range(1, pool + 1)},
+        }
+        for key, pool in pools.items()
+    }
+
+
 def calculate_gaps(draw_history: Iterable[Dict], game_profile: Dict) -> Dict[str, Dict[int, int]]:
-    max_number = game_profile.get("max_number", 50)
-    max_star = game_profile.get("max_star", 12)
-    gaps_numbers = {n: 0 for n in range(1, max_number + 1)}
-    gaps_stars = {s: 0 for s in range(1, max_star + 1)}
+    """Number of draws since each value last appeared (the whole history if never)."""
+
+    tables = _gap_tables(draw_history, game_profile)
+    return {"numbers": tables["numbers"]["current"], "stars": tables["stars"]["current"]}
+
+
+def calculate_gap_statistics(draw_history: Iterable[Dict], game_profile: Dict) -> Dict[str, Dict[str, Dict[int, object]]]:
+    """Current, longest historical and mean gap per value, for a "retard" dashboard."""
+
+    return _gap_section(_gap_tables(draw_history, game_profile))
+
+
+def _numpy_values(draw_history: Sequence[Dict], key: str, pool: int) -> Tuple["np.ndarray", "np.ndarray"] | None:
+    """Flatten one kind of values into (values, draw indexes), in iteration order."""
+
+    if isinstance(draw_history, DrawHistory):
+        masks = draw_history.numbers_masks if key == "numbers" else draw_history.stars_masks
+        if not len(masks):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        raw = np.frombuffer(masks, dtype=np.uint64 if key == "numbers" else np.uint16)
+        bits = np.unpackbits(raw.view(np.uint8).reshape(len(masks), -1), axis=1, bitorder="little")
+        rows, cols = np.nonzero(bits[:, :pool])
+        return cols.astype(np.int64) + 1, rows.astype(np.int64)
+
+    lists = [draw.get(key, []) for draw in draw_history]
+    lengths = np.fromiter((len(values) for values in lists), dtype=np.int64, count=len(lists))
+    values = np.fromiter(chain.from_iterable(lists), dtype=np.int64, count=int(lengths.sum()))
+    if values.size and (values.min() < 1 or values.max() > pool):
+        return None
+    return values, np.repeat(np.arange(len(lists), dtype=np.int64), lengths)
+
+
+def _numpy_frequencies(values: "np.ndarray", pool: int) -> Counter:
+    uniques, first = np.unique(values, return_index=True)
+    counts = np.bincount(values, minlength=pool + 1)
+    ordered = uniques[np.argsort(first, kind="stable")].tolist()
+    return Counter({value: int(counts[value]) for value in ordered})
+
+
+def _numpy_gaps(values: "np.ndarray", rows: "np.ndarray", size: int, pool: int) -> Dict[str, Dict[int, object]]:
+    # Distinct (value, draw) pairs sorted by value then draw: the absence run
+    # before each appearance is the distance to the previous pair of the
+    # same value (or to the start of the history).
+    order = np.lexsort((rows, values))
+    sorted_values, sorted_rows = values[order], rows[order]
+    distinct = np.ones(sorted_values.size, dtype=bool)
+    distinct[1:] = (sorted_values[1:] != sorted_values[:-1]) | (sorted_rows[1:] != sorted_rows[:-1])
+    sorted_values, sorted_rows = sorted_values[distinct], sorted_rows[distinct]
+    previous = np.full(sorted_rows.size, -1, dtype=np.int64)
+    same_value = np.zeros(sorted_values.size, dtype=bool)
+    same_value[1:] = sorted_values[1:] == sorted_values[:-1]
+    previous[same_value] = sorted_rows[:-1][same_value[1:]]
+    longest = np.zeros(pool + 1, dtype=np.int64)
+    np.maximum.at(longest, sorted_values, sorted_rows - previous - 1)
+    seen = np.bincount(sorted_values, minlength=pool + 1).tolist()
+
+    last_row = np.full(pool + 1, -1, dtype=np.int64)
+    if sorted_values.size:
+        is_last = np.ones(sorted_values.size, dtype=bool)
+        is_last[:-1] = ~same_value[1:]
+        last_row[sorted_values[is_last]] = sorted_rows[is_last]
+    current = size - 1 - last_row
+    current_values = current.tolist()
+    longest_values = np.maximum(longest, current).tolist()
+    return {
+        "current": {value: current_values[value] for value in range(1, pool + 1)},
+        "max": {value: longest_values[value] for value in range(1, pool + 1)},
+        "mean": {value: round((size - seen[value]) / (seen[value] + 1), 2) for value in range(1, pool + 1)},
+    }
 
-    for draw in draw_history:
-        present_numbers = set(draw.get("numbers", []))
-        present_stars = set(draw.get("stars", []))
-        gaps_numbers = {n: (0 if n in present_numbers else gaps_numbers[n] + 1) for n in gaps_numbers}
-        gaps_stars = {s: (0 if s in present_stars else gaps_stars[s] + 1) for s in gaps_stars}
 
-    return {"numbers": gaps_numbers, "stars": gaps_stars}
+def _numpy_windows(values: "np.ndarray", window_size: int) -> List[List[int]]:
+    if values.size < window_size:
+        return []
+    return np.lib.stride_tricks.sliding_window_view(values, window_size).tolist()
 
 
-def prepare_features(game_profile: Dict, draw_history: Sequence[Dict], window_size: int = 5) -> Dict:
+def _numpy_features(game_profile: Dict, draw_history: Sequence[Dict], window_size: int,
+                    sections: Sequence[str], max_windows: int | None) -> Dict | None:
+    """NumPy engine for ``prepare_features``; returns None when it cannot apply."""
+
+    size = len(draw_history)
+    flattened = {}
+    for key, pool in (("numbers", game_profile.get("max_number", 50)), ("stars", game_profile.get("max_star", 12))):
+        values = _numpy_values(draw_history, key, pool)
+        if values is None:
+            return None
+        flattened[key] = (values, pool)
+
+    features: Dict[str, object] = {}
+    if "frequencies" in sections:
+        features["global_frequencies"] = {
+            key: _numpy_frequencies(values[0], pool) for key, (values, pool) in flattened.items()
+        }
+    if "gaps" in sections:
+        tables = {key: _numpy_gaps(*values, size, pool) for key, (values, pool) in flattened.items()}
+        features["gaps"] = _gap_section(tables)
+    if "windows" in sections:
+        if max_windows is None:
+            features["windows"] = {
+                key: _numpy_windows(values[0], window_size) for key, (values, _pool) in flattened.items()
+            }
+        else:
+            features["windows"] = _truncated_windows(draw_history, window_size, max_windows)
+    return features
+
+
+def _gap_section(tables: Dict[str, Dict[str, Dict[int, object]]]) -> Dict[str, object]:
+    return {
+        "numbers": tables["numbers"]["current"],
+        "stars": tables["stars"]["current"],
+        "max": {"numbers": tables["numbers"]["max"], "stars": tables["stars"]["max"]},
+        "mean": {"numbers": tables["numbers"]["mean"], "stars": tables["stars"]["mean"]},
+    }
+
+
+def _truncated_windows(draw_history: Iterable[Dict], window_size: int, max_windows: int | None) -> Dict[str, List[List[int]]]:
+    return {
+        key: list(islice(iter_windows(draw_history, key, window_size), max_windows))
+        for key in ("numbers", "stars")
+    }
+
+
+def prepare_features(game_profile: Dict, draw_history: Sequence[Dict], window_size: int = 5,
+                     engine: str = "auto", sections: Iterable[str] | None = None,
+                     max_windows: int | None = None) -> Dict:
     """Compute frequency, gaps and sliding window aggregates for a game.
 
     Args:
         game_profile: Metadata describing the game ranges and counts.
-        draw_history: Ordered list of draws, newest last.
+        draw_history: Ordered list of draws (or a ``DrawHistory``), newest last.
         window_size: Size of the sliding window to compute local frequencies.
+        engine: "python", "numpy" (vectorized over a draws x pool occurrence
+            matrix) or "auto" (NumPy when installed and the history is long
+            enough). Both engines produce identical output.
+        sections: Subset of "frequencies", "gaps" and "windows" to compute
+            (all of them by default); other sections are skipped entirely.
+        max_windows: Keep only the first windows of each kind; the windows
+            are then generated lazily and the rest is never built.
 
     Returns:
-        Dictionary with keys "global_frequencies", "gaps", "windows".
+        Dictionary with the requested keys among "global_frequencies", "gaps"
+        and "windows".
     """
 
-    frequencies = calculate_frequencies(draw_history)
-    gaps = calculate_gaps(draw_history, game_profile)
-    numbers_windows = _sliding_windows(
-        [n for draw in draw_history for n in draw.get("numbers", [])], window_size
-    ) if draw_history else []
-    stars_windows = _sliding_windows(
-        [s for draw in draw_history for s in draw.get("stars", [])], window_size
-    ) if draw_history else []
+    if engine not in FEATURE_ENGINES:
+        raise ValueError(f"Unknown feature engine: {engine}")
+    if engine == "numpy" and np is None:
+        raise ValueError("The numpy feature engine requires NumPy to be installed")
+    if window_size < 1:
+        raise ValueError("window_size must be at least 1")
+    selected = FEATURE_SECTIONS if sections is None else tuple(sections)
+    unknown = set(selected) - set(FEATURE_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown feature sections: {sorted(unknown)}")
+    if not selected:
+        return {}
 
-    return {
-        "global_frequencies": frequencies,
-        "gaps": gaps,
-        "windows": {
-            "numbers": numbers_windows,
-            "stars": stars_windows,
-        },
-    }
+    vectorized_windows = "windows" in selected and max_windows is None
+    wants_numpy = engine == "numpy" or (
+        engine == "auto" and np is not None and len(draw_history) >= NUMPY_MIN_DRAWS
+        and ("frequencies" in selected or "gaps" in selected or vectorized_windows)
+    )
+    if wants_numpy:
+        features = _numpy_features(game_profile, draw_history, window_size, selected, max_windows)
+        if features is not None:
+            return features
+
+    features: Dict[str, object] = {}
+    if "frequencies" in selected:
+        features["global_frequencies"] = calculate_frequencies(draw_history)
+    if "gaps" in selected:
+        features["gaps"] = calculate_gap_statistics(draw_history, game_profile)
+    if "windows" in selected:
+        features["windows"] = _truncated_windows(draw_history, window_size, max_windows)
+    return features
+
+
+class FeatureState:
+    """Incremental frequencies and gap tables for a growing history.
+
+    Built once from a history, then updated by ``push`` in O(values per draw).
+    ``features`` renders the same output as ``prepare_features`` on the full
+    history; frequencies and gaps cost O(pool) and windows are generated from
+    the attached ``DrawHistory``.
+    """
+
+    __slots__ = ("max_number", "max_star", "history", "_tables")
+
+    def __init__(self, max_number: int = 50, max_star: int = 12) -> None:
+        self.max_number = max_number
+        self.max_star = max_star
+        self.history = DrawHistory(max_number, max_star)
+        self._tables = {
+            key: {
+                "counts": [0] * (pool + 1),
+                "order": [],
+                "last": [-1] * (pool + 1),
+                "longest": [0] * (pool + 1),
+                "seen": [0] * (pool + 1),
+            }
+            for key, pool in (("numbers", max_number), ("stars", max_star))
+        }
+
+    @classmethod
+    def from_history(cls, game_profile: Dict, draw_history: Iterable[Dict]) -> "FeatureState":
+        state = cls(game_profile.get("max_number", 50), game_profile.get("max_star", 12))
+        state.extend(draw_history)
+        return state
+
+    @property
+    def size(self) -> int:
+        return len(self.history)
+
+    def push(self, draw: Dict) -> None:
+        index = len(self.history)
+        self.history.append(draw)
+        for key in ("numbers", "stars"):
+            table = self._tables[key]
+            counts, last, longest, seen = table["counts"], table["last"], table["longest"], table["seen"]
+            # Same canonical form as DrawHistory: distinct values, ascending.
+            for value in sorted(set(draw.get(key, []))):
+                if not counts[value]:
+                    table["order"].append(value)
+                counts[value] += 1
+                run = index - last[value] - 1
+                if run > longest[value]:
+                    longest[value] = run
+                last[value] = index
+                seen[value] += 1
+
+    def extend(self, draws: Iterable[Dict]) -> None:
+        for draw in draws:
+            self.push(draw)
+
+    def copy(self) -> "FeatureState":
+        clone = FeatureState(self.max_number, self.max_star)
+        clone.history = self.history.copy()
+        clone._tables = {
+            key: {name: list(values) for name, values in table.items()} for key, table in self._tables.items()
+        }
+        return clone
+
+    def _gap_tables(self) -> Dict[str, Dict[str, Dict[int, object]]]:
+        size = self.size
+        tables = {}
+        for key, table in self._tables.items():
+            pool = len(table["counts"]) - 1
+            current = [size - 1 - last for last in table["last"]]
+            tables[key] = {
+                "current": {v: current[v] for v in range(1, pool + 1)},
+                "max": {v: max(table["longest"][v], current[v]) for v in range(1, pool + 1)},
+                "mean": {v: round((size - table["seen"][v]) / (table["seen"][v] + 1), 2) for v in range(1, pool + 1)},
+            }
+        return tables
+
+    def features(self, sections: Iterable[str] | None = None, window_size: int = 5,
+                 max_windows: int | None = None) -> Dict:
+        """Same contract as ``prepare_features`` for the accumulated history."""
+
+        selected = FEATURE_SECTIONS if sections is None else tuple(sections)
+        features: Dict[str, object] = {}
+        if "frequencies" in selected:
+            features["global_frequencies"] = {
+                key: Counter({value: table["counts"][value] for value in table["order"]})
+                for key, table in self._tables.items()
+            }
+        if "gaps" in selected:
+            features["gaps"] = _gap_section(self._gap_tables())
+        if "windows" in selected:
+            if max_windows is None:
+                game_profile = {"max_number": self.max_number, "max_star": self.max_star}
+                features["windows"] = prepare_features(game_profile, self.history, window_size, sections=["windows"])["windows"]
+            else:
+                features["windows"] = _truncated_windows(self.history, window_size, max_windows)
+        return features
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"max_number": self.max_number, "max_star": self.max_star, "size": self.size, "tables": self._tables}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object], history: DrawHistory) -> "FeatureState":
+        """Rebuild a persisted state on top of the history prefix it describes."""
+
+        state = cls(int(data["max_number"]), int(data["max_star"]))
+        if int(data["size"]) != len(history):
+            raise ValueError("persisted feature state does not match the history length")
+        tables = data["tables"]
+        for key, table in state._tables.items():
+            for name in table:
+                values = list(tables[key][name])
+                if name != "order" and len(values) != len(table[name]):
+                    raise ValueError("persisted feature state does not match the game profile")
+                table[name] = values
+        state.history = history
+        return state
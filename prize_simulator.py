@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+
+from grid_codec import subset_masks
+from match_index import CHUNK_CELLS, TIER_LABELS, grid_masks, tier_matrix
+from prize_tiers import prize_tier
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional accelerator
+    np = None
+
+# Random draws per chunk; a chunk's seed only depends on the run seed and its index.
+CHUNK_SIZE = 1 << 16
+
+Grid = Tuple[Sequence[int], Sequence[int]]
+
+
+def _chunk_seed(seed: int, chunk: int) -> int:
+    return seed * 1_000_003 + chunk
+
+
+def default_workers() -> int:
+    """Process count for prize simulations, from ``SIMULATION_WORKERS`` (1 = in-process)."""
+
+    try:
+        workers = int(os.environ.get("SIMULATION_WORKERS", "1"))
+    except ValueError:
+        return 1
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+@lru_cache(maxsize=4)
+def _all_masks(pool: int, pick: int) -> "np.ndarray":
+    """Bitmask of every ``pick``-subset of ``1..pool``, indexed by combinadic rank."""
+
+    return subset_masks(np.arange(comb(pool, pick)), pool, pick)
+
+
+def _numpy_chunk(masks: Tuple[List[int], List[int]], profile: Tuple[int, int, int, int], rows: int,
+                 seed: int) -> Tuple[List[int], int]:
+    max_number, numbers_to_pick, max_star, stars_to_pick = profile
+    numbers_table = _all_masks(max_number, numbers_to_pick)
+    stars_table = _all_masks(max_star, stars_to_pick).astype(np.uint16)
+    rng = np.random.default_rng(seed)
+    # A uniform rank is a uniform subset: one table lookup per simulated draw.
+    draw_numbers = numbers_table[rng.integers(0, len(numbers_table), rows)]
+    draw_stars = stars_table[rng.integers(0, len(stars_table), rows)]
+
+    grid_numbers = np.asarray(masks[0], dtype=np.uint64)
+    grid_stars = np.asarray(masks[1], dtype=np.uint16)
+    counts = np.zeros(len(TIER_LABELS), dtype=np.int64)
+    won = np.zeros(rows, dtype=bool)
+    block = max(1, CHUNK_CELLS // rows)
+    for start in range(0, len(grid_numbers), block):
+        ranks = tier_matrix(grid_numbers[start:start + block], grid_stars[start:start + block], draw_numbers, draw_stars)
+        counts += np.bincount(ranks.ravel(), minlength=len(TIER_LABELS))
+        won |= ranks.any(axis=0)
+    return counts.tolist(), int(won.sum())
+
+
+def _python_chunk(masks: Tuple[List[int], List[int]], profile: Tuple[int, int, int, int], rows: int,
+                  seed: int) -> Tuple[List[int], int]:
+    max_number, numbers_to_pick, max_star, stars_to_pick = profile
+    rng = random.Random(seed)
+    numbers_range, stars_range = range(max_number), range(max_star)
+    grids = list(zip(*masks))
+    counts = [0] * len(TIER_LABELS)
+    won = 0
+    for _ in range(rows):
+        draw_numbers = sum(1 << value for value in rng.sample(numbers_range, numbers_to_pick))
+        draw_stars = sum(1 << value for value in rng.sample(stars_range, stars_to_pick))
+        hit = False
+        for numbers, stars in grids:
+            rank = prize_tier((numbers & draw_numbers).bit_count(), (stars & draw_stars).bit_count())
+            if rank:
+                counts[rank] += 1
+                hit = True
+        won += hit
+    return counts, won
+
+
+def _run_chunks(masks: Tuple[List[int], List[int]], profile: Tuple[int, int, int, int], seed: int,
+                chunks: List[Tuple[int, int]]) -> Tuple[List[int], int]:
+    run = _numpy_chunk if np is not None else _python_chunk
+    counts = [0] * len(TIER_LABELS)
+    won = 0
+    for index, rows in chunks:
+        chunk_counts, chunk_won = run(masks, profile, rows, _chunk_seed(seed, index))
+        counts = [total + value for total, value in zip(counts, chunk_counts)]
+        won += chunk_won
+    return counts, won
+
+
+def simulate_prizes(grids: Sequence[Grid], game_profile: Dict, *, draws: int, seed: int | None = None,
+                    workers: int = 1, chunk_size: int = CHUNK_SIZE) -> Dict[str, object]:
+    """Play a ticket set against ``draws`` uniformly random draws and count the prize tiers hit.
+
+    Draws are sampled by chunks (a uniform combinadic rank per draw, mapped to
+    its bitmask) and matched against every grid with the AND + popcount kernel
+    of ``match_index``.  A chunk's seed only depends on ``seed`` and its index,
+    so a seeded run gives the same counts whatever the number of ``workers``;
+    with ``workers > 1`` (capped by the CPU count) chunk ranges go to a
+    ``ProcessPoolExecutor``.  Without a seed, one is drawn and reported.
+    """
+
+    if draws < 1:
+        raise ValueError("draws must be positive")
+    if not grids:
+        raise ValueError("at least one grid is required")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    profile = (
+        game_profile.get("max_number", 50),
+        game_profile.get("numbers_to_pick", 5),
+        game_profile.get("max_star", 12),
+        game_profile.get("stars_to_pick", 2),
+    )
+    masks = grid_masks(grids, profile[0], profile[2])
+    started = time.perf_counter()
+    chunks = [(index, min(chunk_size, draws - start)) for index, start in enumerate(range(0, draws, chunk_size))]
+    # Extra processes beyond the cores or the chunks only add start-up cost.
+    workers = max(1, min(workers, len(chunks), os.cpu_count() or 1))
+
+    if workers == 1:
+        parts = [_run_chunks(masks, profile, seed, chunks)]
+    else:
+        step = math.ceil(len(chunks) / workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_chunks, masks, profile, seed, chunks[i:i + step])
+                for i in range(0, len(chunks), step)
+            ]
+            parts = [future.result() for future in futures]
+
+    counts = [sum(values) for values in zip(*(part_counts for part_counts, _ in parts))]
+    winning_draws = sum(won for _, won in parts)
+    elapsed = time.perf_counter() - started
+    plays = draws * len(grids)
+    return {
+        "grids": len(grids),
+        "draws": draws,
+        "seed": seed,
+        "workers": workers,
+        "tiers": {
+            TIER_LABELS[rank]: {"count": count, "probability": count / plays}
+            for rank, count in enumerate(counts)
+            if rank
+        },
+        "winning_plays": sum(counts[1:]),
+        "winning_draws": winning_draws,
+        "elapsed": elapsed,
+        "draws_per_second": draws / elapsed if elapsed else float(draws),
+    }
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+# EuroMillions prize ranks, from the jackpot (rank 1) down to rank 13, keyed
+# by (matched numbers, matched stars).
+EUROMILLIONS_TIERS: Dict[Tuple[int, int], int] = {
+    (5, 2): 1,
+    (5, 1): 2,
+    (5, 0): 3,
+    (4, 2): 4,
+    (4, 1): 5,
+    (3, 2): 6,
+    (4, 0): 7,
+    (2, 2): 8,
+    (3, 1): 9,
+    (3, 0): 10,
+    (1, 2): 11,
+    (2, 1): 12,
+    (2, 0): 13,
+}
+
+
+def prize_tier(matched_numbers: int, matched_stars: int) -> int | None:
+    """Prize rank of a grid matching that many numbers and stars, if any."""
+
+    return EUROMILLIONS_TIERS.get((matched_numbers, matched_stars))
+
+
+def tier_label(matched_numbers: int, matched_stars: int) -> str:
+    return f"{matched_numbers}+{matched_stars}"
+
+
+def tier_labels() -> List[str]:
+    """Labels of the winning combinations, best rank first."""
+
+    ordered = sorted(EUROMILLIONS_TIERS.items(), key=lambda item: item[1])
+    return [tier_label(*match) for match, _ in ordered]
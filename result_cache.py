@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a time-to-live per entry."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "bypassed": 0}
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """Cache sized by ``RESULT_CACHE_SIZE`` (0 disables it) and ``RESULT_CACHE_TTL`` seconds."""
+
+        try:
+            maxsize = int(os.environ.get("RESULT_CACHE_SIZE", "256"))
+            ttl = float(os.environ.get("RESULT_CACHE_TTL", "300"))
+        except ValueError:
+            maxsize, ttl = 256, 300.0
+        return cls(maxsize, ttl)
+
+    def get(self, key: Hashable) -> object | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: Hashable, value: object) -> None:
+        if self.maxsize < 1:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get_or_compute(self, key: Hashable | None, compute: Callable[[], object]) -> object:
+        """Return the cached value for ``key`` or compute and store it (``key=None`` bypasses the cache)."""
+
+        if key is None:
+            with self._lock:
+                self._counters["bypassed"] += 1
+            return compute()
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def result_key(strategy: str, game_profile: Dict, fingerprint: str, options: Dict[str, object]) -> Tuple[str, ...]:
+    """Cache key of a strategy run: profile, history fingerprint and every option."""
+
+    return (
+        strategy,
+        json.dumps(game_profile, sort_keys=True),
+        fingerprint,
+        json.dumps(options, sort_keys=True, default=str),
+    )
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Schema of the optional SQLite backend.  Draw values are kept as compact JSON
+# arrays; rows are ordered by their autoincrement id, which preserves the
+# ingestion order exposed by the JSON backend.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manual_draws (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game TEXT NOT NULL,
+    numbers TEXT NOT NULL,
+    stars TEXT NOT NULL,
+    draw_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_manual_draws_game_date ON manual_draws (game, draw_date);
+CREATE TABLE IF NOT EXISTS training_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT NOT NULL,
+    source TEXT,
+    note TEXT,
+    triggered_at TEXT
+);
+CREATE TABLE IF NOT EXISTS kv_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS game_versions (
+    game TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    rewritten_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_INIT_LOCK = threading.Lock()
+_initialized: set[str] = set()
+
+# Long-lived per-thread connection for ``generation``, which runs on every
+# cached read: a query on an open connection costs far less than a connect.
+_reader = threading.local()
+
+
+def sqlite_enabled() -> bool:
+    """True when ``STORAGE_BACKEND=sqlite`` selects this backend (JSON is the default)."""
+
+    backend = os.environ.get("STORAGE_BACKEND", "json").strip().lower()
+    if backend not in {"json", "sqlite"}:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+    return backend == "sqlite"
+
+
+def database_path() -> Path:
+    override = os.environ.get("SQLITE_DB_PATH")
+    if override:
+        return Path(override)
+    return Path(__file__).parent / "data" / "euromillions.sqlite3"
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    path = database_path()
+    key = str(path.resolve())
+    if key not in _initialized:
+        with _INIT_LOCK:
+            if key not in _initialized:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(path)
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                finally:
+                    conn.close()
+                _initialized.add(key)
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("PRAGMA synchronous=NORMAL")
+        yield conn
+    finally:
+        conn.close()
+
+
+def _bump_generation(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "INSERT INTO store_meta (key, value) VALUES ('generation', 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+    )
+
+
+def _bump_game_version(conn: sqlite3.Connection, game: str, *, rewrite: bool) -> None:
+    conn.execute(
+        "INSERT INTO game_versions (game, version, rewritten_at) VALUES (?, 1, ?) "
+        "ON CONFLICT(game) DO UPDATE SET version = version + 1, "
+        "rewritten_at = CASE WHEN ? THEN version + 1 ELSE rewritten_at END",
+        (game, 1 if rewrite else 0, 1 if rewrite else 0),
+    )
+
+
+def load_versions() -> Dict[str, Dict[str, int]]:
+    with _connect() as conn:
+        rows = conn.execute("SELECT game, version, rewritten_at FROM game_versions").fetchall()
+    return {game: {"version": version, "rewritten_at": rewritten_at} for game, version, rewritten_at in rows}
+
+
+def _reader_connection() -> sqlite3.Connection:
+    key = (os.getpid(), str(database_path()))
+    conn = getattr(_reader, "conn", None)
+    if conn is None or _reader.key != key:
+        if conn is not None and _reader.key[0] == os.getpid():
+            conn.close()
+        with _connect():
+            pass  # creates the schema on first use
+        conn = sqlite3.connect(key[1], timeout=30)
+        _reader.conn, _reader.key = conn, key
+    return conn
+
+
+def generation() -> int:
+    """Counter bumped by every draw write, used to version caches across workers."""
+
+    row = _reader_connection().execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _row_to_draw(numbers: str, stars: str, draw_date: str | None) -> Dict[str, object]:
+    draw: Dict[str, object] = {"numbers": json.loads(numbers), "stars": json.loads(stars)}
+    if draw_date:
+        draw["draw_date"] = draw_date
+    return draw
+
+
+def _draw_rows(game: str, draws: List[Dict[str, object]]) -> Iterator[tuple]:
+    for draw in draws:
+        yield (
+            game,
+            json.dumps(list(draw.get("numbers", [])), separators=(",", ":")),
+            json.dumps(list(draw.get("stars", [])), separators=(",", ":")),
+            draw.get("draw_date") or None,
+        )
+
+
+def load_store() -> Dict[str, List[Dict[str, object]]]:
+    store: Dict[str, List[Dict[str, object]]] = {}
+    with _connect() as conn:
+        rows = conn.execute("SELECT game, numbers, stars, draw_date FROM manual_draws ORDER BY id")
+        for game, numbers, stars, draw_date in rows:
+            store.setdefault(game, []).append(_row_to_draw(numbers, stars, draw_date))
+    return store
+
+
+def get_draws(game: str) -> List[Dict[str, object]]:
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT numbers, stars, draw_date FROM manual_draws WHERE game = ? ORDER BY id", (game,)
+        ).fetchall()
+    return [_row_to_draw(*row) for row in rows]
+
+
+def count_draws(game: str) -> int:
+    with _connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM manual_draws WHERE game = ?", (game,)).fetchone()[0]
+
+
+def apply_mutation(op: str, game: str, draws: List[Dict[str, object]] | None = None) -> None:
+    """Apply an append/replace/clear mutation in a single transaction."""
+
+    with _connect() as conn:
+        with conn:
+            if op in {"replace", "clear"}:
+                conn.execute("DELETE FROM manual_draws WHERE game = ?", (game,))
+            if op in {"append", "replace"} and draws:
+                conn.executemany(
+                    "INSERT INTO manual_draws (game, numbers, stars, draw_date) VALUES (?, ?, ?, ?)",
+                    _draw_rows(game, draws),
+                )
+            _bump_game_version(conn, game, rewrite=op != "append")
+            _bump_generation(conn)
+
+
+def save_store(store: Dict[str, List[Dict[str, object]]]) -> None:
+    with _connect() as conn:
+        with conn:
+            games = {row[0] for row in conn.execute("SELECT game FROM game_versions")} | set(store)
+            conn.execute("DELETE FROM manual_draws")
+            for game in games:
+                _bump_game_version(conn, game, rewrite=True)
+            for game, draws in store.items():
+                conn.executemany(
+                    "INSERT INTO manual_draws (game, numbers, stars, draw_date) VALUES (?, ?, ?, ?)",
+                    _draw_rows(game, draws),
+                )
+            _bump_generation(conn)
+
+
+def summarize() -> Dict[str, Dict[str, object]]:
+    """Draw count and last draw date per game, including games left empty (known from ``game_versions``)."""
+
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT game, COUNT(*), MAX(draw_date) FROM manual_draws GROUP BY game"
+        ).fetchall()
+        games = [row[0] for row in conn.execute("SELECT game FROM game_versions")]
+    summary: Dict[str, Dict[str, object]] = {game: {"stored": 0, "last_draw_date": None} for game in games}
+    summary.update({game: {"stored": count, "last_draw_date": last} for game, count, last in rows})
+    return summary
+
+
+def vacuum() -> Dict[str, int]:
+    """Checkpoint the WAL and rebuild the database file."""
+
+    before = size_bytes()
+    with _connect() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        stored = conn.execute("SELECT COUNT(*) FROM manual_draws").fetchone()[0]
+    return {"reclaimed_bytes": max(before - size_bytes(), 0), "size_bytes": size_bytes(), "stored": stored}
+
+
+def size_bytes() -> int:
+    total = 0
+    path = database_path()
+    for candidate in (path, path.with_name(path.name + "-wal")):
+        try:
+            total += candidate.stat().st_size
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def load_training_runs() -> List[Dict[str, object]]:
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT mode, source, note, triggered_at FROM training_runs ORDER BY id"
+        ).fetchall()
+    return [
+        {"mode": mode, "source": source, "note": note, "triggered_at": triggered_at}
+        for mode, source, note, triggered_at in rows
+    ]
+
+
+def save_training_runs(runs: List[Dict[str, object]]) -> None:
+    with _connect() as conn:
+        with conn:
+            conn.execute("DELETE FROM training_runs")
+            conn.executemany(
+                "INSERT INTO training_runs (mode, source, note, triggered_at) VALUES (?, ?, ?, ?)",
+                [
+                    (run.get("mode"), run.get("source"), run.get("note"), run.get("triggered_at"))
+                    for run in runs
+                    if isinstance(run, dict)
+                ],
+            )
+
+
+def insert_training_run(run: Dict[str, object]) -> None:
+    with _connect() as conn:
+        with conn:
+            conn.execute(
+                "INSERT INTO training_runs (mode, source, note, triggered_at) VALUES (?, ?, ?, ?)",
+                (run.get("mode"), run.get("source"), run.get("note"), run.get("triggered_at")),
+            )
+
+
+def load_state(key: str) -> Dict[str, object] | None:
+    with _connect() as conn:
+        row = conn.execute("SELECT value FROM kv_state WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    try:
+        value = json.loads(row[0])
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def save_state(key: str, value: Dict[str, object]) -> None:
+    payload = json.dumps(value, ensure_ascii=False)
+    with _connect() as conn:
+        with conn:
+            conn.execute(
+                "INSERT INTO kv_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, payload),
+            )
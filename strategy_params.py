@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from itertools import product
+from typing import Dict, Iterable, List
+
+from ml_strategies.fibo import FIBO_INTERVALS
+from ml_strategies.mcc import WINDOW
+from ml_strategies.spectre import LONG_WINDOW, SHORT_WINDOW
+
+# Tunable parameters per strategy, with the values used when none are stored.
+DEFAULT_PARAMS: Dict[str, Dict[str, object]] = {
+    "fibo": {"intervals": list(FIBO_INTERVALS)},
+    "mcc": {"window": WINDOW},
+    "spectre": {"short_window": SHORT_WINDOW, "long_window": LONG_WINDOW},
+}
+
+
+def _positive_int(name: str, value: object) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
+def validate_params(strategy: str, params: Dict[str, object]) -> Dict[str, object]:
+    """Check a (possibly partial) parameter set and return it merged with the defaults."""
+
+    defaults = DEFAULT_PARAMS.get(strategy)
+    if defaults is None:
+        raise ValueError(f"strategy {strategy} has no tunable parameters")
+    unknown = sorted(set(params) - set(defaults))
+    if unknown:
+        raise ValueError(f"unknown parameters for {strategy}: {', '.join(unknown)}")
+    merged = {**defaults, **params}
+    if strategy == "fibo":
+        intervals = merged["intervals"]
+        if not isinstance(intervals, (list, tuple)) or not intervals:
+            raise ValueError("intervals must be a non-empty list")
+        merged["intervals"] = sorted({_positive_int("intervals", value) for value in intervals})
+    else:
+        for name in defaults:
+            merged[name] = _positive_int(name, merged[name])
+    if strategy == "spectre" and merged["short_window"] >= merged["long_window"]:
+        raise ValueError("short_window must be below long_window")
+    return merged
+
+
+def active_params(stored: Dict[str, Dict[str, object]], strategy: str) -> Dict[str, object]:
+    """Stored parameters of a strategy over its defaults (empty for non-tunable strategies)."""
+
+    if strategy not in DEFAULT_PARAMS:
+        return {}
+    try:
+        return validate_params(strategy, dict(stored.get(strategy) or {}))
+    except ValueError:
+        return dict(DEFAULT_PARAMS[strategy])
+
+
+def expand_grid(strategy: str, grid: Dict[str, Iterable[object]]) -> List[Dict[str, object]]:
+    """Cartesian product of the candidate values, skipping invalid combinations."""
+
+    if not grid:
+        raise ValueError("empty parameter grid")
+    names = sorted(grid)
+    configs = []
+    for values in product(*(list(grid[name]) for name in names)):
+        try:
+            configs.append(validate_params(strategy, dict(zip(names, values))))
+        except ValueError:
+            if set(names) - set(DEFAULT_PARAMS.get(strategy, {})):
+                raise
+    if not configs:
+        raise ValueError("no valid configuration in the parameter grid")
+    return configs
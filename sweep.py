@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+from backtest import default_workers, evaluate_prefixes, summarize_outcomes
+from draw_history import DrawHistory
+from history_stats import HistoryStats
+
+# Read-only statistics installed once per worker process by ``_init_worker``.
+_WORKER_STATS: HistoryStats | None = None
+
+
+def _init_worker(history: DrawHistory) -> None:
+    global _WORKER_STATS
+    _WORKER_STATS = HistoryStats(history)
+
+
+def _evaluate_config(strategy: Callable, game_profile: Dict, params: Dict[str, object], start: int,
+                     options: Dict[str, object], stats: HistoryStats | None = None) -> Dict[str, object]:
+    stats = stats or _WORKER_STATS
+    outcomes = evaluate_prefixes(strategy, game_profile, stats, range(start, len(stats)), {**options, **params})
+    report = summarize_outcomes(outcomes)
+    return {
+        "params": params,
+        "score": round(report["average_numbers"] + report["average_stars"], 4),
+        **report,
+    }
+
+
+def run_sweep(strategy: Callable, game_profile: Dict, draw_history: Iterable[Dict],
+              configs: List[Dict[str, object]], *, start: int = 1, workers: int | None = None,
+              options: Dict[str, object] | None = None) -> Dict[str, object]:
+    """Backtest every parameter set in ``configs`` and rank them.
+
+    A configuration's score is its mean number of matched numbers plus
+    matched stars per evaluated draw; ties keep the grid order.  The history
+    is indexed once per process (``HistoryStats`` prefix counts) and reused
+    by every configuration evaluated there.
+    """
+
+    history = DrawHistory.from_draws(
+        draw_history, game_profile.get("max_number", 50), game_profile.get("max_star", 12)
+    )
+    if not configs:
+        raise ValueError("no configuration to evaluate")
+    if not 1 <= start < len(history):
+        raise ValueError("start must leave at least one draw to evaluate")
+    options = dict(options or {})
+    started = time.perf_counter()
+
+    workers = max(1, min(default_workers() if workers is None else workers, len(configs)))
+    if workers == 1:
+        stats = HistoryStats(history)
+        results = [_evaluate_config(strategy, game_profile, params, start, options, stats) for params in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(history,)) as executor:
+            futures = [
+                executor.submit(_evaluate_config, strategy, game_profile, params, start, options)
+                for params in configs
+            ]
+            results = [future.result() for future in futures]
+
+    ranked = sorted(range(len(results)), key=lambda index: (-results[index]["score"], index))
+    return {
+        "configurations": len(results),
+        "workers": workers,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "best": results[ranked[0]],
+        "results": [results[index] for index in ranked],
+    }
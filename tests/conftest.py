@@ -1,6 +1,21 @@
 import os
+import random
 import sys
+from datetime import date, timedelta
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+
+def random_draws(count, seed, start=None):
+    """Reproducible Euromillions draws (sorted values), dated every 3 days from ``start`` when given."""
+
+    rng = random.Random(seed)
+    draws = []
+    for i in range(count):
+        draw = {"numbers": sorted(rng.sample(range(1, 51), 5)), "stars": sorted(rng.sample(range(1, 13), 2))}
+        if start is not None:
+            draw["draw_date"] = (start + timedelta(days=3 * i)).isoformat()
+        draws.append(draw)
+    return draws
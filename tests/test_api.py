@@ -42,6 +42,7 @@ def test_frequency_strategy_route_returns_expected_keys():
         "method_used",
         "explanation",
         "features",
+        "grids",
     }
     assert data["method_used"] == "frequency"
     default_profile = GAME_PROFILES["euromillion"]
@@ -57,6 +58,22 @@ def test_random_strategy_route_returns_sorted_values():
     assert data["stars"] == sorted(data["stars"])
 
 
+def test_random_strategy_draws_distinct_reproducible_grids():
+    payload = {**build_payload(), "count": 2000, "seed": 42}
+    first = client.post("/api/generate/random", json=payload).json()
+    again = client.post("/api/generate/random", json=payload).json()
+
+    grids = first["grids"]
+    assert len(grids) == 2000
+    assert len({(tuple(g["numbers"]), tuple(g["stars"])) for g in grids}) == 2000
+    assert all(g["numbers"] == sorted(g["numbers"]) and 1 <= g["numbers"][0] and g["numbers"][-1] <= 50 for g in grids)
+    assert grids == again["grids"]
+    assert [first["numbers"], first["stars"]] == [grids[0]["numbers"], grids[0]["stars"]]
+
+    assert client.post("/api/generate/frequency", json={**build_payload(), "count": 3}).status_code == 422
+    assert client.post("/api/generate/random", json={**build_payload(), "count": 0}).status_code == 422
+
+
 def test_fibo_mcc_spectre_and_meta_ia_routes():
     for strategy in ["fibo", "mcc", "spectre", "meta_ia"]:
         response = client.post(f"/api/generate/{strategy}", json=build_payload())
@@ -151,3 +168,249 @@ def test_health_exposes_games_and_strategies():
     assert {"frequency", "random", "fibo", "mcc", "spectre", "meta_ia"}.issubset(
         set(data["strategies"])
     )
+
+
+def test_feature_sections_can_be_selected_and_truncated():
+    payload = {**build_payload(), "features": ["gaps", "windows"], "window_size": 3, "max_windows": 2}
+    response = client.post("/api/generate/frequency", json=payload)
+    assert response.status_code == 200
+    features = response.json()["features"]
+    assert set(features) == {"gaps", "windows"}
+    assert features["windows"]["numbers"] == [[1, 2, 3], [2, 3, 4]]
+    assert len(features["windows"]["stars"]) == 2
+
+    none = client.post("/api/generate/frequency", json={**build_payload(), "features": "none"})
+    assert none.json()["features"] == {}
+
+    invalid = client.post("/api/generate/frequency", json={**build_payload(), "features": ["bogus"]})
+    assert invalid.status_code == 422
+    assert "Section de features inconnue" in invalid.json()["detail"]
+
+
+def test_batch_runs_every_strategy_on_one_validated_history(monkeypatch):
+    import main
+
+    validations = []
+    original = main._validate_history
+    monkeypatch.setattr(main, "_validate_history", lambda *args: validations.append(1) or original(*args))
+
+    response = client.post("/api/generate/batch", json={**build_payload(), "strategies": "all"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["method_used"] for item in results] == sorted(main.STRATEGIES)
+    assert validations == [1]
+    single = client.post("/api/generate/spectre", json=build_payload()).json()
+    assert next(item for item in results if item["method_used"] == "spectre") == single
+
+    subset = client.post("/api/generate/batch", json={**build_payload(), "strategies": ["mcc", "fibo", "mcc"]})
+    assert [item["method_used"] for item in subset.json()["results"]] == ["mcc", "fibo"]
+    unknown = client.post("/api/generate/batch", json={**build_payload(), "strategies": ["mcc", "nope"]})
+    assert unknown.status_code == 404
+
+    def failing(*args):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(main, "_run_strategy", failing)
+    impossible = client.post("/api/generate/batch", json={**build_payload(), "strategies": ["mcc"]})
+    assert impossible.status_code == 422
+    assert impossible.json()["detail"] == "Génération impossible : boom"
+
+
+def test_mcc_simulation_returns_top_distinct_grids():
+    payload = {**build_payload(), "count": 5, "simulations": 20000, "seed": 7}
+    response = client.post("/api/generate/mcc", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    grids = data["grids"]
+    assert len({(tuple(g["numbers"]), tuple(g["stars"])) for g in grids}) == 5
+    assert [data["numbers"], data["stars"]] == [grids[0]["numbers"], grids[0]["stars"]]
+    # Values absent from the history carry the highest inverse-frequency weight.
+    assert not set(data["numbers"]) & {1, 2, 3, 4, 5, 6, 7}
+    assert "20000 grilles simulées" in data["explanation"]
+    assert client.post("/api/generate/mcc", json=payload).json()["grids"] == grids
+
+    assert client.post("/api/generate/mcc", json={**build_payload(), "simulations": 0}).status_code == 422
+
+
+def test_meta_ia_weighted_members_and_timeout(monkeypatch):
+    import threading
+
+    from ml_strategies import meta_ia
+
+    weighted = client.post(
+        "/api/generate/meta_ia", json={**build_payload(), "members": {"frequency": 3, "spectre": 1}}
+    ).json()
+    frequency = client.post("/api/generate/frequency", json=build_payload()).json()
+    assert set(weighted["numbers"]) == set(frequency["numbers"])
+    assert "FREQUENCY (3)" in weighted["explanation"]
+
+    release = threading.Event()
+    slow_spectre = meta_ia.MEMBER_STRATEGIES["spectre"]
+    monkeypatch.setitem(
+        meta_ia.MEMBER_STRATEGIES, "spectre", lambda *args, **kwargs: release.wait(5) and slow_spectre(*args, **kwargs)
+    )
+    response = client.post(
+        "/api/generate/meta_ia",
+        json={**build_payload(), "members": {"fibo": 1, "spectre": 1}, "member_timeout_ms": 50},
+    )
+    release.set()
+    assert response.status_code == 200
+    assert "Membres écartés" in response.json()["explanation"]
+    assert "SPECTRE" in response.json()["explanation"].split("écartés")[1]
+
+    unknown = client.post("/api/generate/meta_ia", json={**build_payload(), "members": {"oracle": 1}})
+    assert unknown.status_code == 422
+
+
+def test_meta_ia_gives_members_the_time_left_and_logs_failures(monkeypatch, caplog):
+    from ml_strategies import meta_ia
+
+    budgets = []
+    real_mcc = meta_ia.MEMBER_STRATEGIES["mcc"]
+
+    def mcc_member(game_profile, draw_history, simulations=None, time_budget=None):
+        budgets.append(time_budget)
+        return real_mcc(game_profile, draw_history, simulations=simulations, time_budget=time_budget)
+
+    def broken_member(*args, **kwargs):
+        raise RuntimeError("membre en panne")
+
+    monkeypatch.setitem(meta_ia.MEMBER_STRATEGIES, "mcc", mcc_member)
+    monkeypatch.setitem(meta_ia.MEMBER_STRATEGIES, "fibo", broken_member)
+    profile = GAME_PROFILES["euromillion"]
+    result = meta_ia.run_strategy(profile, build_payload()["draws"], simulations=500,
+                                  members={"mcc": 1, "fibo": 1}, member_timeout=5)
+
+    assert len(budgets) == 1 and 0 < budgets[0] <= 5
+    assert "FIBO" in result["explanation"].split("écartés")[1]
+    assert any("fibo" in record.getMessage() and record.exc_info for record in caplog.records)
+
+
+def test_top_grids_rank_the_whole_grid_space():
+    response = client.post("/api/generate/frequency/top", json=build_payload(), params={"k": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["space"] == 139_838_160
+    assert data["grids"][0] == {"numbers": [2, 3, 4, 5, 6], "stars": [2, 3], "score": 17.0}
+    scores = [grid["score"] for grid in data["grids"]]
+    assert len(scores) == 3 and scores == sorted(scores, reverse=True)
+
+    seeded = {**build_payload(), "seed": 4}
+    first = client.post("/api/generate/random/top", json=seeded, params={"k": 5}).json()["grids"]
+    assert client.post("/api/generate/random/top", json=seeded, params={"k": 5}).json()["grids"] == first
+    assert client.post("/api/generate/frequency/top", json=build_payload(), params={"k": 0}).status_code == 422
+    assert client.post("/api/generate/nope/top", json=build_payload(), params={"k": 1}).status_code == 404
+
+
+def test_prize_simulation_from_grids_or_strategy():
+    response = client.post(
+        "/api/simulate/prizes",
+        json={"grids": [{"numbers": [5, 4, 3, 2, 1], "stars": [1, 2]}], "simulated_draws": 50_000, "seed": 1},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["draws"] == 50_000 and data["grids"] == 1 and data["draws_per_second"] > 0
+    assert "tickets" not in data
+
+    generated = client.post(
+        "/api/simulate/prizes",
+        json={**build_payload(), "strategy": "random", "count": 3, "seed": 2, "simulated_draws": 10_000},
+    ).json()
+    assert generated["grids"] == 3 and len(generated["tickets"]) == 3
+    assert client.post("/api/simulate/prizes", json={"simulated_draws": 10}).status_code == 422
+    assert client.post(
+        "/api/simulate/prizes", json={**build_payload(), "strategy": "nope", "simulated_draws": 10}
+    ).status_code == 404
+    too_heavy = client.post(
+        "/api/simulate/prizes", json={**build_payload(), "strategy": "random", "count": 100, "simulated_draws": 50_000_000}
+    )
+    assert too_heavy.status_code == 422
+    invalid = client.post(
+        "/api/simulate/prizes", json={"grids": [{"numbers": [1, 2, 3, 4, 4], "stars": [1, 2]}], "simulated_draws": 10}
+    )
+    assert invalid.status_code == 422
+
+
+def test_history_handle_replaces_uploaded_draws(monkeypatch, tmp_path):
+    import main
+    from history_handles import HistoryHandles
+
+    monkeypatch.setattr(main, "HISTORY_HANDLES", HistoryHandles(4, tmp_path))
+    upload = client.post("/api/histories", json=build_payload())
+    assert upload.status_code == 200
+    handle = upload.json()
+    assert handle["draws"] == 3
+    assert client.post("/api/histories", json=build_payload()).json()["history_id"] == handle["history_id"]
+
+    validations = []
+    original = main._validate_draws
+    monkeypatch.setattr(main, "_validate_draws", lambda *args: validations.append(1) or original(*args))
+    by_handle = client.post("/api/generate/spectre", json={"draws": [], "history_id": handle["history_id"]})
+    assert by_handle.status_code == 200
+    assert validations == []
+    assert by_handle.json() == client.post("/api/generate/spectre", json=build_payload()).json()
+
+    extra = {"numbers": [4, 5, 6, 7, 8], "stars": [4, 5]}
+    extended = client.post("/api/generate/frequency", json={"draws": [extra], "history_id": handle["history_id"]})
+    full = {"draws": build_payload()["draws"] + [extra]}
+    assert extended.json() == client.post("/api/generate/frequency", json=full).json()
+
+    unknown = client.post("/api/generate/spectre", json={"draws": [], "history_id": "0" * 32})
+    assert unknown.status_code == 404
+    malformed = client.post("/api/generate/spectre", json={"draws": [], "history_id": "../manual_draws"})
+    assert malformed.status_code == 422
+    wrong_game = client.post(
+        "/api/generate/spectre", json={"draws": [], "game": "eurodream", "history_id": handle["history_id"]}
+    )
+    assert wrong_game.status_code == 422
+
+
+def test_manual_store_delta_against_base_version(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    base = build_payload()["draws"]
+    assert client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": base}).status_code == 200
+    version = client.get("/api/admin/manual-draws/euromillion", params={"weekday": None}).json()["version"]
+
+    validated = []
+    original = main._validate_draws
+    monkeypatch.setattr(
+        main, "_validate_draws", lambda draws, profile: validated.append(len(draws)) or original(draws, profile)
+    )
+    delta = [{"numbers": [4, 5, 6, 7, 8], "stars": [4, 5]}]
+    request = {"draws": delta, "use_manual_draws": True, "base_version": version}
+    response = client.post("/api/generate/frequency", json=request)
+    assert response.status_code == 200
+    assert validated == [1]
+    assert response.json() == client.post("/api/generate/frequency", json={"draws": base + delta}).json()
+
+    assert client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": delta}).status_code == 200
+    stale = client.post("/api/generate/frequency", json=request)
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["current_version"] == version + 1
+    invalid = client.post("/api/generate/frequency", json={"draws": delta, "base_version": version})
+    assert invalid.status_code == 422
+
+
+def test_stored_draws_are_trusted_and_payload_dates_checked(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    stored = build_payload()["draws"]
+    assert client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": stored}).status_code == 200
+
+    validated = []
+    original = main._validate_draws
+    monkeypatch.setattr(
+        main, "_validate_draws", lambda draws, profile: validated.append(len(draws)) or original(draws, profile)
+    )
+    extra = {"numbers": [4, 5, 6, 7, 8], "stars": [4, 5]}
+    response = client.post("/api/generate/frequency", json={"draws": [extra], "use_manual_draws": True})
+    assert response.status_code == 200
+    assert validated == [1]
+
+    bad_date = {**extra, "draw_date": "2024-02-30"}
+    rejected = client.post("/api/generate/frequency", json={"draws": [bad_date], "use_manual_draws": True})
+    assert rejected.status_code == 422
+    assert rejected.json()["detail"] == "Date de tirage invalide : format attendu YYYY-MM-DD."
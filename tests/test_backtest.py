@@ -0,0 +1,48 @@
+
+from fastapi.testclient import TestClient
+
+import backtest
+import ml_strategies
+from backtest import run_backtest
+from conftest import random_draws
+from main import app
+from prize_tiers import prize_tier
+
+PROFILE = {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}
+
+
+def test_walk_forward_matches_running_each_prefix_from_scratch(monkeypatch):
+    draws = random_draws(160, 9)
+    for strategy in [ml_strategies.frequency_strategy, ml_strategies.fibo_strategy, ml_strategies.spectre_strategy]:
+        report = run_backtest(strategy, PROFILE, draws, start=5, workers=1, details=True)
+        expected = []
+        for t in range(5, len(draws)):
+            result = strategy(PROFILE, draws[:t])
+            expected.append(
+                (len(set(result["numbers"]) & set(draws[t]["numbers"])), len(set(result["stars"]) & set(draws[t]["stars"])))
+            )
+        assert [(r["matched_numbers"], r["matched_stars"]) for r in report["results"]] == expected
+        assert report["winning_draws"] == sum(prize_tier(*match) is not None for match in expected)
+
+    monkeypatch.setattr(backtest, "MIN_DRAWS_PER_WORKER", 50)
+    serial = run_backtest(ml_strategies.spectre_strategy, PROFILE, draws, workers=1, details=True)
+    parallel = run_backtest(ml_strategies.spectre_strategy, PROFILE, draws, workers=2, details=True)
+    assert parallel["workers"] == 2
+    assert parallel["results"] == serial["results"]
+
+
+def test_backtest_route_reports_prize_tiers():
+    client = TestClient(app)
+    payload = {"draws": random_draws(60, 9), "start": 10, "seed": 4}
+
+    response = client.post("/api/backtest/mcc", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["strategy"] == "mcc"
+    assert data["draws_tested"] == 50
+    assert sum(data["matched_numbers"].values()) == 50
+    assert list(data["tiers"])[:2] == ["5+2", "5+1"]
+    assert client.post("/api/backtest/mcc", json=payload).json()["tiers"] == data["tiers"]
+
+    assert client.post("/api/backtest/inconnue", json=payload).status_code == 404
+    assert client.post("/api/backtest/mcc", json={**payload, "start": 60}).status_code == 422
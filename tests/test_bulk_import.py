@@ -0,0 +1,82 @@
+import json
+
+import bulk_import
+from bulk_import import PARSE, UNKNOWN_GAME, import_archive, parse_rows
+from data_store import get_cooccurrence, get_draws
+from draw_validation import DATE, DUPLICATE
+
+PROFILES = {"euromillion": {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}}
+
+
+def test_csv_layouts_parse_line_by_line():
+    lines = iter([
+        "game,draw_date,numbers,stars\n",
+        "euromillion,2024-01-02,1-2-3-4-5,1 2\n",
+        "\n",
+        'euromillion,,"6,7,8,9,10",3;4\n',
+        "euromillion,,1-x-3-4-5,1 2\n",
+    ])
+    rows = list(parse_rows(lines, "csv"))
+    assert rows[0] == (2, "euromillion", {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-01-02"}, None)
+    assert rows[1][:3] == (4, "euromillion", {"numbers": [6, 7, 8, 9, 10], "stars": [3, 4]})
+    assert rows[2][0] == 5 and rows[2][3]
+
+    columns = ["n1,n2,n3,n4,n5,s1,s2\n", "5,4,3,2,1,2,1\n"]
+    assert list(parse_rows(columns, "csv", "euromillion")) == [
+        (2, "euromillion", {"numbers": [5, 4, 3, 2, 1], "stars": [2, 1]}, None)
+    ]
+
+
+def test_ndjson_rejects_non_integer_values():
+    lines = [
+        json.dumps({"game": "euromillion", "numbers": [1, 2, 3, 4, 5.7], "stars": [1, 2]}),
+        json.dumps({"game": "euromillion", "numbers": [1, 2, 3, 4, 5], "stars": [True, 2]}),
+        json.dumps({"game": "euromillion", "numbers": [1, 2, 3, 4, "5"], "stars": [1, 2]}),
+        json.dumps({"game": "euromillion", "numbers": "1-2-3-4-5", "stars": [1, 2]}),
+    ]
+    rows = list(parse_rows(lines, "ndjson"))
+    assert [row[0] for row in rows if row[3]] == [1, 2, 3]
+    assert rows[3][2] == {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}
+
+
+def test_import_commits_batches_and_reports_bad_rows(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    records = [{"numbers": [i % 40 + value for value in range(1, 6)], "stars": [1, 2]} for i in range(25)]
+    records[3]["numbers"] = [1, 1, 2, 3, 4]
+    records[7]["draw_date"] = "2024-02-30"
+    lines = [json.dumps({"game": "euromillion", **record}) + "\n" for record in records]
+    lines[10] = "{not json\n"
+    lines[12] = json.dumps({"game": "lotto", **records[12]}) + "\n"
+
+    commits = []
+    original = bulk_import.commit_batch
+    monkeypatch.setattr(
+        bulk_import, "commit_batch", lambda game, draws, **kw: commits.append(len(draws)) or original(game, draws, **kw)
+    )
+    report = import_archive(iter(lines), fmt="ndjson", game_profiles=PROFILES, batch_size=10)
+
+    assert (report["rows"], report["imported"], report["rejected"]) == (25, 21, 4)
+    assert [(error["line"], error["reason"]) for error in report["errors"]] == [
+        (4, DUPLICATE), (8, DATE), (11, PARSE), (13, UNKNOWN_GAME)
+    ]
+    assert commits == [8, 10, 3] and report["batches"] == 3
+    assert report["rows_per_second"] > 0
+    assert len(get_draws("euromillion")) == 21
+    assert len(get_cooccurrence("euromillion")) == 21
+
+    replaced = import_archive(iter(lines[:2]), fmt="ndjson", game_profiles=PROFILES, replace=True)
+    assert replaced["games"] == {"euromillion": 2}
+    assert len(get_draws("euromillion")) == 2
+
+
+def test_cli_imports_a_file(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    archive = tmp_path / "archive.csv"
+    archive.write_text("draw_date,numbers,stars\n2024-01-02,1 2 3 4 5,1 2\n2024-01-05,1 2 3 4 60,1 2\n", encoding="utf-8")
+
+    assert bulk_import.main([str(archive), "--game", "euromillion"]) == 0
+    captured = capsys.readouterr()
+    assert "2 rows, 1 imported, 1 rejected" in captured.out
+    assert "rows/s" in captured.out
+    assert "line 3" in captured.err
+    assert get_draws("euromillion") == [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-01-02"}]
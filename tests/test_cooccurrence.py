@@ -0,0 +1,64 @@
+from collections import Counter
+from datetime import date
+from itertools import combinations
+
+from conftest import random_draws
+from cooccurrence import BLOCK_SIZE, Cooccurrence, pair_rank, top_pairs, top_triplets, triplet_rank
+from draw_history import DrawHistory
+
+
+def _brute_force(draws):
+    pairs, star_pairs, triplets = Counter(), Counter(), Counter()
+    for draw in draws:
+        pairs.update(combinations(draw["numbers"], 2))
+        star_pairs.update(combinations(draw["stars"], 2))
+        triplets.update(combinations(draw["numbers"], 3))
+    return pairs, star_pairs, triplets
+
+
+def _assert_counts(counts, draws):
+    pairs, star_pairs, triplets = _brute_force(draws)
+    assert {pair: pairs[pair] for pair in pairs} == {
+        pair: counts[0][pair_rank(*pair)] for pair in combinations(range(1, 51), 2) if counts[0][pair_rank(*pair)]
+    }
+    assert all(counts[1][pair_rank(*pair)] == star_pairs[pair] for pair in combinations(range(1, 13), 2))
+    assert counts[2] == {triplet_rank(*triplet): count for triplet, count in triplets.items()}
+
+
+def test_incremental_counts_match_brute_force_on_any_range():
+    draws = random_draws(3 * BLOCK_SIZE + 17, 5, date(2015, 1, 2))
+    state = Cooccurrence()
+    for start in range(0, len(draws), 100):
+        state.extend(DrawHistory.from_draws(draws[start:start + 100]))
+
+    assert len(state) == len(draws)
+    _assert_counts(state.counts(), draws)
+    for start, stop in ((0, 10), (3, BLOCK_SIZE + 40), (BLOCK_SIZE - 1, 3 * BLOCK_SIZE + 2), (BLOCK_SIZE, 2 * BLOCK_SIZE)):
+        _assert_counts(state.counts(start, stop), draws[start:stop])
+
+    (pairs, _, triplets), matched = state.date_range(draws[300]["draw_date"], draws[700]["draw_date"])
+    assert matched == 401
+    _assert_counts((pairs, _, triplets), draws[300:701])
+
+    expected_pairs, _, expected_triplets = _brute_force(draws)
+    assert top_pairs(state.pairs, 1)[0][1] == max(expected_pairs.values())
+    assert top_triplets(state.counts()[2], 1)[0][1] == max(expected_triplets.values())
+
+
+def test_binary_round_trip_and_unsorted_dates():
+    draws = random_draws(BLOCK_SIZE + 30, 8, date(2015, 1, 2))
+    draws[0], draws[-1] = draws[-1], draws[0]  # out of date order
+    draws.append({"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]})  # undated
+    state = Cooccurrence.from_history(DrawHistory.from_draws(draws))
+
+    data = state.to_bytes()
+    restored = Cooccurrence.from_bytes(data)
+    assert len(data) < 45_000
+    assert restored.to_bytes() == data
+    _assert_counts(restored.counts(10, len(draws)), draws[10:])
+
+    dated = sorted(draws[:-1], key=lambda draw: draw["draw_date"])
+    counts, matched = restored.date_range(dated[20]["draw_date"], None)
+    assert matched == len(dated) - 20
+    _assert_counts(counts, dated[20:])
+    assert restored.date_range()[1] == len(draws)
@@ -0,0 +1,202 @@
+import json
+
+import data_store
+
+
+def _draw(offset: int, draw_date: str | None = None):
+    draw = {"numbers": [offset + i for i in range(1, 6)], "stars": [1, 2]}
+    if draw_date:
+        draw["draw_date"] = draw_date
+    return draw
+
+
+def test_appends_go_to_log_without_rewriting_snapshot(monkeypatch, tmp_path):
+    store_path = tmp_path / "manual_draws.json"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(store_path))
+
+    data_store.persist_draws("EUROMILLION", [_draw(i % 40) for i in range(200)])
+    snapshot_before = store_path.read_text(encoding="utf-8")
+
+    assert data_store.append_draws("euromillion", [_draw(3, "2024-07-02")]) == 201
+    assert store_path.read_text(encoding="utf-8") == snapshot_before
+
+    log_lines = (tmp_path / "manual_draws.json.log").read_text(encoding="utf-8").splitlines()
+    assert json.loads(log_lines[-1])["op"] == "append"
+    assert data_store.get_draws("euromillion")[-1]["draw_date"] == "2024-07-02"
+    assert data_store.summarize_store()["euromillion"]["stored"] == 201
+
+
+def test_log_replay_handles_replace_clear_and_torn_lines(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    monkeypatch.setattr(data_store, "COMPACTION_RATIO", 1000)
+
+    data_store.persist_draws("euromillion", [_draw(0)])
+    data_store.persist_draws("eurodream", [_draw(1)])
+    data_store.persist_draws("euromillion", [_draw(2)], replace=True)
+    assert data_store.clear_draws("eurodream") is True
+    with (tmp_path / "manual_draws.json.log").open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "append", "game": "euromi')
+
+    assert data_store.export_store() == {"euromillion": [_draw(2)]}
+
+    report = data_store.compact_store()
+    assert report["stored"] == 1
+    assert not (tmp_path / "manual_draws.json.log").exists()
+    saved = json.loads((tmp_path / "manual_draws.json").read_text(encoding="utf-8"))
+    assert saved["euromillion"] == [_draw(2)]
+    assert saved["_meta"]["versions"]["euromillion"] == {"version": 2, "rewritten_at": 2}
+    assert data_store.get_store_version("eurodream") == {"version": 2, "rewritten_at": 2}
+
+
+def test_compaction_interrupted_before_the_log_reset_does_not_replay_it_twice(monkeypatch, tmp_path):
+    store_path = tmp_path / "manual_draws.json"
+    log_path = tmp_path / "manual_draws.json.log"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(store_path))
+    monkeypatch.setattr(data_store, "COMPACTION_RATIO", 1000)
+    data_store.persist_draws("euromillion", [_draw(0)])
+    data_store.append_draws("euromillion", [_draw(1)])
+    # A torn line left by a writer that died mid-append.
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "append", "game": "euromi')
+
+    # Crash after the snapshot was written but before the log was removed.
+    folded_log = log_path.read_text(encoding="utf-8")
+    data_store.compact_store()
+    log_path.write_text(folded_log, encoding="utf-8")
+    data_store._invalidate_cache()
+    assert data_store.get_draws("euromillion") == [_draw(0), _draw(1)]
+
+    assert data_store.append_draws("euromillion", [_draw(2)]) == 3
+    data_store._invalidate_cache()
+    assert data_store.get_draws("euromillion") == [_draw(0), _draw(1), _draw(2)]
+    assert data_store.get_store_version("euromillion")["version"] == 3
+
+
+def test_append_after_a_torn_line_keeps_the_new_record(monkeypatch, tmp_path):
+    log_path = tmp_path / "manual_draws.json.log"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    monkeypatch.setattr(data_store, "COMPACTION_RATIO", 1000)
+    data_store.persist_draws("euromillion", [_draw(0)])
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "append", "game": "euromi')
+
+    data_store.append_draws("euromillion", [_draw(1)])
+    data_store._invalidate_cache()
+    assert data_store.get_draws("euromillion") == [_draw(0), _draw(1)]
+    assert all(json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines())
+
+
+def test_reads_hit_cache_until_another_writer_changes_the_file(monkeypatch, tmp_path):
+    store_path = tmp_path / "manual_draws.json"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(store_path))
+    data_store.persist_draws("euromillion", [_draw(0), _draw(1)])
+
+    before = data_store.cache_stats()
+    for _ in range(5):
+        assert len(data_store.get_draws("euromillion")) == 2
+    data_store.summarize_store()
+    after = data_store.cache_stats()
+    assert after["hits"] - before["hits"] == 6
+    assert after["misses"] == before["misses"]
+
+    # Simulate another worker appending to the shared log.
+    with (tmp_path / "manual_draws.json.log").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"op": "append", "game": "euromillion", "draws": [_draw(9)]}) + "\n")
+
+    assert len(data_store.get_draws("euromillion")) == 3
+    assert data_store.cache_stats()["misses"] == after["misses"] + 1
+
+
+def test_get_draws_hands_out_copies_of_the_cached_store(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    data_store.persist_draws("euromillion", [_draw(0, "2024-01-02")])
+
+    draws = data_store.get_draws("euromillion")
+    draws[0]["numbers"].append(99)
+    draws[0]["draw_date"] = "1999-01-01"
+    assert data_store.get_draws("euromillion") == [_draw(0, "2024-01-02")]
+
+
+def test_feature_state_is_reused_incrementally_and_rebuilt_on_rewrite(monkeypatch, tmp_path):
+    import random
+
+    from draw_history import DrawHistory
+    from preparateur_donnees import FeatureState, prepare_features
+
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    rebuilds = []
+    original = FeatureState.from_history.__func__
+    monkeypatch.setattr(FeatureState, "from_history", classmethod(lambda cls, *a: rebuilds.append(1) or original(cls, *a)))
+    rng = random.Random(5)
+    draws = [{"numbers": rng.sample(range(1, 51), 5), "stars": rng.sample(range(1, 13), 2)} for _ in range(120)]
+    profile = {"max_number": 50, "max_star": 12}
+
+    data_store.persist_draws("euromillion", draws[:100])
+    state = data_store.get_feature_state("euromillion")
+    assert state.features() == prepare_features(profile, DrawHistory.for_profile(profile, draws[:100]))
+    assert len(rebuilds) == 1
+
+    data_store.append_draws("euromillion", draws[100:])
+    state = data_store.get_feature_state("euromillion")
+    expected = prepare_features(profile, DrawHistory.for_profile(profile, draws), sections=["frequencies", "gaps"])
+    assert state.features(["frequencies", "gaps"]) == expected
+    assert len(rebuilds) == 1
+
+    data_store.persist_draws("euromillion", draws[:10], replace=True)
+    state = data_store.get_feature_state("euromillion")
+    assert state.features(["gaps"]) == prepare_features(profile, draws[:10], sections=["gaps"])
+    assert len(rebuilds) == 2
+    saved = json.loads((tmp_path / "manual_draws.json.features.json").read_text(encoding="utf-8"))
+    assert saved["euromillion:50:12"]["size"] == 10
+
+
+def test_deduplicate_draws_keeps_first_grid_per_date(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    draws = [_draw(0, "2024-01-02"), _draw(1), _draw(0, "2024-01-02"), _draw(0, "2024-01-05"), _draw(1)]
+    data_store.persist_draws("euromillion", draws)
+    version = data_store.get_store_version("euromillion")
+
+    assert data_store.deduplicate_draws("euromillion") == {"rows": 5, "removed": 2}
+    assert data_store.get_draws("euromillion") == [draws[0], draws[1], draws[3]]
+    assert data_store.get_store_version("euromillion")["rewritten_at"] > version["rewritten_at"]
+    assert data_store.deduplicate_draws("euromillion") == {"rows": 3, "removed": 0}
+
+
+def test_strategy_params_are_parsed_again_only_when_the_file_changes(monkeypatch, tmp_path):
+    params_path = tmp_path / "strategy_params.json"
+    monkeypatch.setenv("STRATEGY_PARAMS_PATH", str(params_path))
+    assert data_store.load_strategy_params() == {}
+
+    data_store.save_strategy_params("mcc", {"window": 30})
+    reads = []
+    original = json.loads
+    monkeypatch.setattr(data_store.json, "loads", lambda text: reads.append(1) or original(text))
+    assert data_store.load_strategy_params() == {"mcc": {"window": 30}}
+    assert data_store.load_strategy_params() == {"mcc": {"window": 30}}
+    assert reads == [1]
+
+    data_store.save_strategy_params("fibo", {"intervals": [2]})
+    assert data_store.load_strategy_params()["fibo"] == {"intervals": [2]}
+
+
+def test_saved_feature_state_and_cooccurrence_are_checked_against_the_history(monkeypatch, tmp_path):
+    from cooccurrence import Cooccurrence
+    from draw_history import DrawHistory
+    from preparateur_donnees import prepare_features
+
+    store_path = tmp_path / "manual_draws.json"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(store_path))
+    profile = {"max_number": 50, "max_star": 12}
+    data_store.persist_draws("euromillion", [_draw(i) for i in range(20)])
+    data_store.get_feature_state("euromillion")
+    data_store.get_cooccurrence("euromillion")
+
+    # Same length and version counters, other draws: e.g. a snapshot restored by hand.
+    snapshot = json.loads(store_path.read_text(encoding="utf-8"))
+    snapshot["euromillion"] = [_draw(i + 20) for i in range(20)] + [_draw(1)]
+    store_path.write_text(json.dumps(snapshot), encoding="utf-8")
+    data_store._invalidate_cache()
+
+    expected = DrawHistory.for_profile(profile, snapshot["euromillion"])
+    assert data_store.get_feature_state("euromillion").features() == prepare_features(profile, expected)
+    assert data_store.get_cooccurrence("euromillion").counts() == Cooccurrence.from_history(expected).counts()
@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+
+import ml_strategies
+from conftest import random_draws
+from draw_history import DrawHistory, count_values
+from preparateur_donnees import calculate_frequencies, calculate_gaps, prepare_features
+
+PROFILE = {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}
+
+
+def test_history_round_trips_draws_and_slices():
+    draws = random_draws(30, 7)
+    draws[3]["draw_date"] = "2024-06-18"
+    history = DrawHistory.for_profile(PROFILE, draws)
+
+    assert len(history) == 30
+    assert history.to_dicts() == draws
+    assert history[-1] == draws[-1]
+    assert history[5:9].to_dicts() == draws[5:9]
+
+
+def test_rejected_draw_leaves_the_history_unchanged():
+    draws = random_draws(3, 7)
+    history = DrawHistory.for_profile(PROFILE, draws)
+    fingerprint = history.fingerprint()
+
+    bad_star = {"numbers": [1, 2, 3, 4, 5], "stars": [1, 13]}
+    bad_date = {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-13-01"}
+    for bad in (bad_star, bad_date):
+        with pytest.raises(ValueError):
+            history.append(bad)
+        with pytest.raises(ValueError):
+            history.extend(random_draws(2, 8) + [bad])
+    assert history.to_dicts() == draws
+    assert history.fingerprint() == fingerprint
+
+
+def test_unsorted_draws_are_canonicalized_for_features():
+    # Pinned behaviour: a history keeps values as sets, so windows and tied
+    # frequencies follow the sorted order, not the order the draws were typed in.
+    draws = [{"numbers": [9, 3, 7, 1, 5], "stars": [4, 2]}, {"numbers": [2, 8, 6, 4, 10], "stars": [3, 1]}]
+    canonical = [{"numbers": sorted(draw["numbers"]), "stars": sorted(draw["stars"])} for draw in draws]
+    history = DrawHistory.for_profile(PROFILE, draws)
+
+    assert history.to_dicts() == canonical
+    features = prepare_features(PROFILE, history)
+    assert features == prepare_features(PROFILE, canonical)
+    assert features["windows"]["numbers"][:2] == [[1, 3, 5, 7, 9], [3, 5, 7, 9, 2]]
+    assert list(features["global_frequencies"]["stars"]) == [2, 4, 1, 3]
+
+
+def test_counts_gaps_and_features_match_list_pipeline():
+    draws = random_draws(300, 7)
+    history = DrawHistory.for_profile(PROFILE, draws)
+
+    assert calculate_frequencies(history) == calculate_frequencies(draws)
+    assert list(calculate_frequencies(history)["numbers"]) == list(calculate_frequencies(draws)["numbers"])
+    assert calculate_gaps(history, PROFILE) == calculate_gaps(draws, PROFILE)
+    assert count_values(history, last=80) == count_values(draws, last=80)
+    assert prepare_features(PROFILE, history) == prepare_features(PROFILE, draws)
+
+    for name in ["frequency_strategy", "fibo_strategy", "mcc_strategy", "spectre_strategy", "meta_ia_strategy"]:
+        strategy = getattr(ml_strategies, name)
+        assert strategy(PROFILE, history) == strategy(PROFILE, draws)
+
+
+def test_history_is_an_order_of_magnitude_smaller_than_dicts():
+    draws = random_draws(1000, 7)
+    history = DrawHistory.for_profile(PROFILE, draws)
+    dict_bytes = sum(
+        sys.getsizeof(d) + sys.getsizeof(d["numbers"]) + sys.getsizeof(d["stars"]) for d in draws
+    )
+    assert history.nbytes * 10 < dict_bytes
+
+    large = DrawHistory.for_profile(PROFILE, random_draws(20_000, 3))
+    counts = large.counts()
+    assert sum(counts["numbers"].values()) == 100_000
+    assert sum(counts["stars"].values()) == 40_000
@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+import draw_validation
+from conftest import random_draws
+from draw_validation import DATE, DUPLICATE, NUMBER_RANGE, SHAPE, STAR_RANGE, VALUE_TYPE, first_invalid, invalid_draws
+
+PROFILE = {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}
+
+
+def _draws(count, seed):
+    # Column layout taken by the validators; every third draw is undated.
+    draws = random_draws(count, seed, date(2020, 1, 1))
+    return (
+        [draw["numbers"] for draw in draws],
+        [draw["stars"] for draw in draws],
+        [draw["draw_date"] if i % 3 else None for i, draw in enumerate(draws)],
+    )
+
+
+@pytest.mark.parametrize("engine_min_draws", [1, 10**9])
+def test_first_invalid_reports_the_first_failing_draw_and_check(monkeypatch, engine_min_draws):
+    monkeypatch.setattr(draw_validation, "NUMPY_MIN_DRAWS", engine_min_draws)
+    numbers, stars, dates = _draws(500, seed=3)
+    assert first_invalid(numbers, stars, dates, PROFILE) is None
+
+    cases = [
+        (lambda: numbers.__setitem__(400, [1, 2, 3, 4]), SHAPE),
+        (lambda: numbers.__setitem__(300, [7, 7, 8, 9, 10]), DUPLICATE),
+        (lambda: numbers.__setitem__(200, [1, 2, 3, 4, 51]), NUMBER_RANGE),
+        (lambda: stars.__setitem__(100, [0, 3]), STAR_RANGE),
+        (lambda: dates.__setitem__(50, "2020-13-01"), DATE),
+    ]
+    # Each new defect comes earlier in the history and becomes the one reported.
+    for (corrupt, reason), index in zip(cases, (400, 300, 200, 100, 50)):
+        corrupt()
+        assert first_invalid(numbers, stars, dates, PROFILE) == (index, reason)
+
+    # Within a draw, the checks apply in order: duplicates before ranges.
+    numbers[10] = [60, 60, 1, 2, 3]
+    assert first_invalid(numbers, stars, dates, PROFILE) == (10, DUPLICATE)
+
+
+@pytest.mark.parametrize("count", [3, 200])
+@pytest.mark.parametrize("bad_value", ["1", 1.5, True, None])
+def test_non_integer_values_are_rejected_above_and_below_the_numpy_threshold(count, bad_value):
+    numbers, stars, dates = _draws(count, seed=5)
+    numbers[1] = [bad_value, 20, 30, 40, 50]
+    stars[2] = [1, bad_value]
+    numbers[0] = [bad_value, 2, 3, 4]
+
+    assert invalid_draws(numbers, stars, dates, PROFILE) == [(0, SHAPE), (1, VALUE_TYPE), (2, VALUE_TYPE)]
@@ -0,0 +1,48 @@
+from itertools import combinations, product
+
+import grid_codec
+from grid_codec import (
+    decode_grid,
+    decode_grids,
+    difference_ranks,
+    encode_grid,
+    encode_grids,
+    first_occurrences,
+    grid_space,
+    intersect_ranks,
+    pack_ranks,
+    union_ranks,
+    unpack_ranks,
+)
+
+SMALL = {"max_number": 9, "numbers_to_pick": 3, "max_star": 5, "stars_to_pick": 2}
+
+
+def test_rank_is_a_bijection_with_matching_vectorized_codec(monkeypatch):
+    grids = [(list(n), list(s)) for n, s in product(combinations(range(1, 10), 3), combinations(range(1, 6), 2))]
+    ranks = [encode_grid(numbers, stars, SMALL) for numbers, stars in grids]
+    assert sorted(ranks) == list(range(grid_space(SMALL)))
+    assert [decode_grid(rank, SMALL) for rank in ranks] == grids
+    assert list(encode_grids([n for n, _ in grids], [s for _, s in grids], SMALL)) == ranks
+    assert [tuple(grid) for grid in decode_grids(ranks, SMALL)] == grids
+
+    assert encode_grid([50, 49, 48, 47, 46], [12, 11]) == grid_space({}) - 1 == 139_838_159
+    assert decode_grid(0) == ([1, 2, 3, 4, 5], [1, 2])
+    monkeypatch.setattr(grid_codec, "np", None)
+    assert encode_grids([n for n, _ in grids], [s for _, s in grids], SMALL) == ranks
+    for bad in ([1, 1, 2, 3, 4], [0, 1, 2, 3, 4], [1, 2, 3, 4]):
+        try:
+            encode_grid(bad, [1, 2])
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} accepted")
+
+
+def test_dedup_set_operations_and_packed_storage():
+    assert first_occurrences([7, 3, 7, 9, 3]) == [0, 1, 3]
+    assert first_occurrences([7, 7, 7], groups=[0, 1, 0]) == [0, 1]
+    assert union_ranks([5, 1, 5], [2]) == [1, 2, 5]
+    assert intersect_ranks([5, 1, 3], [3, 5, 8]) == [3, 5]
+    assert difference_ranks([5, 1, 3], [3]) == [1, 5]
+    packed = pack_ranks([0, 139_838_159, 42])
+    assert len(packed) == 12 and unpack_ranks(packed) == [0, 139_838_159, 42]
@@ -0,0 +1,38 @@
+from itertools import combinations, product
+
+import grid_ranking
+from grid_ranking import top_combinations, top_grids
+
+NUMBERS = [0.0] + [float((v * 7) % 5) for v in range(1, 13)]
+STARS = [0.0] + [float(v % 3) for v in range(1, 6)]
+
+
+def _brute_force(k):
+    grids = [
+        (list(numbers), list(stars), sum(NUMBERS[v] for v in numbers) + sum(STARS[v] for v in stars))
+        for numbers, stars in product(combinations(range(1, 13), 4), combinations(range(1, 6), 2))
+    ]
+    return sorted(grids, key=lambda grid: (-grid[2], grid[0], grid[1]))[:k]
+
+
+def test_top_grids_match_brute_force_with_ties(monkeypatch):
+    expected = _brute_force(60)
+    ranked = top_grids((NUMBERS, STARS), (4, 2), 60, workers=1, chunk_rows=7)
+
+    assert [(numbers, stars) for numbers, stars, _ in ranked["grids"]] == [(n, s) for n, s, _ in expected]
+    assert ranked["space"] == 4950
+    assert top_grids((NUMBERS, STARS), (4, 2), 60, workers=2)["grids"] == ranked["grids"]
+    # The pure-Python best-first engine returns the same ranking.
+    monkeypatch.setattr(grid_ranking, "np", None)
+    assert top_grids((NUMBERS, STARS), (4, 2), 60)["grids"] == ranked["grids"]
+
+
+def test_top_combinations_caps_k_and_rejects_bad_picks():
+    assert len(top_combinations(STARS, 2, 100)) == 10
+    assert top_combinations(STARS, 1, 2) == [(2.0, (2,)), (2.0, (5,))]
+    for pick in (0, 6):
+        try:
+            top_combinations(STARS, pick, 1)
+        except ValueError:
+            continue
+        raise AssertionError("invalid pick accepted")
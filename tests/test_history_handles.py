@@ -0,0 +1,66 @@
+import pytest
+
+from history_handles import HistoryHandles
+
+PROFILE = {"max_number": 50, "max_star": 12}
+
+
+def _draws(offset):
+    return [{"numbers": [start + i for i in range(1, 6)], "stars": [1, 2]} for start in range(offset, offset + 3)]
+
+
+def test_handles_are_bounded_and_survive_a_restart(tmp_path):
+    handles = HistoryHandles(2, tmp_path)
+    first, _ = handles.put("euromillion", PROFILE, _draws(0))
+    second, _ = handles.put("euromillion", PROFILE, _draws(10))
+    assert handles.put("EUROMILLION", PROFILE, _draws(0))[0] == first
+    assert handles.put("eurodream", PROFILE, _draws(0))[0] != first
+
+    # The least recently used handle is evicted, file included.
+    assert handles.get(second) is None
+    assert not (tmp_path / f"{second}.history.json").exists()
+    assert sorted(path.name.split(".")[0] for path in tmp_path.glob("*.json")) == sorted(handles._entries)
+
+    # Another worker (or a restart) sharing the directory loads handles from disk.
+    restarted = HistoryHandles(2, tmp_path)
+    game, state = restarted.get(first)
+    assert game == "euromillion"
+    assert state.history.to_dicts() == _draws(0)
+    assert restarted.stats()["loads"] == 1
+
+    # A file altered on disk no longer matches its handle.
+    path = tmp_path / f"{first}.history.json"
+    path.write_text(path.read_text().replace("[1,2]", "[1,3]", 1))
+    assert HistoryHandles(2, tmp_path).get(first) is None
+
+
+def test_workers_sharing_a_directory_see_each_others_handles(monkeypatch, tmp_path):
+    one, other = HistoryHandles(2, tmp_path), HistoryHandles(2, tmp_path)
+    first, _ = one.put("euromillion", PROFILE, _draws(0))
+    assert other.get(first)[1].history.to_dicts() == _draws(0)
+
+    # The other worker's newer handles push ``first`` out of the shared directory
+    # without breaking the copy the first worker still holds in memory.
+    other.put("euromillion", PROFILE, _draws(10))
+    other.put("euromillion", PROFILE, _draws(20))
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert not (tmp_path / f"{first}.history.json").exists()
+    assert one.get(first) is not None
+    assert HistoryHandles(2, tmp_path).get(first) is None
+
+    monkeypatch.delenv("HISTORY_HANDLES_PATH", raising=False)
+    assert HistoryHandles.from_env().directory is None
+
+
+def test_pruning_only_touches_handle_files_and_ids_are_checked(tmp_path):
+    (tmp_path / "manual_draws.json").write_text("{}", encoding="utf-8")
+    handles = HistoryHandles(1, tmp_path)
+    handles.put("euromillion", PROFILE, _draws(0))
+    handles.put("euromillion", PROFILE, _draws(10))
+    assert len(list(tmp_path.glob("*.history.json"))) == 1
+    assert (tmp_path / "manual_draws.json").read_text(encoding="utf-8") == "{}"
+
+    for history_id in ("../manual_draws", "manual_draws", "A" * 32):
+        assert handles.get(history_id) is None
+        with pytest.raises(ValueError):
+            handles._path(history_id)
@@ -0,0 +1,47 @@
+import ml_strategies
+from conftest import random_draws
+from draw_history import DrawHistory, count_values
+from history_stats import HistoryStats
+
+PROFILE = {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}
+
+
+def test_any_window_matches_a_direct_count():
+    draws = random_draws(400, 3)
+    history = DrawHistory.for_profile(PROFILE, draws)
+    stats = HistoryStats.from_history(PROFILE, history)
+
+    for last in [None, 1, 20, 80, 120, 1000]:
+        expected = count_values(draws, last=last)
+        assert stats.window(last=last) == expected
+        assert [list(counter) for counter in stats.window(last=last)] == [list(counter) for counter in expected]
+    assert stats.counts("numbers", 35, 90) == history.counts(35, 90)["numbers"]
+    assert stats.draw_values(-1) == (draws[-1]["numbers"], draws[-1]["stars"])
+    assert HistoryStats.from_history(PROFILE, stats) is stats
+
+
+def test_meta_ia_builds_statistics_once(monkeypatch):
+    draws = [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}, {"numbers": [2, 3, 4, 5, 6], "stars": [2, 3]}]
+    built = []
+    original = HistoryStats.__init__
+
+    def counting_init(self, history):
+        built.append(len(history))
+        original(self, history)
+
+    monkeypatch.setattr(HistoryStats, "__init__", counting_init)
+    result = ml_strategies.meta_ia_strategy(PROFILE, draws)
+
+    assert built == [2]
+    assert result["method_used"] == "meta_ia"
+
+
+def test_fingerprint_is_incremental_and_content_based():
+    draws = [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}, {"numbers": [6, 7, 8, 9, 10], "stars": [3, 4]}]
+    history = DrawHistory.for_profile(PROFILE, draws[:1])
+    history.append(draws[1])
+
+    assert history.fingerprint() == DrawHistory.for_profile(PROFILE, draws).fingerprint()
+    assert history[:1].fingerprint() == DrawHistory.for_profile(PROFILE, draws[:1]).fingerprint()
+    assert HistoryStats(history).prefix(1).fingerprint() == history[:1].fingerprint()
+    assert history.fingerprint() != DrawHistory.for_profile(PROFILE, draws[::-1]).fingerprint()
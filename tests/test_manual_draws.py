@@ -3,6 +3,8 @@ from pathlib import Path
 
 from fastapi.testclient import TestClient
 
+import data_store
+
 from main import app
 
 
@@ -156,3 +158,88 @@ def test_backup_and_training_status(monkeypatch, tmp_path):
     status_body = status.json()
     assert status_body["last_mode"] == "manual"
     assert status_body["runs"]
+
+
+def test_history_matches_reports_tiers_for_many_grids(monkeypatch, tmp_path):
+    
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    client = TestClient(app)
+    draws = [
+        {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-06-18"},
+        {"numbers": [1, 2, 3, 40, 41], "stars": [1, 9], "draw_date": "2024-06-21"},
+    ]
+    assert client.post("/api/history/matches", json={"grids": [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}]}).status_code == 404
+    client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": draws * 900})
+
+    response = client.post("/api/history/matches", json={"grids": [{"numbers": [5, 4, 3, 2, 1], "stars": [2, 1]}]})
+    assert response.status_code == 200
+    grid = response.json()["grids"][0]
+    assert grid["wins"] == 1800
+    assert grid["tiers"]["5+2"]["count"] == 900 and grid["tiers"]["5+2"]["dates"][0] == "2024-06-18"
+    assert grid["tiers"]["3+1"]["dates"][-1] == "2024-06-21"
+
+    grids = [{"numbers": [n, n + 1, n + 2, n + 3, n + 4], "stars": [1, 2]} for n in range(1, 46)] * 223
+    bulk = client.post("/api/history/matches", json={"grids": grids, "dates": False})
+    assert bulk.status_code == 200 and len(bulk.json()["grids"]) == 10_035
+    undated = {label: {"count": tier["count"]} for label, tier in grid["tiers"].items()}
+    assert bulk.json()["grids"][0] == {**grid, "tiers": undated}
+    assert client.post("/api/history/matches", json={"grids": [{"numbers": [1, 2], "stars": [1, 2]}]}).status_code == 422
+
+
+def test_cooccurrence_is_maintained_on_ingest_and_queryable_by_date(monkeypatch, tmp_path):
+    manual_store = tmp_path / "manual_draws.json"
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(manual_store))
+    client = TestClient(app)
+
+    first = {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-01-02"}
+    second = {"numbers": [1, 2, 3, 40, 50], "stars": [1, 2], "draw_date": "2024-02-02"}
+    assert client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": [first]}).status_code == 200
+    sidecar = tmp_path / "manual_draws.json.euromillion-50-12.cooc"
+    assert sidecar.exists()
+
+    def rebuild(history):
+        raise AssertionError("an append must not rebuild the counts")
+
+    monkeypatch.setattr(data_store.Cooccurrence, "from_history", rebuild)
+    # Nor read the whole history or the saved counts back: only the new draw is pushed.
+    monkeypatch.setattr(data_store, "_build_cooccurrence", rebuild)
+    assert client.post("/api/admin/manual-draws", json={"game": "euromillion", "draws": [second]}).status_code == 200
+
+    query = {"date_from": None, "date_to": None, "top": 1, "matrix": True}
+    response = client.get("/api/history/cooccurrence/euromillion", params=query)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["draws"] == 2
+    assert data["pairs"] == [{"numbers": [1, 2], "count": 2}]
+    assert data["star_pairs"] == [{"stars": [1, 2], "count": 2}]
+    assert data["triplets"] == [{"numbers": [1, 2, 3], "count": 2}]
+    assert data["matrix"]["numbers"][39][49] == data["matrix"]["numbers"][49][39] == 1
+    assert len(data["matrix"]["stars"]) == 12
+
+    ranged = client.get(
+        "/api/history/cooccurrence/euromillion", params={**query, "date_from": "2024-02-01", "matrix": False}
+    ).json()
+    assert ranged["draws"] == 1
+    assert "matrix" not in ranged
+
+    invalid = client.get("/api/history/cooccurrence/euromillion", params={**query, "date_to": "02/02/2024"})
+    assert invalid.status_code == 422
+
+
+def test_archive_import_endpoint_reports_rows_and_errors(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    monkeypatch.setenv("ADMIN_STATE_PATH", str(tmp_path / "admin_state.json"))
+    client = TestClient(app)
+    content = "game,draw_date,numbers,stars\neuromillion,2024-01-02,1-2-3-4-5,1-2\neuromillion,2024-01-05,1-2-3-4,1-2\n"
+
+    response = client.post("/api/admin/manual-draws/import", json={"content": content, "format": "csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["imported"], report["rejected"]) == (2, 1, 1)
+    assert report["errors"][0]["line"] == 3
+    assert report["errors"][0]["message"] == "Tirage invalide : nombre de numéros/étoiles incorrect."
+    assert "rows_per_second" in report
+    assert client.get("/api/admin/manual-draws/euromillion", params={"weekday": None}).json()["stored"] == 1
+
+    bad_format = client.post("/api/admin/manual-draws/import", json={"content": content, "format": "xml"})
+    assert bad_format.status_code == 422
@@ -0,0 +1,39 @@
+from datetime import date
+
+import match_index
+from conftest import random_draws
+from draw_history import DrawHistory
+from match_index import MatchIndex
+from prize_tiers import prize_tier, tier_label
+
+
+def _brute_force(draws, numbers, stars):
+    found = {}
+    for draw in draws:
+        matched = (len(set(numbers) & set(draw["numbers"])), len(set(stars) & set(draw["stars"])))
+        if prize_tier(*matched):
+            tier = found.setdefault((prize_tier(*matched), tier_label(*matched)), {"count": 0, "dates": []})
+            tier["count"] += 1
+            tier["dates"].append(draw["draw_date"])
+    return {label: tier for (_, label), tier in sorted(found.items())}
+
+
+def test_numpy_and_bit_sliced_engines_match_a_brute_force_scan(monkeypatch):
+    draws = random_draws(400, 1, date(2020, 1, 3))
+    grids = [(d["numbers"], d["stars"]) for d in random_draws(30, 2)] + [(draws[7]["numbers"], draws[7]["stars"])]
+    expected = [_brute_force(draws, numbers, stars) for numbers, stars in grids]
+
+    monkeypatch.setattr(match_index, "CHUNK_CELLS", 4_000)
+    results = MatchIndex(DrawHistory.from_draws(draws)).match(grids)
+    assert [result["tiers"] for result in results] == expected
+    assert results[-1]["tiers"]["5+2"] == {"count": 1, "dates": [draws[7]["draw_date"]]}
+    assert [result["wins"] for result in results] == [sum(t["count"] for t in e.values()) for e in expected]
+    counts = MatchIndex(DrawHistory.from_draws(draws)).match(grids, dates=False)
+    assert [result["tiers"] for result in counts] == [
+        {label: {"count": tier["count"]} for label, tier in e.items()} for e in expected
+    ]
+
+    monkeypatch.setattr(match_index, "np", None)
+    assert [result["tiers"] for result in MatchIndex(DrawHistory.from_draws(draws)).match(grids)] == expected
+    counts_only = MatchIndex(DrawHistory.from_draws(draws)).match(grids[:1], dates=False)[0]["tiers"]
+    assert all(set(tier) == {"count"} for tier in counts_only.values())
@@ -0,0 +1,35 @@
+import pytest
+
+from ml_strategies import mcc
+from ml_strategies.monte_carlo import simulate
+
+WEIGHTS = ([1.0 / (1 + (v % 4)) for v in range(1, 51)], [1.0 / (1 + (v % 3)) for v in range(1, 13)])
+
+
+def test_simulation_is_reproducible_across_workers_and_chunks():
+    single = simulate(WEIGHTS, (5, 2), simulations=12_000, top=4, seed=3, chunk_size=3_000)
+    split = simulate(WEIGHTS, (5, 2), simulations=12_000, top=4, seed=3, chunk_size=3_000, workers=2)
+
+    assert single["grids"] == split["grids"]
+    assert single["simulated"] == 12_000 and not single["truncated"]
+    scores = [score for _, _, score in single["grids"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_time_budget_stops_after_the_first_chunk():
+    result = simulate(WEIGHTS, (5, 2), simulations=50_000, top=1, seed=1, chunk_size=1_000, time_budget=0.0)
+
+    assert result["simulated"] == 1_000
+    assert result["truncated"]
+
+
+def test_mcc_returns_count_distinct_grids_or_raises():
+    # 6 grids of numbers x 2 stars: one round of 12 samples always holds duplicates.
+    profile = {"numbers_to_pick": 5, "stars_to_pick": 1, "max_number": 6, "max_star": 2}
+    result = mcc.run_strategy(profile, [], count=12, simulations=12, seed=4)
+    assert len({(tuple(grid["numbers"]), tuple(grid["stars"])) for grid in result["grids"]}) == 12
+
+    with pytest.raises(ValueError, match="possible grids"):
+        mcc.run_strategy(profile, [], count=13)
+    with pytest.raises(ValueError, match="time budget"):
+        mcc.run_strategy({**profile, "max_number": 50, "max_star": 12}, [], count=60_000, time_budget=0.0)
@@ -1,4 +1,9 @@
-from preparateur_donnees import calculate_frequencies, calculate_gaps, prepare_features
+from preparateur_donnees import (
+    calculate_frequencies,
+    calculate_gap_statistics,
+    calculate_gaps,
+    prepare_features,
+)
 
 
 def test_frequency_and_gaps_are_computed():
@@ -19,3 +24,69 @@ def test_frequency_and_gaps_are_computed():
     assert gaps["stars"][4] == 0  # 4 appears in last draw
     assert features["windows"]["numbers"]
     assert features["windows"]["stars"]
+
+
+def test_numpy_engine_matches_python_engine():
+    import random
+
+    import pytest
+
+    pytest.importorskip("numpy")
+    from draw_history import DrawHistory
+
+    rng = random.Random(11)
+    profile = {"max_number": 50, "max_star": 12}
+    draws = [
+        {"numbers": rng.sample(range(1, 51), 5), "stars": rng.sample(range(1, 13), 2)}
+        for _ in range(400)
+    ]
+    history = DrawHistory.from_draws(draws)
+
+    for source in (draws, history, draws[:3], []):
+        expected = prepare_features(profile, source, window_size=4, engine="python")
+        vectorized = prepare_features(profile, source, window_size=4, engine="numpy")
+        assert vectorized == expected
+        for section in ("numbers", "stars"):
+            assert list(vectorized["global_frequencies"][section].items()) == list(
+                expected["global_frequencies"][section].items()
+            )
+
+
+def test_gap_statistics_track_longest_and_mean_absence():
+    from draw_history import DrawHistory
+
+    draws = [
+        {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]},
+        {"numbers": [2, 3, 4, 5, 6], "stars": [2, 3]},
+        {"numbers": [3, 4, 5, 6, 7], "stars": [3, 4]},
+        {"numbers": [1, 3, 4, 5, 6], "stars": [1, 4]},
+    ]
+    profile = {"max_number": 8, "max_star": 4}
+
+    stats = calculate_gap_statistics(draws, profile)
+    assert stats["numbers"][1] == 0
+    assert stats["max"]["numbers"][1] == 2  # absent from draws 2 and 3
+    assert stats["max"]["numbers"][7] == 2  # absent before its only appearance
+    assert stats["max"]["numbers"][8] == 4  # never drawn
+    assert stats["mean"]["numbers"][3] == 0.0
+    assert stats["mean"]["numbers"][1] == round(2 / 3, 2)
+    assert stats["mean"]["numbers"][8] == 4.0
+    assert calculate_gap_statistics(DrawHistory.from_draws(draws, 8, 4), profile) == stats
+    assert prepare_features(profile, draws)["gaps"] == stats
+
+
+def test_truncated_windows_only_read_the_needed_draws():
+    from preparateur_donnees import iter_windows
+
+    def endless_draws():
+        n = 0
+        while True:
+            yield {"numbers": [n % 50 + 1], "stars": [1]}
+            n += 1
+
+    windows = iter_windows(endless_draws(), "numbers", 3)
+    assert [next(windows) for _ in range(2)] == [[1, 2, 3], [2, 3, 4]]
+
+    draws = [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}] * 4
+    features = prepare_features({"max_number": 5, "max_star": 2}, draws, sections=["windows"], max_windows=1)
+    assert features == {"windows": {"numbers": [[1, 2, 3, 4, 5]], "stars": [[1, 2, 1, 2, 1]]}}
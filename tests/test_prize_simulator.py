@@ -0,0 +1,34 @@
+from math import comb
+
+import prize_simulator
+from prize_simulator import simulate_prizes
+
+GRIDS = [([1, 2, 3, 4, 5], [1, 2]), ([10, 20, 30, 40, 50], [3, 4])]
+
+
+def _two_plus_zero_probability():
+    return comb(5, 2) * comb(45, 3) / comb(50, 5) * comb(10, 2) / comb(12, 2)
+
+
+def test_seeded_simulation_is_reproducible_across_workers_and_close_to_the_odds(monkeypatch):
+    monkeypatch.setattr(prize_simulator.os, "cpu_count", lambda: 2)
+    single = simulate_prizes(GRIDS, {}, draws=120_000, seed=5, chunk_size=40_000)
+    split = simulate_prizes(GRIDS, {}, draws=120_000, seed=5, chunk_size=40_000, workers=2)
+    assert split["workers"] == 2
+    assert simulate_prizes(GRIDS, {}, draws=1_000, seed=5, chunk_size=100, workers=64)["workers"] == 2
+
+    assert single["tiers"] == split["tiers"] and single["winning_draws"] == split["winning_draws"]
+    assert list(single["tiers"])[:2] == ["5+2", "5+1"] and len(single["tiers"]) == 13
+    assert abs(single["tiers"]["2+0"]["probability"] - _two_plus_zero_probability()) < 0.002
+    assert single["winning_plays"] == sum(tier["count"] for tier in single["tiers"].values())
+    assert single["winning_draws"] <= single["winning_plays"] and single["draws_per_second"] > 0
+
+
+def test_pure_python_sampler_reports_the_same_shape(monkeypatch):
+    monkeypatch.setattr(prize_simulator, "np", None)
+    report = simulate_prizes(GRIDS[:1], {}, draws=20_000, seed=3)
+
+    assert report["draws"] == 20_000 and report["grids"] == 1 and report["seed"] == 3
+    assert abs(report["tiers"]["2+0"]["probability"] - _two_plus_zero_probability()) < 0.01
+    assert report == {**simulate_prizes(GRIDS[:1], {}, draws=20_000, seed=3), "elapsed": report["elapsed"],
+                      "draws_per_second": report["draws_per_second"]}
@@ -0,0 +1,41 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from result_cache import ResultCache
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResultCache(maxsize=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None  # least recently used
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_generate_reuses_results_and_random_bypasses_unless_seeded(monkeypatch):
+    monkeypatch.setattr(main, "RESULT_CACHE", ResultCache(maxsize=16, ttl=60))
+    calls = []
+    original = main.STRATEGIES["spectre"]
+    monkeypatch.setitem(main.STRATEGIES, "spectre", lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+    client = TestClient(main.app)
+    payload = {"draws": [{"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}, {"numbers": [2, 3, 4, 5, 6], "stars": [2, 3]}]}
+
+    first = client.post("/api/generate/spectre", json=payload).json()
+    assert client.post("/api/generate/spectre", json=payload).json() == first
+    assert len(calls) == 1
+    client.post("/api/generate/spectre", json={"draws": payload["draws"][:1]})
+    assert len(calls) == 2
+
+    client.post("/api/generate/random", json=payload)
+    client.post("/api/generate/random", json=payload)
+    seeded = {**payload, "seed": 3}
+    assert client.post("/api/generate/random", json=seeded).json() == client.post("/api/generate/random", json=seeded).json()
+    stats = main.RESULT_CACHE.stats()
+    assert stats["bypassed"] == 2
+    assert stats["hits"] == 2
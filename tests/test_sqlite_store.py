@@ -0,0 +1,119 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def setup_sqlite(monkeypatch, tmp_path):
+    db_path = tmp_path / "store.sqlite3"
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(db_path))
+    return db_path
+
+
+def test_manual_draws_round_trip_through_sqlite(monkeypatch, tmp_path):
+    db_path = setup_sqlite(monkeypatch, tmp_path)
+    client = TestClient(app)
+
+    payload = {
+        "game": "EUROMILLION",
+        "draws": [
+            {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-06-18"},
+            {"numbers": [6, 7, 8, 9, 10], "stars": [3, 4], "draw_date": "2024-06-21"},
+        ],
+    }
+    assert client.post("/api/admin/manual-draws", json=payload).json()["stored"] == 2
+    more = {"game": "euromillion", "draws": [{"numbers": [11, 12, 13, 14, 15], "stars": [5, 6]}]}
+    assert client.post("/api/admin/manual-draws", json=more).json()["stored"] == 3
+
+    listing = client.get("/api/admin/manual-draws/euromillion", params={"weekday": "friday"}).json()
+    assert listing["draws"] == [{"numbers": [6, 7, 8, 9, 10], "stars": [3, 4], "draw_date": "2024-06-21"}]
+
+    summary = client.get("/api/admin/manual-draws").json()
+    entry = next(item for item in summary["games"] if item["game"] == "euromillion")
+    assert entry == {"game": "euromillion", "stored": 3, "last_draw_date": "2024-06-21"}
+
+    assert client.delete("/api/admin/manual-draws/euromillion").json()["cleared"] is True
+    assert client.get("/api/admin/manual-draws/euromillion").json()["stored"] == 0
+
+    vacuum = client.post("/api/admin/db/vacuum").json()
+    assert vacuum["backend"] == "sqlite"
+    assert vacuum["stored"] == 0
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(manual_draws)")}
+        assert "idx_manual_draws_game_date" in indexes
+    finally:
+        conn.close()
+    assert not (tmp_path / "manual_draws.json").exists()
+
+
+def test_training_runs_and_admin_state_in_sqlite(monkeypatch, tmp_path):
+    setup_sqlite(monkeypatch, tmp_path)
+    client = TestClient(app)
+
+    client.post("/api/admin/train", json={"mode": "auto", "source": "cron"})
+    status = client.get("/api/admin/train").json()
+    assert status["last_mode"] == "auto"
+    assert status["runs"][0]["source"] == "cron"
+
+    model = client.get("/api/admin/ai/models").json()[0]
+    client.post("/api/admin/ai/model/delete", json={"model": model})
+    assert model not in client.get("/api/admin/ai/models").json()
+    rows = client.get("/api/admin/db/table/training_runs").json()["rows"]
+    assert rows[0]["mode"] == "auto"
+
+
+def test_sqlite_reads_one_game_through_the_index_and_takes_no_json_lock(monkeypatch, tmp_path):
+    import data_store
+    import sqlite_store
+
+    setup_sqlite(monkeypatch, tmp_path)
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    draw = {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2], "draw_date": "2024-06-18"}
+    data_store.persist_draws("euromillion", [draw, dict(draw, draw_date="2024-06-21")])
+    data_store.persist_draws("eurodream", [{"numbers": [1, 2, 3, 4, 5, 6], "stars": [1]}])
+    data_store.clear_draws("eurodream")
+
+    def full_scan():
+        raise AssertionError("per-game reads must not load every game")
+
+    monkeypatch.setattr(sqlite_store, "load_store", full_scan)
+    assert len(data_store.get_history("euromillion")) == 2
+    assert data_store.get_feature_state("euromillion").size == 2
+    assert len(data_store.get_cooccurrence("euromillion")) == 2
+    assert data_store.deduplicate_draws("euromillion")["removed"] == 0
+    assert not (tmp_path / "manual_draws.json.lock").exists()
+
+    sqlite_summary = data_store.summarize_store()
+    assert sqlite_summary["eurodream"] == {"stored": 0, "last_draw_date": None}
+
+    monkeypatch.setenv("STORAGE_BACKEND", "json")
+    data_store.persist_draws("euromillion", [draw, dict(draw, draw_date="2024-06-21")])
+    data_store.persist_draws("eurodream", [{"numbers": [1, 2, 3, 4, 5, 6], "stars": [1]}])
+    data_store.clear_draws("eurodream")
+    assert data_store.summarize_store() == sqlite_summary
+
+
+def test_cached_sqlite_reads_open_no_connection(monkeypatch, tmp_path):
+    import data_store
+    import sqlite_store
+
+    setup_sqlite(monkeypatch, tmp_path)
+    draw = {"numbers": [1, 2, 3, 4, 5], "stars": [1, 2]}
+    data_store.persist_draws("euromillion", [draw])
+    assert len(data_store.get_draws("euromillion")) == 1
+
+    connects = []
+    original = sqlite3.connect
+    monkeypatch.setattr(sqlite_store.sqlite3, "connect", lambda *a, **k: connects.append(1) or original(*a, **k))
+    for _ in range(5):
+        assert len(data_store.get_draws("euromillion")) == 1
+    assert connects == []
+
+    # A write from another worker still shows up on the next read.
+    sqlite_store.apply_mutation("append", "euromillion", [draw])
+    assert len(data_store.get_draws("euromillion")) == 2
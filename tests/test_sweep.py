@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+import ml_strategies
+from conftest import random_draws
+from main import app
+from strategy_params import expand_grid
+from sweep import run_sweep
+
+PROFILE = {"numbers_to_pick": 5, "stars_to_pick": 2, "max_number": 50, "max_star": 12}
+
+
+def test_sweep_ranks_configs_identically_in_parallel():
+    configs = expand_grid("spectre", {"short_window": [5, 10, 40], "long_window": [20, 60]})
+    # (40, 20) is dropped: short_window must stay below long_window.
+    assert len(configs) == 5
+
+    draws = random_draws(120, 21)
+    serial = run_sweep(ml_strategies.spectre_strategy, PROFILE, draws, configs, start=10, workers=1)
+    parallel = run_sweep(ml_strategies.spectre_strategy, PROFILE, draws, configs, start=10, workers=2)
+
+    assert parallel["workers"] == 2
+    assert [r["params"] for r in parallel["results"]] == [r["params"] for r in serial["results"]]
+    scores = [r["score"] for r in serial["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert serial["best"]["draws_tested"] == 110
+
+
+def test_sweep_route_stores_the_winner_as_active_params(monkeypatch, tmp_path):
+    monkeypatch.setenv("MANUAL_DRAWS_PATH", str(tmp_path / "manual_draws.json"))
+    monkeypatch.setenv("STRATEGY_PARAMS_PATH", str(tmp_path / "strategy_params.json"))
+    monkeypatch.setenv("ADMIN_STATE_PATH", str(tmp_path / "admin_state.json"))
+    client = TestClient(app)
+    client.post("/api/admin/manual-draws", json={"draws": random_draws(80, 21)})
+
+    assert client.get("/api/admin/strategy-params").json()["params"]["mcc"] == {"window": 80}
+    response = client.post("/api/admin/strategy-params/sweep/mcc", json={"grid": {"window": [10, 30, 50]}, "start": 40})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["configurations"] == 3 and data["applied"] is True
+    best = data["best"]["params"]
+    assert client.get("/api/admin/strategy-params").json()["params"]["mcc"] == best
+
+    generated = client.post("/api/generate/mcc", json={"use_manual_draws": True}).json()
+    assert f"sur les {best['window']} derniers tirages" in generated["explanation"]
+
+    invalid = client.post("/api/admin/strategy-params/sweep/mcc", json={"grid": {"depth": [1]}})
+    assert invalid.status_code == 422
+    assert client.post("/api/admin/strategy-params/sweep/random", json={"grid": {}}).status_code == 422